@@ -0,0 +1,47 @@
+"""并行解密基准测试：比较 1/2/4/8 个工作线程（或进程）的解密速度
+
+用法：python benchmarks/bench_decrypt.py [--rows 20000] [--processes]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cryptography.fernet import Fernet  # noqa: E402
+from src.parallel import decrypt_many  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=20000)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--processes', action='store_true', help='使用进程池代替线程池')
+    args = parser.parse_args()
+
+    key = Fernet.generate_key()
+    fernet = Fernet(key)
+    tokens = [fernet.encrypt(f"password-{i}".encode()).decode() for i in range(args.rows)]
+
+    results = []
+    baseline = None
+    for workers in args.workers:
+        start = time.perf_counter()
+        passwords = decrypt_many([key], tokens, workers=workers, use_processes=args.processes)
+        seconds = time.perf_counter() - start
+        assert passwords[-1] == f"password-{args.rows - 1}"
+        baseline = baseline or seconds
+        results.append({
+            'workers': workers,
+            'seconds': round(seconds, 4),
+            'rows_per_second': round(args.rows / seconds),
+            'speedup': round(baseline / seconds, 2),
+        })
+    print(json.dumps({'rows': args.rows, 'processes': args.processes,
+                      'cpu_count': os.cpu_count(), 'results': results}, indent=2))
+
+
+if __name__ == '__main__':
+    main()
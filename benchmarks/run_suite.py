@@ -0,0 +1,55 @@
+"""基准测试套件：在临时密码库上测试主要操作，并与保存的基准线比较
+
+用法：python benchmarks/run_suite.py --save benchmarks/baseline.json   # 在本机生成基准线
+      python benchmarks/run_suite.py [--size 1k 100k] [--baseline benchmarks/baseline.json]
+
+与 `passgen bench` 相同；有操作比基准线慢 tolerance 以上时以状态码 1 退出。
+基准线只在同一台机器、同样的参数下可比，因此不提交到仓库（已加入 .gitignore）；
+运行环境或参数与基准线不同时同样以状态码 1 退出，指定 --allow-mismatch 时仍然比较。
+"""
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.bench import (BENCH_OPERATIONS, BENCH_SIZES, DEFAULT_REPEAT, DEFAULT_SAMPLES,  # noqa: E402
+                       DEFAULT_SIZES, DEFAULT_TOLERANCE, compare, dump_results, load_results, mismatches,
+                       run_suite)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--size', nargs='+', default=list(DEFAULT_SIZES), choices=list(BENCH_SIZES))
+    parser.add_argument('--op', nargs='+', default=list(BENCH_OPERATIONS), choices=list(BENCH_OPERATIONS))
+    parser.add_argument('--samples', type=int, default=DEFAULT_SAMPLES)
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT)
+    parser.add_argument('--profile', choices=['durable', 'fast'])
+    parser.add_argument('--baseline', help='与该文件中的结果比较')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument('--save', help='把结果保存到该文件（例如更新基准线）')
+    parser.add_argument('--allow-mismatch', action='store_true', help='基准线来自其他机器或使用了不同的参数时仍然比较')
+    args = parser.parse_args()
+
+    def show(size, name, result):
+        print(f"{size:>5} {name:<8} p50 {result['p50_ms']:>10.3f} ms  p99 {result['p99_ms']:>10.3f} ms  "
+              f"{result['items_per_second']:>12.1f}/s", file=sys.stderr)
+
+    data = run_suite(args.size, args.op, args.samples, args.repeat, args.profile, on_result=show)
+    dump_results(data, args.save)
+    if args.baseline:
+        baseline = load_results(args.baseline)
+        differences = mismatches(data, baseline)
+        if differences:
+            print(f"基准线来自其他机器或使用了不同的参数: {'; '.join(differences)}", file=sys.stderr)
+            if not args.allow_mismatch:
+                sys.exit(1)
+        regressions = compare(data, baseline, args.tolerance)
+        if regressions:
+            print(json.dumps({'regressions': regressions}, indent=2), file=sys.stderr)
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
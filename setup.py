@@ -20,6 +20,10 @@ setup(
         'cryptography>=41.0.1',
         'SQLAlchemy>=2.0.23',
     ],
+    extras_require={
+        'zstd': ['zstandard>=0.21.0'],
+        'async': ['SQLAlchemy[asyncio]>=2.0.23', 'aiosqlite>=0.19.0'],
+    },
     entry_points={
         'console_scripts': [
             'passgen=src.cli:cli',
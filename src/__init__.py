@@ -1,5 +1,10 @@
 # 空文件，用于标记 src 为 Python 包 
 
-from .password_manager import PasswordManager, Password
+__all__ = ['PasswordManager', 'Password']
 
-__all__ = ['PasswordManager', 'Password'] 
\ No newline at end of file
+def __getattr__(name):
+    """按需导入，避免 `import src.cli` 时加载 SQLAlchemy 和 cryptography"""
+    if name in __all__:
+        from . import password_manager
+        return getattr(password_manager, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,251 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, List, Optional, Tuple, TypeVar
+from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError
+from .binary_format import DEFAULT_COMPRESSION
+from .parallel import decrypt_chunk
+from .password_manager import EXPORT_COLUMNS, METADATA_COLUMNS, Password, PasswordManager
+from .search import filter_account
+from .storage import create_async_sqlite_engine
+from .transfer import TransferStats, create_writer
+from .write_queue import DEFAULT_COMMIT_DELAY, MAX_GROUP_SIZE
+
+# 加解密线程池的大小
+DEFAULT_WORKERS = 4
+
+# 流式读取时每批从数据库取出并解密的记录数
+DEFAULT_STREAM_BATCH = 500
+
+T = TypeVar('T')
+
+
+class AsyncPasswordManager:
+    """PasswordManager 的 asyncio 接口，基于 SQLAlchemy 异步引擎（aiosqlite）
+
+    加解密在线程池中执行，不阻塞事件循环；并发的 add_password 调用在
+    commit_delay 内合并为一个事务提交。建表、迁移和读取密钥沿用同步实现，
+    没有异步版本的操作（导入、密钥轮换等）可以通过 self.sync 调用。
+    使用 `await AsyncPasswordManager.open(...)` 创建，用完后 `await close()`。
+    """
+
+    def __init__(self, sync: PasswordManager, engine: Any, executor: ThreadPoolExecutor,
+                 commit_delay: float = DEFAULT_COMMIT_DELAY, max_group: int = MAX_GROUP_SIZE) -> None:
+        self.sync = sync
+        self.engine = engine
+        self.executor = executor
+        self.commit_delay = commit_delay
+        self.max_group = max_group
+        # 已提交的事务数，用于观察合并效果
+        self.commits = 0
+        self._pending: List[Tuple[Dict[str, Any], asyncio.Future]] = []
+        self._flush_task: Optional[asyncio.Task] = None
+        # SQLite 同一时间只有一个写事务，写操作在进程内排队，不必等待数据库锁
+        self._write_lock = asyncio.Lock()
+
+    @classmethod
+    async def open(cls, db_path: str = "passwords.db", key_path: str = "key.key",
+                   profile: Optional[str] = None, workers: int = DEFAULT_WORKERS,
+                   commit_delay: float = DEFAULT_COMMIT_DELAY) -> 'AsyncPasswordManager':
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='passgen-crypto')
+
+        def prepare() -> PasswordManager:
+            pm = PasswordManager(db_path, key_path, profile=profile)
+            # 提前读取指纹密钥，之后的写入不再访问同步引擎
+            pm.fingerprint_key
+            return pm
+
+        sync = await asyncio.get_running_loop().run_in_executor(executor, prepare)
+        return cls(sync, create_async_sqlite_engine(db_path, sync.profile), executor, commit_delay)
+
+    async def close(self) -> None:
+        """提交尚未写入的记录并释放连接和线程池"""
+        if self._flush_task is not None:
+            await self._flush_task
+        await self.engine.dispose()
+        self.sync.close()
+        self.executor.shutdown(wait=True)
+
+    async def __aenter__(self) -> 'AsyncPasswordManager':
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        await self.close()
+
+    async def _run(self, func: Callable[..., T], *args: Any) -> T:
+        return await asyncio.get_running_loop().run_in_executor(self.executor, func, *args)
+
+    def _encrypt_rows(self, entries: List[Tuple[str, str, str]]) -> List[Dict[str, Any]]:
+        """加密并计算指纹（在线程池中执行）"""
+        fernet = self.sync.fernet
+        fingerprints = self.sync._fingerprints(password for _, password, _ in entries)
+        current_time = datetime.utcnow()
+        return [{
+            'account': account,
+            'encrypted_password': fernet.encrypt(password.encode()).decode(),
+            'note': note,
+            'fingerprint': fp,
+            'created_at': current_time,
+            'updated_at': current_time,
+        } for (account, password, note), fp in zip(entries, fingerprints)]
+
+    async def add_password(self, account: str, password: str, note: str = "") -> int:
+        """添加新密码，返回新记录的 id
+
+        记录先进入待提交队列，commit_delay 后与同时到达的其他记录在一个事务中写入。
+        """
+        entry = PasswordManager._normalize_entry((account, password, note))
+        (row,) = await self._run(self._encrypt_rows, [entry])
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((row, future))
+        if self._flush_task is None:
+            self._flush_task = asyncio.ensure_future(self._flush_pending())
+        return await future
+
+    async def _flush_pending(self) -> None:
+        await asyncio.sleep(self.commit_delay)
+        try:
+            while self._pending:
+                group, self._pending = self._pending[:self.max_group], self._pending[self.max_group:]
+                await self._insert_group(group)
+        finally:
+            self._flush_task = None
+
+    async def _insert_group(self, group: List[Tuple[Dict[str, Any], asyncio.Future]]) -> None:
+        try:
+            ids = await self._insert_rows([row for row, _ in group])
+        except IntegrityError as e:
+            if len(group) == 1:
+                _resolve(group[0][1], error=e)
+                return
+            # 有记录违反约束时逐条重试，只让出错的调用失败
+            for item in group:
+                await self._insert_group([item])
+            return
+        except Exception as e:
+            for _, future in group:
+                _resolve(future, error=e)
+            return
+        for (_, future), row_id in zip(group, ids):
+            _resolve(future, row_id)
+
+    async def _insert_rows(self, rows: List[Dict[str, Any]]) -> List[int]:
+        table = Password.__table__
+        insert = table.insert().returning(table.c.id, sort_by_parameter_order=True)
+        async with self._write_lock:
+            async with self.engine.begin() as conn:
+                ids = (await conn.execute(insert, rows)).scalars().all()
+            self.commits += 1
+        return list(ids)
+
+    async def add_passwords(self, entries: Iterable[Any], batch_size: int = 1000) -> List[int]:
+        """批量添加密码（格式同 PasswordManager.add_passwords），所有记录在一个事务中提交"""
+        entries = [PasswordManager._normalize_entry(entry) for entry in entries]
+        rows: List[Dict[str, Any]] = []
+        for start in range(0, len(entries), batch_size):
+            rows.extend(await self._run(self._encrypt_rows, entries[start:start + batch_size]))
+        return await self._insert_rows(rows) if rows else []
+
+    async def get_passwords(self, search_term: Optional[str] = None, match: str = 'contains',
+                            batch_size: int = DEFAULT_STREAM_BATCH) -> AsyncIterator[Dict[str, Any]]:
+        """逐条产生解密后的记录（字段同 PasswordManager.get_passwords）
+
+        每次从数据库取 batch_size 条，在线程池中解密后再交给调用方，内存占用与记录总数无关。
+        """
+        table = Password.__table__
+        query = select(*METADATA_COLUMNS, Password.encrypted_password)
+        query = filter_account(query, table, search_term, match, self.sync.fts_enabled).order_by(table.c.id)
+        async for rows in self._stream(query, batch_size):
+            passwords = await self._run(decrypt_chunk, self.sync.keys, [row.encrypted_password for row in rows])
+            for row, password in zip(rows, passwords):
+                yield {
+                    'id': row.id,
+                    'account': row.account,
+                    'password': password,
+                    'note': row.note,
+                    'created_at': row.created_at,
+                    'updated_at': row.updated_at,
+                }
+
+    async def _stream(self, query: Any, batch_size: int) -> AsyncIterator[List[Any]]:
+        async with self.engine.connect() as conn:
+            result = await conn.stream(query.execution_options(yield_per=batch_size))
+            async for rows in result.partitions(batch_size):
+                yield rows
+
+    async def iter_export(self, batch_size: int = 1000) -> AsyncIterator[Dict[str, Any]]:
+        """逐条产生导出格式的记录（密码保持加密）"""
+        query = select(*EXPORT_COLUMNS).order_by(Password.id)
+        async for rows in self._stream(query, batch_size):
+            for row in rows:
+                yield PasswordManager._export_record(row)
+
+    async def export_passwords(self, export_path: str, fmt: str = 'json', batch_size: int = 1000,
+                               compression: str = DEFAULT_COMPRESSION) -> Dict[str, Any]:
+        """导出密码文件（格式同 PasswordManager.export_passwords），文件写入在线程池中执行"""
+        stats = TransferStats()
+        f = open(export_path, 'wb' if fmt == 'binary' else 'w',
+                 encoding=None if fmt == 'binary' else 'utf-8')
+        with f:
+            writer = create_writer(f, fmt, compression)
+            batch: List[Dict[str, Any]] = []
+            async for record in self.iter_export(batch_size):
+                batch.append(record)
+                if len(batch) >= batch_size:
+                    await self._run(_write_batch, writer, batch)
+                    stats.rows += len(batch)
+                    batch = []
+            await self._run(_write_batch, writer, batch)
+            stats.rows += len(batch)
+            await self._run(writer.close)
+        return stats.finish().to_dict()
+
+    async def get_account(self, password_id: int) -> Optional[Dict[str, Any]]:
+        """按 ID 获取单条记录的元数据"""
+        async with self.engine.connect() as conn:
+            row = (await conn.execute(select(*METADATA_COLUMNS).where(Password.id == password_id))).first()
+        return dict(row._mapping) if row else None
+
+    async def count_passwords(self, ids: Optional[Iterable[int]] = None,
+                              account_pattern: Optional[str] = None,
+                              older_than: Optional[datetime] = None) -> int:
+        """统计满足条件的记录数（条件同 PasswordManager.delete_passwords）"""
+        table = Password.__table__
+        total = 0
+        async with self.engine.connect() as conn:
+            for conditions in PasswordManager._match_conditions(ids, account_pattern, older_than, required=False):
+                total += (await conn.execute(select(func.count()).select_from(table).where(*conditions))).scalar()
+        return total
+
+    async def delete_password(self, password_id: int) -> bool:
+        """删除密码"""
+        return await self.delete_passwords(ids=[password_id]) > 0
+
+    async def delete_passwords(self, ids: Optional[Iterable[int]] = None,
+                               account_pattern: Optional[str] = None,
+                               older_than: Optional[datetime] = None) -> int:
+        """按条件批量删除，返回删除的记录数（条件同 PasswordManager.delete_passwords）"""
+        table = Password.__table__
+        deleted = 0
+        async with self._write_lock:
+            async with self.engine.begin() as conn:
+                for conditions in PasswordManager._match_conditions(ids, account_pattern, older_than):
+                    deleted += (await conn.execute(table.delete().where(*conditions))).rowcount
+            self.commits += 1
+        return deleted
+
+
+def _resolve(future: asyncio.Future, result: Any = None, error: Optional[BaseException] = None) -> None:
+    # 调用方已经取消等待时忽略结果（记录仍然会写入）
+    if future.done():
+        return
+    if error is not None:
+        future.set_exception(error)
+    else:
+        future.set_result(result)
+
+
+def _write_batch(writer: Any, records: List[Dict[str, Any]]) -> None:
+    for record in records:
+        writer.write(record)
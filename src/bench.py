@@ -0,0 +1,262 @@
+import json
+import os
+import platform
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+# 基准测试的密码库规模
+BENCH_SIZES: Dict[str, int] = {
+    '1k': 1_000,
+    '100k': 100_000,
+    '1m': 1_000_000,
+}
+DEFAULT_SIZES = ('1k',)
+
+# 测试的操作，按执行顺序排列（clear 会清空密码库，放在最后）
+# generate / add / search / delete 每次处理一条记录，其余操作每次处理整个密码库
+BENCH_OPERATIONS = ('generate', 'add', 'search', 'list', 'export', 'import', 'delete', 'clear')
+
+# 单条操作的采样次数和批量操作的重复次数
+DEFAULT_SAMPLES = 100
+DEFAULT_REPEAT = 5
+
+# 与基准线比较时允许 p50 变慢的比例；变慢不足 MIN_SLOWDOWN_MS 毫秒时视为抖动
+DEFAULT_TOLERANCE = 0.5
+MIN_SLOWDOWN_MS = 0.5
+
+# 生成测试数据时循环使用的不同密码数量：只加密这么多次，插入速度不受加密限制
+SEED_PASSWORDS = 1000
+SEED_BATCH_SIZE = 10_000
+
+# 结果与基准线可比的前提：这些运行环境信息和测试参数都相同
+# 只比较稳定的主机标识，不比较包含内核版本的 platform 和 Python / SQLite 的版本，系统例行更新后仍然可比
+COMPARABLE_ENVIRONMENT = ('host', 'system', 'machine', 'cpu_count')
+COMPARABLE_SETTINGS = ('profile', 'samples', 'repeat')
+
+BENCH_FORMAT = 'passgen-bench'
+BENCH_VERSION = 1
+
+
+def percentile(samples: Sequence[float], q: float) -> float:
+    """线性插值的百分位数，q 取 0～100"""
+    ordered = sorted(samples)
+    if len(ordered) == 1:
+        return ordered[0]
+    pos = (len(ordered) - 1) * q / 100
+    low = int(pos)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (pos - low)
+
+
+def summarize(samples: Sequence[float], items: int = 1) -> Dict[str, Any]:
+    """汇总耗时样本（秒）：p50 / p99 / 平均值（毫秒），以及按 p50 计算的每秒处理条数"""
+    p50 = percentile(samples, 50)
+    return {
+        'runs': len(samples),
+        'items': items,
+        'p50_ms': round(p50 * 1000, 4),
+        'p99_ms': round(percentile(samples, 99) * 1000, 4),
+        'mean_ms': round(statistics.fmean(samples) * 1000, 4),
+        'items_per_second': round(items / p50, 1) if p50 > 0 else None,
+    }
+
+
+def timed(func: Callable[[], Any]) -> float:
+    """执行一次 func，返回耗时（秒）"""
+    started = time.perf_counter()
+    func()
+    return time.perf_counter() - started
+
+
+def seed_vault(pm: Any, rows: int, prefix: str = 'user') -> None:
+    """向密码库插入 rows 条测试记录（账户为 prefix + 序号）"""
+    from .password_manager import Password
+
+    passwords = [f"bench-password-{i}" for i in range(min(rows, SEED_PASSWORDS))]
+    tokens = [pm.fernet.encrypt(password.encode()).decode() for password in passwords]
+    fingerprints = pm._fingerprints(passwords)
+    current_time = datetime.utcnow()
+    table = Password.__table__
+    with pm.engine.begin() as conn:
+        for start in range(0, rows, SEED_BATCH_SIZE):
+            conn.execute(table.insert(), [{
+                'account': f"{prefix}{i:07d}@example.com",
+                'encrypted_password': tokens[i % len(tokens)],
+                'note': '',
+                'fingerprint': fingerprints[i % len(tokens)],
+                'created_at': current_time,
+                'updated_at': current_time,
+            } for i in range(start, min(start + SEED_BATCH_SIZE, rows))])
+
+
+class BenchVault:
+    """临时目录中的测试密码库，不会触及用户的数据"""
+
+    def __init__(self, workdir: str, rows: int, profile: Optional[str] = None) -> None:
+        self.workdir = workdir
+        self.rows = rows
+        self.profile = profile
+        self.key_path = os.path.join(workdir, 'bench.key')
+        self._counter = 0
+        self._managers: List[Any] = []
+        self.pm = self.new_manager()
+        seed_vault(self.pm, rows)
+
+    def new_path(self, name: str, suffix: str = 'db') -> str:
+        self._counter += 1
+        return os.path.join(self.workdir, f"{name}-{self._counter}.{suffix}")
+
+    def new_manager(self) -> Any:
+        """新建一个空的密码库（使用同一个密钥）"""
+        from .password_manager import PasswordManager
+        pm = PasswordManager(self.new_path('vault'), self.key_path, profile=self.profile)
+        self._managers.append(pm)
+        return pm
+
+    def close(self) -> None:
+        for pm in self._managers:
+            pm.close()
+
+
+def bench_operation(vault: BenchVault, name: str, samples: int, repeat: int) -> Dict[str, Any]:
+    """测试一种操作，返回 summarize 的结果"""
+    pm = vault.pm
+    rows = vault.rows
+    if name == 'generate':
+        return summarize([timed(pm.generate_password) for _ in range(samples)])
+    if name == 'add':
+        return summarize([timed(lambda i=i: pm.add_password(f"added{i}@example.com", "bench-secret"))
+                          for i in range(samples)])
+    if name == 'search':
+        # 子串搜索（与 `passgen list -s` 相同），每次命中一条记录
+        step = max(1, rows // samples)
+        return summarize([timed(lambda i=i: pm.get_passwords(f"{i * step % rows:07d}@"))
+                          for i in range(samples)])
+    if name == 'list':
+        return summarize([timed(pm.get_passwords) for _ in range(repeat)], rows)
+    if name == 'export':
+        return summarize([timed(lambda: pm.export_passwords(vault.new_path('export', 'jsonl'), fmt='jsonl'))
+                          for _ in range(repeat)], rows)
+    if name == 'import':
+        export_path = vault.new_path('export', 'jsonl')
+        pm.export_passwords(export_path, fmt='jsonl')
+        times = []
+        for _ in range(repeat):
+            target = vault.new_manager()
+            times.append(timed(lambda: target.import_passwords(export_path)))
+        return summarize(times, rows)
+    if name == 'delete':
+        ids = [row['id'] for row in pm.find_accounts(limit=samples)]
+        return summarize([timed(lambda record_id=record_id: pm.delete_password(record_id)) for record_id in ids])
+    if name == 'clear':
+        times = []
+        for _ in range(repeat):
+            target = vault.new_manager()
+            seed_vault(target, rows)
+            times.append(timed(target.clear_all_passwords))
+        return summarize(times, rows)
+    raise ValueError(f"未知的基准测试操作: {name}")
+
+
+def environment() -> Dict[str, Any]:
+    """运行环境信息，与结果一起保存，比较时用于判断结果是否可比"""
+    return {
+        'python': platform.python_version(),
+        'sqlite': sqlite3.sqlite_version,
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'host': platform.node(),
+        'system': platform.system(),
+        'machine': platform.machine(),
+    }
+
+
+def run_suite(sizes: Sequence[str] = DEFAULT_SIZES, operations: Sequence[str] = BENCH_OPERATIONS,
+              samples: int = DEFAULT_SAMPLES, repeat: int = DEFAULT_REPEAT,
+              profile: Optional[str] = None,
+              on_result: Optional[Callable[[str, str, Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+    """对每种规模的密码库依次测试各操作，返回可以保存为 JSON 的结果"""
+    for size in sizes:
+        if size not in BENCH_SIZES:
+            raise ValueError(f"未知的规模: {size}（可选: {', '.join(BENCH_SIZES)}）")
+    ordered = [name for name in BENCH_OPERATIONS if name in operations]
+    results: Dict[str, Dict[str, Any]] = {}
+    for size in sizes:
+        results[size] = {}
+        with tempfile.TemporaryDirectory(prefix='passgen-bench-') as workdir:
+            vault = BenchVault(workdir, BENCH_SIZES[size], profile)
+            try:
+                for name in ordered:
+                    result = bench_operation(vault, name, samples, repeat)
+                    results[size][name] = result
+                    if on_result:
+                        on_result(size, name, result)
+            finally:
+                vault.close()
+    return {
+        'format': BENCH_FORMAT,
+        'version': BENCH_VERSION,
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'environment': environment(),
+        'profile': profile,
+        'samples': samples,
+        'repeat': repeat,
+        'results': results,
+    }
+
+
+def load_results(path: str) -> Dict[str, Any]:
+    """读取保存的结果文件"""
+    with open(path, encoding='utf-8') as f:
+        data = json.load(f)
+    if data.get('format') != BENCH_FORMAT:
+        raise ValueError(f"不是基准测试结果文件: {path}")
+    return data
+
+
+def mismatches(current: Dict[str, Any], baseline: Dict[str, Any]) -> List[str]:
+    """与基准线不同的运行环境和测试参数（'字段: 基准线 -> 当前'），为空时两者可比"""
+    pairs = [(key, baseline.get('environment', {}).get(key), current['environment'].get(key))
+             for key in COMPARABLE_ENVIRONMENT]
+    pairs += [(key, baseline.get(key), current.get(key)) for key in COMPARABLE_SETTINGS]
+    return [f"{key}: {base} -> {value}" for key, base, value in pairs if base != value]
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any],
+            tolerance: float = DEFAULT_TOLERANCE) -> List[Dict[str, Any]]:
+    """与基准线比较，返回 p50 变慢超过 tolerance 的操作
+
+    只比较两边都有的规模和操作；p99 受偶发抖动影响较大，不参与判断。
+    基准线只在同一台机器、同样的参数下可比，调用前先用 mismatches 检查。
+    """
+    regressions = []
+    for size, operations in current['results'].items():
+        for name, result in operations.items():
+            base = baseline['results'].get(size, {}).get(name)
+            if not base or not base['p50_ms']:
+                continue
+            ratio = result['p50_ms'] / base['p50_ms']
+            if ratio > 1 + tolerance and result['p50_ms'] - base['p50_ms'] > MIN_SLOWDOWN_MS:
+                regressions.append({
+                    'size': size,
+                    'operation': name,
+                    'baseline_p50_ms': base['p50_ms'],
+                    'p50_ms': result['p50_ms'],
+                    'ratio': round(ratio, 2),
+                })
+    return regressions
+
+
+def dump_results(data: Dict[str, Any], path: Optional[str] = None) -> None:
+    """以 JSON 格式输出到文件，path 为 None 时输出到标准输出"""
+    text = json.dumps(data, indent=2, ensure_ascii=False)
+    if path is None:
+        sys.stdout.write(text + '\n')
+        return
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text + '\n')
@@ -0,0 +1,89 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Iterable, NamedTuple, Optional
+
+# 默认最多缓存的记录数
+DEFAULT_CACHE_SIZE = 1024
+
+
+class CacheEntry(NamedTuple):
+    token: str
+    plaintext: bytearray
+    expires_at: float
+
+
+def wipe(buffer: bytearray) -> None:
+    """用 0 覆盖明文（尽力而为：解码得到的 str 副本无法擦除）"""
+    buffer[:] = bytes(len(buffer))
+
+
+class DecryptedCache:
+    """已解密密码的缓存，带 TTL 和 LRU 数量上限
+
+    以记录 id 为键，同时保存密文；读取时密文不一致（记录被修改或密钥轮换）视为未命中。
+    明文保存在 bytearray 中，过期、淘汰或失效时会被覆盖。
+    """
+
+    def __init__(self, ttl: float, maxsize: int = DEFAULT_CACHE_SIZE) -> None:
+        if ttl <= 0 or maxsize <= 0:
+            raise ValueError("缓存的 TTL 和容量必须大于 0")
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._entries: 'OrderedDict[int, CacheEntry]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, record_id: int, token: str) -> Optional[str]:
+        """查找明文，未命中返回 None"""
+        with self._lock:
+            entry = self._entries.get(record_id)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry.token != token or entry.expires_at <= time.monotonic():
+                self._discard(record_id)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(record_id)
+            self.hits += 1
+            return entry.plaintext.decode()
+
+    def put(self, record_id: int, token: str, password: str) -> None:
+        """保存明文，超出容量时淘汰最久未使用的记录"""
+        entry = CacheEntry(token, bytearray(password.encode()), time.monotonic() + self.ttl)
+        with self._lock:
+            self._discard(record_id)
+            self._entries[record_id] = entry
+            while len(self._entries) > self.maxsize:
+                _, evicted = self._entries.popitem(last=False)
+                wipe(evicted.plaintext)
+
+    def invalidate(self, record_ids: Optional[Iterable[int]] = None) -> None:
+        """使指定记录失效，不传 record_ids 时清空整个缓存"""
+        with self._lock:
+            if record_ids is None:
+                for entry in self._entries.values():
+                    wipe(entry.plaintext)
+                self._entries.clear()
+                return
+            for record_id in record_ids:
+                self._discard(record_id)
+
+    def expire(self) -> int:
+        """清除所有已过期的记录，返回清除数量"""
+        now = time.monotonic()
+        with self._lock:
+            expired = [record_id for record_id, entry in self._entries.items() if entry.expires_at <= now]
+            for record_id in expired:
+                self._discard(record_id)
+        return len(expired)
+
+    def _discard(self, record_id: int) -> None:
+        entry = self._entries.pop(record_id, None)
+        if entry is not None:
+            wipe(entry.plaintext)
+
+    def __len__(self) -> int:
+        return len(self._entries)
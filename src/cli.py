@@ -1,23 +1,151 @@
 import sys
+import signal
 import click
-from colorama import init, Fore, Style
+import functools
 import time
 import os
-from datetime import datetime
-from .password_manager import PasswordManager
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Optional
+from .generator import CharsetPolicy, generate_passwords
+from .instrumentation import METRICS_ENV_VAR, create_sink, metrics, start_profiler, write_profile
+from .languages import DEFAULT_LANGUAGE, TRANSLATIONS
+from .bench import (BENCH_OPERATIONS, BENCH_SIZES, DEFAULT_REPEAT, DEFAULT_SAMPLES, DEFAULT_SIZES,
+                    DEFAULT_TOLERANCE)
+from .binary_format import COMPRESSIONS, DEFAULT_COMPRESSION
+from .dedupe import CONFLICT_STRATEGIES, MATCH_KEYS
+from .storage import PROFILE_ENV_VAR, STORAGE_PROFILES
+from .daemon import SOCKET_ENV_VAR, DaemonClient, RemotePasswordManager, VaultServer, default_socket_path
+from .transfer import EXPORT_FORMATS, export_extension
+from .write_queue import DEFAULT_COMMIT_DELAY
+
+# SQLAlchemy、cryptography 和 colorama 都在真正用到时才导入，
+# 这样 `passgen --help` 和命令补全不需要加载它们
+if TYPE_CHECKING:
+    from .password_manager import PasswordManager
+
+@functools.lru_cache(maxsize=None)
+def load_colorama():
+    """导入 colorama 并初始化（自动重置颜色）"""
+    import colorama
+    colorama.init(autoreset=True)
+    return colorama
+
+class LazyColors:
+    """首次读取颜色属性时才导入 colorama"""
+
+    def __init__(self, name: str) -> None:
+        self._name = name
+
+    def __getattr__(self, attr):
+        return getattr(getattr(load_colorama(), self._name), attr)
+
+Fore = LazyColors('Fore')
+Style = LazyColors('Style')
+
+# 交互菜单中每页显示的记录数
+MENU_PAGE_SIZE = 10
+
+# 交互菜单中解密结果的缓存时间（秒），重复查看时不必再次解密
+MENU_CACHE_TTL = 300
+
+# --profile 默认保存的 pstats 文件
+DEFAULT_PROFILE_OUTPUT = 'passgen.prof'
+
+class CliContext:
+    """命令行进程内共享的状态，PasswordManager 在首次使用时才创建"""
+
+    def __init__(self, db_path: str = "passwords.db", key_path: str = "key.key",
+                 profile: Optional[str] = None, cache_ttl: Optional[float] = None,
+                 socket_path: Optional[str] = None) -> None:
+        self.db_path = db_path
+        self.key_path = key_path
+        self.profile = profile
+        self.cache_ttl = cache_ttl
+        self.socket_path = socket_path
+        self._pm = None
+
+    @property
+    def pm(self) -> 'PasswordManager':
+        if self._pm is None:
+            self._pm = self.connect_daemon() or self.create_local()
+        return self._pm
+
+    @property
+    def exclusive_pm(self) -> 'PasswordManager':
+        """需要独占密码库的命令（密钥轮换、导入等）使用；守护进程在运行时拒绝执行"""
+        pm = self.pm
+        if isinstance(pm, RemotePasswordManager):
+            socket_path = self.socket_path or default_socket_path(self.db_path)
+            raise click.ClickException(pm.get_text('daemon_must_stop').format(socket_path))
+        return pm
+
+    def create_local(self, cache_ttl: Optional[float] = None,
+                     commit_delay: Optional[float] = None) -> 'PasswordManager':
+        """在当前进程中打开密码库"""
+        from .password_manager import PasswordManager
+        return PasswordManager(self.db_path, self.key_path, profile=self.profile,
+                               cache_ttl=cache_ttl if cache_ttl is not None else self.cache_ttl,
+                               commit_delay=commit_delay)
+
+    def connect_daemon(self) -> Optional['PasswordManager']:
+        """守护进程在运行时通过套接字访问密码库，省去加载依赖和读取密钥的时间"""
+        client = DaemonClient.connect(self.socket_path or default_socket_path(self.db_path))
+        if client is None:
+            return None
+        return RemotePasswordManager(client, self.create_local)
+
+    def get_text(self, key: str) -> str:
+        """获取文本；不需要数据库的命令不会因此创建 PasswordManager"""
+        if self._pm is not None:
+            return self._pm.get_text(key)
+        return TRANSLATIONS[DEFAULT_LANGUAGE][key]
+
+def enable_instrumentation(ctx: click.Context, sinks, profile_output: Optional[str]) -> None:
+    """按 --metrics / --profile 启用指标和性能分析，命令结束时输出结果"""
+    if sinks:
+        try:
+            metrics.enable([create_sink(spec) for spec in sinks])
+        except ValueError as e:
+            raise click.BadParameter(str(e), param_hint='--metrics')
+        ctx.call_on_close(lambda: metrics.flush(ctx.invoked_subcommand))
+    if profile_output:
+        profiler = start_profiler()
+
+        def finish_profile():
+            write_profile(profiler, profile_output)
+            click.echo(ctx.obj.get_text('profile_written').format(profile_output), err=True)
+
+        ctx.call_on_close(finish_profile)
+
+def get_help_text(key):
+    """获取帮助文本（直接读取默认语言的翻译，不创建 PasswordManager）"""
+    return TRANSLATIONS[DEFAULT_LANGUAGE][key]
 
 def clear_screen():
     """清除屏幕"""
     os.system('cls' if os.name == 'nt' else 'clear')
 
 @click.group(invoke_without_command=True)
+@click.option('--db-profile', type=click.Choice(STORAGE_PROFILES), envvar=PROFILE_ENV_VAR,
+              help=get_help_text('help_db_profile'))
+@click.option('--socket', 'socket_path', type=click.Path(dir_okay=False), envvar=SOCKET_ENV_VAR,
+              help=get_help_text('help_socket'))
+@click.option('--metrics', 'metrics_sinks', multiple=True, envvar=METRICS_ENV_VAR,
+              help=get_help_text('help_metrics'))
+@click.option('--profile', 'profile_enabled', is_flag=True, help=get_help_text('help_profile'))
+@click.option('--profile-output', default=DEFAULT_PROFILE_OUTPUT, type=click.Path(dir_okay=False),
+              help=get_help_text('help_profile_output'))
 @click.pass_context
-def cli(ctx):
+def cli(ctx, db_profile, socket_path, metrics_sinks, profile_enabled, profile_output):
     """Password Manager CLI Interface"""
-    init(autoreset=True)  # 初始化colorama并自动重置颜色
-    pm = PasswordManager()
+    ctx.ensure_object(CliContext)
+    ctx.obj.profile = db_profile
+    ctx.obj.socket_path = socket_path
+    enable_instrumentation(ctx, metrics_sinks, profile_output if profile_enabled else None)
     
     if ctx.invoked_subcommand is None:
+        ctx.obj.cache_ttl = MENU_CACHE_TTL
+        pm = ctx.obj.pm
         while True:
             clear_screen()
             click.echo(f"\n{Fore.CYAN}{pm.get_text('welcome')}{Style.RESET_ALL}")
@@ -27,7 +155,7 @@ def cli(ctx):
             
             if choice == "1":
                 clear_screen()
-                click.echo(f"\n{Fore.CYAN}=== {pm.get_text('menu').split('\n')[1].strip()} ==={Style.RESET_ALL}")
+                click.echo(f"\n{Fore.CYAN}=== {menu_title(pm, 1)} ==={Style.RESET_ALL}")
                 click.echo(f"\n{Fore.YELLOW}{pm.get_text('back_option')}{Style.RESET_ALL}")
                 account = click.prompt(f"{Fore.GREEN}{pm.get_text('enter_account')}{Style.RESET_ALL}", type=str)
                 if check_back(account):
@@ -50,48 +178,32 @@ def cli(ctx):
             
             elif choice == "2":
                 clear_screen()
-                click.echo(f"\n{Fore.CYAN}=== {pm.get_text('menu').split('\n')[2].strip()} ==={Style.RESET_ALL}")
+                click.echo(f"\n{Fore.CYAN}=== {menu_title(pm, 2)} ==={Style.RESET_ALL}")
                 click.echo(f"\n{Fore.YELLOW}{pm.get_text('back_option')}{Style.RESET_ALL}")
                 search = click.prompt(f"{Fore.GREEN}{pm.get_text('enter_search_keyword')}{Style.RESET_ALL}", type=str, default="")
                 if check_back(search):
                     click.echo(f"\n{Fore.YELLOW}{pm.get_text('going_back')}{Style.RESET_ALL}")
                     continue
-                ctx.invoke(list, search=search)
+                ctx.invoke(list, search=search, page_size=MENU_PAGE_SIZE)
             
             elif choice == "3":
                 clear_screen()
-                click.echo(f"\n{Fore.CYAN}=== {pm.get_text('menu').split('\n')[3].strip()} ==={Style.RESET_ALL}")
-                # 显示密码列表
-                passwords = pm.get_passwords()
-                if not passwords:
+                click.echo(f"\n{Fore.CYAN}=== {menu_title(pm, 3)} ==={Style.RESET_ALL}")
+                # 分页显示账户列表（只读取元数据，不解密）
+                if not browse_pages(pm, lambda p: click.echo(f"- {p.account}"),
+                                    title=pm.get_text('accounts_list')):
                     click.echo(f"\n{Fore.YELLOW}{pm.get_text('no_passwords')}{Style.RESET_ALL}")
-                else:
-                    click.echo(f"\n{Fore.GREEN}{pm.get_text('accounts_list')}{Style.RESET_ALL}")
-                    for account in passwords:
-                        click.echo(f"- {account['account']}")
             
             elif choice == "4":
                 clear_screen()
-                click.echo(f"\n{Fore.CYAN}=== {pm.get_text('menu').split('\n')[4].strip()} ==={Style.RESET_ALL}")
+                click.echo(f"\n{Fore.CYAN}=== {menu_title(pm, 4)} ==={Style.RESET_ALL}")
                 
-                # 先获取并显示前10条账户
-                passwords = pm.get_passwords()
-                if not passwords:
+                # 分页显示账户，每页10条
+                if not browse_pages(pm, lambda p: echo_account_id(pm, p),
+                                    title=pm.get_text('available_accounts')):
                     click.echo(f"\n{Fore.YELLOW}{pm.get_text('no_passwords')}{Style.RESET_ALL}")
                     continue
                 
-                # 默认显示前10条记录
-                display_passwords = passwords[:10]
-                total_count = len(passwords)
-                
-                click.echo(f"\n{Fore.GREEN}{pm.get_text('available_accounts')}{Style.RESET_ALL}")
-                for p in display_passwords:
-                    click.echo(f"{Fore.BLUE}{pm.get_text('account_id_format').format(p['id'], p['account'])}{Style.RESET_ALL}")
-                
-                # 如果总记录数超过10条，显示提示信息
-                if total_count > 10:
-                    click.echo(f"\n{Fore.YELLOW}{pm.get_text('more_records').format(total_count - 10)}{Style.RESET_ALL}")
-                
                 # 显示操作选项
                 click.echo(f"\n{Fore.GREEN}{pm.get_text('delete_options')}{Style.RESET_ALL}")
                 click.echo(f"{Fore.YELLOW}{pm.get_text('back_option')}{Style.RESET_ALL}")
@@ -108,7 +220,7 @@ def cli(ctx):
                         continue
                     try:
                         password_id = int(password_id)
-                        ctx.invoke(delete, password_id=password_id)
+                        ctx.invoke(delete, password_ids=(password_id,))
                     except ValueError:
                         click.echo(f"\n{Fore.RED}{pm.get_text('invalid_option')}{Style.RESET_ALL}")
                 
@@ -118,28 +230,18 @@ def cli(ctx):
                         click.echo(f"\n{Fore.YELLOW}{pm.get_text('going_back')}{Style.RESET_ALL}")
                         continue
                     
-                    filtered_passwords = [p for p in passwords if search.lower() in p['account'].lower()]
-                    if not filtered_passwords:
+                    if not browse_pages(pm, lambda p: echo_account_id(pm, p),
+                                        title=pm.get_text('available_accounts'), search_term=search):
                         click.echo(f"\n{Fore.YELLOW}{pm.get_text('no_records_found')}{Style.RESET_ALL}")
                         continue
                     
-                    display_passwords = filtered_passwords[:10]
-                    total_count = len(filtered_passwords)
-                    
-                    click.echo(f"\n{Fore.GREEN}{pm.get_text('available_accounts')}{Style.RESET_ALL}")
-                    for p in display_passwords:
-                        click.echo(f"{Fore.BLUE}{pm.get_text('account_id_format').format(p['id'], p['account'])}{Style.RESET_ALL}")
-                    
-                    if total_count > 10:
-                        click.echo(f"\n{Fore.YELLOW}{pm.get_text('more_records').format(total_count - 10)}{Style.RESET_ALL}")
-                    
                     password_id = click.prompt(f"{Fore.GREEN}{pm.get_text('enter_password_id')}{Style.RESET_ALL}", type=str)
                     if check_back(password_id):
                         click.echo(f"\n{Fore.YELLOW}{pm.get_text('going_back')}{Style.RESET_ALL}")
                         continue
                     try:
                         password_id = int(password_id)
-                        ctx.invoke(delete, password_id=password_id)
+                        ctx.invoke(delete, password_ids=(password_id,))
                     except ValueError:
                         click.echo(f"\n{Fore.RED}{pm.get_text('invalid_option')}{Style.RESET_ALL}")
                 
@@ -148,7 +250,7 @@ def cli(ctx):
             
             elif choice == "5":
                 clear_screen()
-                click.echo(f"\n{Fore.CYAN}=== {pm.get_text('menu').split('\n')[5].strip()} ==={Style.RESET_ALL}")
+                click.echo(f"\n{Fore.CYAN}=== {menu_title(pm, 5)} ==={Style.RESET_ALL}")
                 click.echo(f"\n{Fore.YELLOW}{pm.get_text('back_option')}{Style.RESET_ALL}")
                 export_path = click.prompt(f"{Fore.GREEN}{pm.get_text('enter_export_path')}{Style.RESET_ALL}", type=str)
                 if check_back(export_path):
@@ -158,7 +260,7 @@ def cli(ctx):
             
             elif choice == "6":
                 clear_screen()
-                click.echo(f"\n{Fore.CYAN}=== {pm.get_text('menu').split('\n')[6].strip()} ==={Style.RESET_ALL}")
+                click.echo(f"\n{Fore.CYAN}=== {menu_title(pm, 6)} ==={Style.RESET_ALL}")
                 click.echo(f"\n{Fore.YELLOW}{pm.get_text('back_option')}{Style.RESET_ALL}")
                 import_path = click.prompt(f"{Fore.GREEN}{pm.get_text('enter_import_path')}{Style.RESET_ALL}", type=str)
                 if check_back(import_path):
@@ -168,7 +270,7 @@ def cli(ctx):
             
             elif choice == "7":
                 clear_screen()
-                click.echo(f"\n{Fore.CYAN}=== {pm.get_text('menu').split('\n')[7].strip()} ==={Style.RESET_ALL}")
+                click.echo(f"\n{Fore.CYAN}=== {menu_title(pm, 7)} ==={Style.RESET_ALL}")
                 click.echo(f"\n{Fore.YELLOW}{pm.get_text('back_option')}{Style.RESET_ALL}")
                 lang = click.prompt(f"{Fore.GREEN}{pm.get_text('select_language')}{Style.RESET_ALL}", type=str)
                 if check_back(lang):
@@ -190,33 +292,88 @@ def cli(ctx):
             if choice in ["1", "2", "3", "4", "5", "6", "7"]:
                 click.prompt(f"\n{Fore.CYAN}{pm.get_text('press_enter')}{Style.RESET_ALL}", default="", show_default=False)
 
-def get_help_text(key):
-    """获取帮助文本"""
-    pm = PasswordManager()
-    return pm.get_text(key)
+def browse_pages(pm, render, page_size=None, title=None, **query):
+    """分页显示记录：输入 n 下一页，p 上一页，直接回车结束浏览
+
+    每页通过 get_passwords_page 按 id 键集查询，只读取当前页的记录。
+    没有任何记录时返回 False。
+    """
+    page_size = page_size or MENU_PAGE_SIZE
+    cursor = {}
+    page_number = 1
+    while True:
+        page = pm.get_passwords_page(limit=page_size, **cursor, **query)
+        if not page and not cursor:
+            return False
+        if title and not cursor:
+            click.echo(f"\n{Fore.GREEN}{title}{Style.RESET_ALL}")
+        if page.has_next or page.has_prev:
+            click.echo(f"\n{Fore.CYAN}{pm.get_text('page_header').format(page_number)}{Style.RESET_ALL}")
+        for record in page:
+            render(record)
+        if not (page.has_next or page.has_prev):
+            return True
+        
+        choice = click.prompt(f"\n{Fore.YELLOW}{pm.get_text('page_navigation')}{Style.RESET_ALL}",
+                              default="", show_default=False).strip().lower()
+        if choice == 'n' and page.has_next:
+            cursor = {'after': page.next_cursor}
+            page_number += 1
+        elif choice == 'p' and page.has_prev:
+            cursor = {'before': page.prev_cursor}
+            page_number -= 1
+        else:
+            return True
+
+def echo_account_id(pm, p):
+    """显示账户 ID 和名称"""
+    click.echo(f"{Fore.BLUE}{pm.get_text('account_id_format').format(p['id'], p['account'])}{Style.RESET_ALL}")
+
+def echo_record(pm, p):
+    """显示一条完整的密码记录"""
+    click.echo(f"{Fore.BLUE}ID{Style.RESET_ALL} {p['id']}")
+    click.echo(f"{Fore.BLUE}账号{Style.RESET_ALL} {p['account']}")
+    click.echo(f"{Fore.YELLOW}密码{Style.RESET_ALL} {p['password']}")
+    if p['note']:
+        click.echo(f"{Fore.CYAN}备注{Style.RESET_ALL} {p['note']}")
+    click.echo(f"{Fore.MAGENTA}创建时间{Style.RESET_ALL} {p['created_at'].strftime('%Y-%m-%d %H:%M:%S')}")
+    click.echo(f"{Fore.MAGENTA}更新时间{Style.RESET_ALL} {p['updated_at'].strftime('%Y-%m-%d %H:%M:%S')}")
+    click.echo(f"{Fore.WHITE}{'-' * 50}{Style.RESET_ALL}")
+
+def menu_title(pm, index):
+    """获取菜单第 index 行的标题"""
+    return pm.get_text('menu').split('\n')[index].strip()
 
 @cli.command()
 @click.option('--length', '-l', default=12, help=get_help_text('help_password_length'))
 @click.option('--exclude', '-e', default='', help=get_help_text('help_exclude_chars'))
 @click.option('--account', '-a', required=True, help=get_help_text('help_account_name'))
 @click.option('--note', '-n', default='', help=get_help_text('help_note'))
-def generate(length, exclude, account, note):
+@click.option('--min-per-class', default=0, type=click.IntRange(min=0), help=get_help_text('help_min_per_class'))
+@click.option('--no-ambiguous', is_flag=True, help=get_help_text('help_no_ambiguous'))
+@click.pass_obj
+def generate(obj, length, exclude, account, note, min_per_class, no_ambiguous):
     """Generate and save a new password"""
-    pm = PasswordManager()
+    pm = obj.pm
     
     while True:
-        start_time = time.time()
-        password = pm.generate_password(length, exclude)
-        gen_time = time.time() - start_time
+        # 策略的编译结果会被缓存，重新生成时不需要重复构建字符集
+        policy = CharsetPolicy(exclude=exclude, min_per_class=min_per_class, exclude_ambiguous=no_ambiguous)
+        start_time = time.perf_counter()
+        try:
+            password = pm.generate_password(length, policy=policy)
+        except ValueError as e:
+            raise click.BadParameter(str(e))
+        gen_time = time.perf_counter() - start_time
         
         click.echo(f"\n{Fore.YELLOW}{pm.get_text('generated_password')}{Style.RESET_ALL} {password}")
         generation_time_text = pm.get_text('generation_time').format(f"{gen_time:.3f}")
         click.echo(f"{Fore.CYAN}{generation_time_text}{Style.RESET_ALL}")
         
         if click.confirm(f"{Fore.GREEN}{pm.get_text('satisfied_password')}{Style.RESET_ALL}", default=True):
-            start_time = time.time()
+            start_time = time.perf_counter()
             pm.add_password(account, password, note)
-            save_time = time.time() - start_time
+            save_time = time.perf_counter() - start_time
             
             save_time_text = f"{save_time:.3f}{pm.get_text('seconds')}"
             click.echo(f"\n{Fore.GREEN}✓ {pm.get_text('password_saved')}{Style.RESET_ALL} ({save_time_text})")
@@ -233,13 +390,26 @@ def generate(length, exclude, account, note):
 
 @cli.command()
 @click.option('--search', '-s', help=get_help_text('help_search'))
-def list(search):
+@click.option('--prefix', is_flag=True, help=get_help_text('help_prefix_search'))
+@click.option('--page-size', type=click.IntRange(min=1), help=get_help_text('help_page_size'))
+@click.option('--workers', '-w', default=1, type=click.IntRange(min=1), help=get_help_text('help_workers'))
+@click.option('--processes', is_flag=True, help=get_help_text('help_processes'))
+@click.pass_obj
+def list(obj, search, prefix, page_size, workers, processes):
     """List saved passwords"""
-    pm = PasswordManager()
+    pm = obj.pm
+    match = 'prefix' if prefix else 'contains'
+
+    # 分页模式：每次只查询并解密一页
+    if page_size:
+        if not browse_pages(pm, lambda p: echo_record(pm, p), page_size,
+                            search_term=search, match=match):
+            click.echo(f"\n{Fore.YELLOW}{pm.get_text('no_records_found')}{Style.RESET_ALL}")
+        return
     
-    start_time = time.time()
-    passwords = pm.get_passwords(search)
-    query_time = time.time() - start_time
+    start_time = time.perf_counter()
+    passwords = pm.get_passwords(search, match=match, workers=workers, use_processes=processes)
+    query_time = time.perf_counter() - start_time
     
     if not passwords:
         click.echo(f"\n{Fore.YELLOW}{pm.get_text('no_records_found')}{Style.RESET_ALL}")
@@ -249,113 +419,204 @@ def list(search):
     click.echo(f"\n{Fore.GREEN}{pm.get_text('found_records').format(len(passwords))}{Style.RESET_ALL} ({query_time_text})\n")
     
     for p in passwords:
-        click.echo(f"{Fore.BLUE}ID{Style.RESET_ALL} {p['id']}")
-        click.echo(f"{Fore.BLUE}账号{Style.RESET_ALL} {p['account']}")
-        click.echo(f"{Fore.YELLOW}密码{Style.RESET_ALL} {p['password']}")
-        if p['note']:
-            click.echo(f"{Fore.CYAN}备注{Style.RESET_ALL} {p['note']}")
-        click.echo(f"{Fore.MAGENTA}创建时间{Style.RESET_ALL} {p['created_at'].strftime('%Y-%m-%d %H:%M:%S')}")
-        click.echo(f"{Fore.MAGENTA}更新时间{Style.RESET_ALL} {p['updated_at'].strftime('%Y-%m-%d %H:%M:%S')}")
-        click.echo(f"{Fore.WHITE}{'-' * 50}{Style.RESET_ALL}")
+        echo_record(pm, p)
 
 @cli.command()
-@click.argument('password_id', type=int)
-def delete(password_id):
-    """Delete a password"""
-    pm = PasswordManager()
-    
-    # 先查询要删除的记录
-    passwords = pm.get_passwords()
-    target = next((p for p in passwords if p['id'] == password_id), None)
-    
-    if not target:
-        click.echo(f"\n{Fore.RED}✗ {pm.get_text('account_not_found')}{Style.RESET_ALL}")
-        return
-    
-    # 显示要删除的记录详情
-    click.echo(f"\n{Fore.YELLOW}{pm.get_text('record_details')}{Style.RESET_ALL}")
-    click.echo(f"{Fore.BLUE}ID{Style.RESET_ALL} {target['id']}")
-    click.echo(f"{Fore.BLUE}账号{Style.RESET_ALL} {target['account']}")
-    if target['note']:
-        click.echo(f"{Fore.CYAN}备注{Style.RESET_ALL} {target['note']}")
+@click.argument('password_ids', nargs=-1, type=int)
+@click.option('--account', 'account_pattern', help=get_help_text('help_delete_account'))
+@click.option('--older-than', type=click.IntRange(min=0), help=get_help_text('help_delete_older_than'))
+@click.option('--yes', '-y', is_flag=True, help=get_help_text('help_yes'))
+@click.pass_obj
+def delete(obj, password_ids, account_pattern, older_than, yes):
+    """Delete passwords by ID, account pattern or age"""
+    pm = obj.pm
+    single = len(password_ids) == 1 and not account_pattern and older_than is None
+
+    if single:
+        # 先查询要删除的记录（只读取这一条的元数据）
+        target = pm.get_account(password_ids[0])
+        
+        if not target:
+            click.echo(f"\n{Fore.RED}✗ {pm.get_text('account_not_found')}{Style.RESET_ALL}")
+            return
+        
+        # 显示要删除的记录详情
+        click.echo(f"\n{Fore.YELLOW}{pm.get_text('record_details')}{Style.RESET_ALL}")
+        click.echo(f"{Fore.BLUE}ID{Style.RESET_ALL} {target['id']}")
+        click.echo(f"{Fore.BLUE}账号{Style.RESET_ALL} {target['account']}")
+        if target['note']:
+            click.echo(f"{Fore.CYAN}备注{Style.RESET_ALL} {target['note']}")
+        confirm_text = pm.get_text('confirm_delete')
+    else:
+        if not password_ids and not account_pattern and older_than is None:
+            raise click.UsageError(pm.get_text('delete_needs_condition'))
+        conditions = {
+            'ids': password_ids or None,
+            'account_pattern': account_pattern,
+            'older_than': datetime.utcnow() - timedelta(days=older_than) if older_than is not None else None,
+        }
+        # 只统计数量并显示前几条元数据，不加载全部记录
+        total_count = pm.count_passwords(**conditions)
+        if not total_count:
+            click.echo(f"\n{Fore.YELLOW}{pm.get_text('no_records_found')}{Style.RESET_ALL}")
+            return
+        click.echo(f"\n{Fore.YELLOW}{pm.get_text('delete_matching').format(total_count)}{Style.RESET_ALL}")
+        for p in pm.find_accounts(**conditions, limit=MENU_PAGE_SIZE):
+            echo_account_id(pm, p)
+        if total_count > MENU_PAGE_SIZE:
+            click.echo(f"{Fore.YELLOW}{pm.get_text('more_records').format(total_count - MENU_PAGE_SIZE)}{Style.RESET_ALL}")
+        confirm_text = pm.get_text('confirm_delete_matching').format(total_count)
     
     # 确认删除
-    if not click.confirm(f"\n{Fore.RED}{pm.get_text('confirm_delete')}{Style.RESET_ALL}", default=False):
+    if not yes and not click.confirm(f"\n{Fore.RED}{confirm_text}{Style.RESET_ALL}", default=False):
         click.echo(f"\n{Fore.YELLOW}{pm.get_text('delete_cancelled')}{Style.RESET_ALL}")
         return
     
-    start_time = time.time()
-    success = pm.delete_password(password_id)
-    delete_time = time.time() - start_time
+    start_time = time.perf_counter()
+    if single:
+        deleted = int(pm.delete_password(password_ids[0]))
+    else:
+        deleted = pm.delete_passwords(**conditions)
+    delete_time = time.perf_counter() - start_time
     
-    if success:
+    if deleted:
         delete_time_text = f"{delete_time:.3f}{pm.get_text('seconds')}"
         click.echo(f"\n{Fore.GREEN}✓ 已成功删除记录{Style.RESET_ALL} ({delete_time_text})")
+        if deleted > 1:
+            click.echo(f"{Fore.CYAN}{pm.get_text('deleted_count').format(deleted)}{Style.RESET_ALL}")
     else:
         click.echo(f"\n{Fore.RED}✗ 删除失败{Style.RESET_ALL} ({delete_time:.3f}秒)")
 
 @cli.command()
 @click.option('--path', '-p', required=True, help=get_help_text('help_export_path'))
-def export(path):
+@click.option('--format', '-f', 'fmt', type=click.Choice(EXPORT_FORMATS), default='json',
+              help=get_help_text('help_export_format'))
+@click.option('--compression', type=click.Choice(COMPRESSIONS), default=DEFAULT_COMPRESSION,
+              help=get_help_text('help_export_compression'))
+@click.option('--batch-size', default=1000, type=click.IntRange(min=1), help=get_help_text('help_batch_size'))
+@click.option('--changes', is_flag=True, help=get_help_text('help_export_changes'))
+@click.option('--since', help=get_help_text('help_export_since'))
+@click.pass_obj
+def export(obj, path, fmt, compression, batch_size, changes, since):
     """Export passwords to a file.
     
     Arguments:
         path: The path where to save the exported passwords
     """
-    pm = PasswordManager()
+    pm = obj.pm
+
+    def show_progress(rows, elapsed):
+        rate = rows / elapsed if elapsed > 0 else 0
+        click.echo(f"\r{pm.get_text('export_progress').format(rows, f'{rate:.0f}')}", nl=False, err=True)
     
+    # 指定 --since 即为增量导出，增量文件固定为 JSON Lines
+    changes = changes or since is not None
     try:
-        export_path = validate_export_path(path)
-        start_time = time.time()
-        pm.export_passwords(export_path)
-        export_time = time.time() - start_time
+        since = datetime.fromisoformat(since) if since else None
+    except ValueError:
+        raise click.BadParameter(pm.get_text('invalid_watermark').format(since), param_hint='--since')
+    
+    try:
+        export_path = validate_export_path(path, pm, 'jsonl' if changes else fmt)
+        start_time = time.perf_counter()
+        if changes:
+            stats = pm.export_changes(export_path, since=since, batch_size=batch_size, progress=show_progress)
+        else:
+            stats = pm.export_passwords(export_path, fmt=fmt, batch_size=batch_size, progress=show_progress,
+                                        compression=compression)
+        export_time = time.perf_counter() - start_time
+        click.echo(err=True)
         
         export_time_text = f"{export_time:.3f}{pm.get_text('seconds')}"
         click.echo(f"\n{Fore.GREEN}✓ 密码已成功导出到: {export_path}{Style.RESET_ALL} ({export_time_text})")
+        throughput_text = pm.get_text('throughput').format(stats['rows'], f"{stats['rows_per_second']:.0f}")
+        click.echo(f"{Fore.CYAN}{throughput_text}{Style.RESET_ALL}")
+        if changes:
+            click.echo(pm.get_text('delta_summary').format(stats['upserts'], stats['deletes']))
+            click.echo(f"{Fore.YELLOW}{pm.get_text('delta_watermark').format(stats['watermark'])}{Style.RESET_ALL}")
     except click.ClickException as e:
         click.echo(f"\n{Fore.RED}✗ 导出失败: {e.message}{Style.RESET_ALL}")
+    except ValueError as e:
+        click.echo(f"\n{Fore.RED}✗ 导出失败: {e}{Style.RESET_ALL}")
 
 @cli.command()
 @click.option('--path', '-p', required=True, help=get_help_text('help_import_path'))
-def import_passwords(path):
-    """Import passwords from a file.
+@click.option('--batch-size', default=1000, type=click.IntRange(min=1), help=get_help_text('help_batch_size'))
+@click.option('--resume', is_flag=True, help=get_help_text('help_resume_import'))
+@click.option('--merge', is_flag=True, help=get_help_text('help_import_merge'))
+@click.option('--on-conflict', type=click.Choice(CONFLICT_STRATEGIES), help=get_help_text('help_on_conflict'))
+@click.option('--match-on', type=click.Choice(MATCH_KEYS), default='account', help=get_help_text('help_match_on'))
+@click.option('--workers', '-w', default=1, type=click.IntRange(min=1), help=get_help_text('help_workers'))
+@click.option('--jobs', '-j', default=1, type=click.IntRange(min=1), help=get_help_text('help_import_jobs'))
+@click.pass_obj
+def import_passwords(obj, path, batch_size, resume, merge, on_conflict, match_on, workers, jobs):
+    """Import passwords from a file or a directory of files.
     
     Arguments:
-        path: The path of the file to import passwords from
+        path: The file, or directory of files, to import passwords from
     """
+    pm = obj.exclusive_pm
+
+    if merge and resume:
+        raise click.UsageError(pm.get_text('merge_resume_conflict'))
+    if merge and on_conflict:
+        raise click.UsageError(pm.get_text('merge_on_conflict_conflict'))
     if not os.path.exists(path):
         click.echo(f"\n{Fore.RED}✗ {pm.get_text('file_not_exists').format(path)}{Style.RESET_ALL}")
         return
+    if os.path.isdir(path) or jobs > 1:
+        if merge or resume:
+            raise click.UsageError(pm.get_text('import_dir_conflict'))
+        import_directory(pm, path, jobs, batch_size, on_conflict, match_on)
+        return
 
-    pm = PasswordManager()
+    def show_progress(rows, elapsed):
+        rate = rows / elapsed if elapsed > 0 else 0
+        click.echo(f"\r{pm.get_text('import_progress').format(rows, f'{rate:.0f}')}", nl=False, err=True)
     
     try:
-        start_time = time.time()
-        pm.import_passwords(path)
-        import_time = time.time() - start_time
+        start_time = time.perf_counter()
+        if merge:
+            stats = pm.merge_changes(path, batch_size=batch_size, progress=show_progress)
+        else:
+            stats = pm.import_passwords(path, batch_size=batch_size, resume=resume, progress=show_progress,
+                                        on_conflict=on_conflict, match_on=match_on, workers=workers)
+        import_time = time.perf_counter() - start_time
+        click.echo(err=True)
         
         import_time_text = f"{import_time:.3f}{pm.get_text('seconds')}"
         click.echo(f"\n{Fore.GREEN}✓ 已成功从 {path} 导入密码{Style.RESET_ALL} ({import_time_text})")
+        throughput_text = pm.get_text('throughput').format(stats['rows'], f"{stats['rows_per_second']:.0f}")
+        click.echo(f"{Fore.CYAN}{throughput_text}{Style.RESET_ALL}")
+        if merge:
+            click.echo(pm.get_text('delta_summary').format(stats['upserts'], stats['deletes']))
+        elif on_conflict:
+            click.echo(pm.get_text('conflict_summary').format(stats['applied'], stats['rows'] - stats['applied']))
     except Exception as e:
         click.echo(f"\n{Fore.RED}✗ 导入失败: {str(e)}{Style.RESET_ALL}")
+        # 合并可以直接重新执行，不需要 --resume
+        if not merge:
+            click.echo(f"{Fore.YELLOW}{pm.get_text('import_resume_hint')}{Style.RESET_ALL}")
 
 @cli.command()
-def clear():
+@click.option('--vacuum', is_flag=True, help=get_help_text('help_vacuum'))
+@click.pass_obj
+def clear(obj, vacuum):
     """Clear all passwords"""
-    pm = PasswordManager()
+    pm = obj.pm
     
-    # 先显示当前记录数
-    passwords = pm.get_passwords()
-    if not passwords:
+    # 先显示当前记录数（只统计数量并显示前几条元数据，不加载全部记录）
+    total_count = pm.count_passwords()
+    if not total_count:
         click.echo(f"\n{Fore.YELLOW}{pm.get_text('no_records_in_db')}{Style.RESET_ALL}")
         return
     
-    click.echo(f"\n{Fore.RED}{pm.get_text('warning_delete_all').format(len(passwords))}{Style.RESET_ALL}")
+    click.echo(f"\n{Fore.RED}{pm.get_text('warning_delete_all').format(total_count)}{Style.RESET_ALL}")
     click.echo(f"\n{Fore.YELLOW}{pm.get_text('existing_records')}{Style.RESET_ALL}")
-    
-    # 显示所有记录的简要信息
-    for p in passwords:
-        click.echo(f"{Fore.BLUE}ID{Style.RESET_ALL} {p['id']}, {Fore.BLUE}账号{Style.RESET_ALL} {p['account']}")
+    for p in pm.find_accounts(limit=MENU_PAGE_SIZE):
+        echo_account_id(pm, p)
+    if total_count > MENU_PAGE_SIZE:
+        click.echo(f"{Fore.YELLOW}{pm.get_text('more_records').format(total_count - MENU_PAGE_SIZE)}{Style.RESET_ALL}")
     
     # 双重确认
     click.echo(f"\n{Fore.RED}{pm.get_text('operation_irreversible')}{Style.RESET_ALL}")
@@ -367,9 +628,9 @@ def clear():
         click.echo(f"\n{Fore.YELLOW}{pm.get_text('clear_cancelled')}{Style.RESET_ALL}")
         return
     
-    start_time = time.time()
-    success = pm.clear_all_passwords()  # 需要在 PasswordManager 中实现此方法
-    clear_time = time.time() - start_time
+    start_time = time.perf_counter()
+    success = pm.clear_all_passwords(vacuum=vacuum)
+    clear_time = time.perf_counter() - start_time
     
     if success:
         clear_time_text = f"{clear_time:.3f}{pm.get_text('seconds')}"
@@ -377,11 +638,265 @@ def clear():
     else:
         click.echo(f"\n{Fore.RED}✗ 清空操作失败{Style.RESET_ALL} ({clear_time:.3f}秒)")
 
-def validate_export_path(path: str) -> str:
+@cli.command()
+@click.option('--yes', '-y', is_flag=True, help=get_help_text('help_yes'))
+@click.pass_obj
+def dedupe(obj, yes):
+    """Remove duplicate accounts and enforce uniqueness"""
+    pm = obj.exclusive_pm
+    if not yes and not click.confirm(f"{Fore.RED}{pm.get_text('confirm_dedupe')}{Style.RESET_ALL}", default=False):
+        click.echo(f"\n{Fore.YELLOW}{pm.get_text('delete_cancelled')}{Style.RESET_ALL}")
+        return
+
+    start_time = time.perf_counter()
+    removed = pm.create_unique_index(dedupe=True)
+    dedupe_time = time.perf_counter() - start_time
+    dedupe_time_text = f"{dedupe_time:.3f}{pm.get_text('seconds')}"
+    click.echo(f"\n{Fore.GREEN}✓ {pm.get_text('dedupe_done').format(removed)}{Style.RESET_ALL} ({dedupe_time_text})")
+
+@cli.command()
+@click.option('--top', default=MENU_PAGE_SIZE, type=click.IntRange(min=0), help=get_help_text('help_stats_top'))
+@click.pass_obj
+def stats(obj, top):
+    """Show vault statistics"""
+    pm = obj.pm
+    summary = pm.stats()
+    click.echo(f"\n{Fore.CYAN}{pm.get_text('stats_title')}{Style.RESET_ALL}")
+    click.echo(f"{Fore.BLUE}{pm.get_text('stats_total')}{Style.RESET_ALL} {summary['count']}")
+    click.echo(f"{Fore.BLUE}{pm.get_text('stats_accounts')}{Style.RESET_ALL} {summary['accounts']}")
+    if summary['count']:
+        click.echo(f"{Fore.BLUE}{pm.get_text('stats_oldest')}{Style.RESET_ALL} {summary['oldest']}")
+        click.echo(f"{Fore.BLUE}{pm.get_text('stats_newest')}{Style.RESET_ALL} {summary['newest']}")
+    click.echo(f"{Fore.BLUE}{pm.get_text('stats_size')}{Style.RESET_ALL} {summary['size_bytes'] / 1024:.1f} KiB")
+
+    if top and summary['count']:
+        click.echo(f"\n{Fore.YELLOW}{pm.get_text('stats_top_accounts')}{Style.RESET_ALL}")
+        for account, count in pm.count_by_account(limit=top):
+            click.echo(f"{account}  {count}")
+
+@cli.command('add-batch')
+@click.option('--from', 'source', required=True, type=click.Path(exists=True, dir_okay=False),
+              help=get_help_text('help_add_batch_from'))
+@click.option('--format', '-f', 'fmt', type=click.Choice(['csv', 'jsonl']),
+              help=get_help_text('help_add_batch_format'))
+@click.option('--length', '-l', default=12, type=click.IntRange(min=1), help=get_help_text('help_password_length'))
+@click.option('--batch-size', default=1000, type=click.IntRange(min=1), help=get_help_text('help_batch_size'))
+@click.option('--workers', '-w', default=1, type=click.IntRange(min=1), help=get_help_text('help_workers'))
+@click.pass_obj
+def add_batch(obj, source, fmt, length, batch_size, workers):
+    """Add many accounts from a CSV or JSON Lines file"""
+    from .transfer import iter_entries
+
+    pm = obj.pm
+    fmt = fmt or ('csv' if source.lower().endswith('.csv') else 'jsonl')
+    # 没有提供密码的账户自动生成密码
+    passwords = generate_passwords(sys.maxsize, length)
+
+    def entries(f):
+        for entry in iter_entries(f, fmt):
+            if not entry.get('password'):
+                entry['password'] = next(passwords)
+            yield entry
+
+    start_time = time.perf_counter()
+    try:
+        with open(source, 'r', encoding='utf-8', newline='') as f:
+            ids = pm.add_passwords(entries(f), batch_size=batch_size, workers=workers)
+    except (KeyError, ValueError) as e:
+        click.echo(f"\n{Fore.RED}✗ {pm.get_text('add_batch_failed').format(e)}{Style.RESET_ALL}")
+        return
+    add_time = time.perf_counter() - start_time
+
+    add_time_text = f"{add_time:.3f}{pm.get_text('seconds')}"
+    click.echo(f"\n{Fore.GREEN}✓ {pm.get_text('add_batch_success').format(len(ids))}{Style.RESET_ALL} ({add_time_text})")
+    if ids:
+        click.echo(f"{Fore.BLUE}ID{Style.RESET_ALL} {ids[0]} - {ids[-1]}")
+    rate = len(ids) / add_time if add_time > 0 else 0
+    click.echo(f"{Fore.CYAN}{pm.get_text('throughput').format(len(ids), f'{rate:.0f}')}{Style.RESET_ALL}")
+
+@cli.command('generate-batch')
+@click.option('--count', '-n', default=1, type=click.IntRange(min=1), help=get_help_text('help_batch_count'))
+@click.option('--length', '-l', default=12, type=click.IntRange(min=1), help=get_help_text('help_password_length'))
+@click.option('--exclude', '-e', default='', help=get_help_text('help_exclude_chars'))
+@click.option('--min-per-class', default=0, type=click.IntRange(min=0), help=get_help_text('help_min_per_class'))
+@click.option('--no-ambiguous', is_flag=True, help=get_help_text('help_no_ambiguous'))
+@click.option('--out', '-o', type=click.File('w', encoding='utf-8'), default='-', help=get_help_text('help_batch_out'))
+@click.pass_obj
+def generate_batch(obj, count, length, exclude, min_per_class, no_ambiguous, out):
+    """Generate many passwords, one per line"""
+    policy = CharsetPolicy(exclude=exclude, min_per_class=min_per_class, exclude_ambiguous=no_ambiguous)
+
+    start_time = time.perf_counter()
+    try:
+        for password in generate_passwords(count, length, policy=policy):
+            out.write(password)
+            out.write('\n')
+    except ValueError as e:
+        raise click.BadParameter(str(e))
+    out.flush()
+    gen_time = time.perf_counter() - start_time
+
+    rate = count / gen_time if gen_time > 0 else 0
+    throughput_text = obj.get_text('throughput').format(count, f"{rate:.0f}")
+    click.echo(f"{Fore.CYAN}{throughput_text}{Style.RESET_ALL} ({gen_time:.3f}{obj.get_text('seconds')})", err=True)
+
+@cli.command('rotate-key')
+@click.option('--batch-size', default=1000, type=click.IntRange(min=1), help=get_help_text('help_batch_size'))
+@click.option('--workers', '-w', default=1, type=click.IntRange(min=1), help=get_help_text('help_workers'))
+@click.option('--processes', is_flag=True, help=get_help_text('help_processes'))
+@click.option('--yes', '-y', is_flag=True, help=get_help_text('help_yes'))
+@click.pass_obj
+def rotate_key(obj, batch_size, workers, processes, yes):
+    """Re-encrypt every password with a new key"""
+    pm = obj.exclusive_pm
+
+    if pm.rotation.load_pending_key():
+        click.echo(f"\n{Fore.YELLOW}{pm.get_text('rotation_resuming')}{Style.RESET_ALL}")
+    else:
+        click.echo(f"\n{Fore.YELLOW}{pm.get_text('rotation_warning')}{Style.RESET_ALL}")
+        if not yes and not click.confirm(f"{Fore.RED}{pm.get_text('confirm_rotate_key')}{Style.RESET_ALL}", default=False):
+            click.echo(f"\n{Fore.YELLOW}{pm.get_text('rotation_cancelled')}{Style.RESET_ALL}")
+            return
+
+    def show_progress(rows, elapsed):
+        rate = rows / elapsed if elapsed > 0 else 0
+        click.echo(f"\r{pm.get_text('rotation_progress').format(rows, f'{rate:.0f}')}", nl=False, err=True)
+
+    try:
+        stats = pm.rotate_key(batch_size=batch_size, workers=workers, use_processes=processes,
+                              progress=show_progress)
+    except Exception as e:
+        click.echo(err=True)
+        click.echo(f"\n{Fore.RED}✗ {pm.get_text('rotation_failed').format(e)}{Style.RESET_ALL}")
+        return
+    click.echo(err=True)
+
+    rotate_time_text = f"{stats['seconds']:.3f}{pm.get_text('seconds')}"
+    click.echo(f"\n{Fore.GREEN}✓ {pm.get_text('rotation_success')}{Style.RESET_ALL} ({rotate_time_text})")
+    throughput_text = pm.get_text('throughput').format(stats['rows'], f"{stats['rows_per_second']:.0f}")
+    click.echo(f"{Fore.CYAN}{throughput_text}{Style.RESET_ALL}")
+
+@cli.command('search-index')
+@click.pass_obj
+def search_index(obj):
+    """Build the full-text index used for substring search"""
+    pm = obj.exclusive_pm
+
+    start_time = time.perf_counter()
+    pm.enable_fts()
+    index_time = time.perf_counter() - start_time
+
+    index_time_text = f"{index_time:.3f}{pm.get_text('seconds')}"
+    click.echo(f"\n{Fore.GREEN}✓ {pm.get_text('fts_enabled')}{Style.RESET_ALL} ({index_time_text})")
+
+@cli.command()
+@click.option('--cache-ttl', default=MENU_CACHE_TTL, type=click.FloatRange(min=0),
+              help=get_help_text('help_serve_cache_ttl'))
+@click.pass_obj
+def serve(obj, cache_ttl):
+    """Keep the vault open and serve other commands over a Unix socket"""
+    socket_path = obj.socket_path or default_socket_path(obj.db_path)
+    # 多个客户端同时写入时合并为一个事务提交
+    pm = obj.create_local(cache_ttl=cache_ttl, commit_delay=DEFAULT_COMMIT_DELAY)
+    try:
+        server = VaultServer(socket_path, pm)
+    except RuntimeError:
+        raise click.ClickException(pm.get_text('daemon_running').format(socket_path))
+
+    click.echo(f"{Fore.GREEN}{pm.get_text('daemon_listening').format(obj.db_path, socket_path)}{Style.RESET_ALL}")
+    # kill 时同样删除套接字文件
+    signal.signal(signal.SIGTERM, lambda *args: sys.exit(0))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        pm.close()
+    click.echo(f"\n{Fore.YELLOW}{pm.get_text('daemon_stopped')}{Style.RESET_ALL}")
+
+@cli.command()
+@click.option('--size', 'sizes', multiple=True, default=DEFAULT_SIZES, type=click.Choice(tuple(BENCH_SIZES)),
+              help=get_help_text('help_bench_size'))
+@click.option('--op', 'operations', multiple=True, type=click.Choice(BENCH_OPERATIONS),
+              help=get_help_text('help_bench_op'))
+@click.option('--samples', default=DEFAULT_SAMPLES, type=click.IntRange(min=1), help=get_help_text('help_bench_samples'))
+@click.option('--repeat', default=DEFAULT_REPEAT, type=click.IntRange(min=1), help=get_help_text('help_bench_repeat'))
+@click.option('--output', '-o', type=click.Path(dir_okay=False), help=get_help_text('help_bench_output'))
+@click.option('--baseline', type=click.Path(exists=True, dir_okay=False), help=get_help_text('help_bench_baseline'))
+@click.option('--tolerance', default=DEFAULT_TOLERANCE, type=click.FloatRange(min=0),
+              help=get_help_text('help_bench_tolerance'))
+@click.option('--allow-mismatch', is_flag=True, help=get_help_text('help_bench_allow_mismatch'))
+@click.pass_obj
+def bench(obj, sizes, operations, samples, repeat, output, baseline, tolerance, allow_mismatch):
+    """Benchmark the main operations on temporary synthetic vaults"""
+    from .bench import compare, dump_results, load_results, mismatches, run_suite
+
+    # 进度写到标准错误，标准输出只包含 JSON 结果
+    def show_result(size, name, result):
+        result_text = obj.get_text('bench_result').format(
+            size, name, result['p50_ms'], result['p99_ms'], result['items_per_second'])
+        click.echo(result_text, err=True)
+
+    base = load_results(baseline) if baseline else None
+    data = run_suite(sizes, operations or BENCH_OPERATIONS, samples, repeat, obj.profile, on_result=show_result)
+    dump_results(data, output)
+    if base is None:
+        return
+    # 其他机器或其他参数下的基准线没有比较意义，除非明确指定仍要比较
+    differences = mismatches(data, base)
+    if differences and not allow_mismatch:
+        raise click.ClickException(obj.get_text('bench_not_comparable').format('; '.join(differences)))
+    if differences:
+        mismatch_text = obj.get_text('bench_mismatch_allowed').format('; '.join(differences))
+        click.echo(f"{Fore.YELLOW}{mismatch_text}{Style.RESET_ALL}", err=True)
+
+    regressions = compare(data, base, tolerance)
+    for item in regressions:
+        regression_text = obj.get_text('bench_regression').format(
+            item['size'], item['operation'], item['p50_ms'], item['baseline_p50_ms'], item['ratio'])
+        click.echo(f"{Fore.RED}✗ {regression_text}{Style.RESET_ALL}", err=True)
+    if regressions:
+        raise click.ClickException(obj.get_text('bench_regressions_found').format(
+            len(regressions), f"{tolerance * 100:.0f}"))
+    click.echo(f"{Fore.GREEN}✓ {obj.get_text('bench_no_regressions')}{Style.RESET_ALL}", err=True)
+
+def import_directory(pm: 'PasswordManager', path: str, jobs: int, batch_size: int,
+                     on_conflict: Optional[str], match_on: str) -> None:
+    """并行导入目录中的所有文件，逐个显示每个文件的结果"""
+    from .pipeline import find_import_files
+
+    paths = find_import_files(path)
+    if not paths:
+        click.echo(f"\n{Fore.YELLOW}{pm.get_text('no_import_files').format(path)}{Style.RESET_ALL}")
+        return
+
+    def show_file(result):
+        if result.error:
+            click.echo(f"{Fore.RED}✗ {result.path}: {result.error}{Style.RESET_ALL}")
+            return
+        file_text = pm.get_text('file_imported').format(
+            result.path, result.applied, result.rows, f"{result.rows_per_second:.0f}")
+        click.echo(f"{Fore.GREEN}✓ {file_text}{Style.RESET_ALL}")
+
+    start_time = time.perf_counter()
+    results = pm.import_files(paths, jobs=jobs, batch_size=batch_size, on_conflict=on_conflict,
+                              match_on=match_on, on_file=show_file)
+    import_time = time.perf_counter() - start_time
+    failed = sum(1 for result in results if result.error)
+    rows = sum(result.applied for result in results)
+    import_time_text = f"{import_time:.3f}{pm.get_text('seconds')}"
+    summary_text = pm.get_text('import_files_summary').format(len(results) - failed, failed, rows)
+    click.echo(f"\n{Fore.GREEN if not failed else Fore.YELLOW}{summary_text}{Style.RESET_ALL} ({import_time_text})")
+    rate = rows / import_time if import_time > 0 else 0
+    throughput_text = pm.get_text('throughput').format(rows, f"{rate:.0f}")
+    click.echo(f"{Fore.CYAN}{throughput_text}{Style.RESET_ALL}")
+
+def validate_export_path(path: str, pm: 'PasswordManager', fmt: str = 'json') -> str:
     """验证并处理导出路径"""
     # 如果只提供了目录，添加默认文件名
     if path.endswith('/') or path.endswith('\\') or os.path.isdir(path):
-        path = os.path.join(path, f'passwords_{datetime.now().strftime("%Y%m%d_%H%M%S")}.json')
+        path = os.path.join(path, f'passwords_{datetime.now().strftime("%Y%m%d_%H%M%S")}.{export_extension(fmt)}')
     
     # 确保目录存在
     directory = os.path.dirname(path)
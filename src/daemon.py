@@ -0,0 +1,301 @@
+import json
+import os
+import socket
+import socketserver
+import threading
+from datetime import datetime
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, Optional
+from .generator import CharsetPolicy, generate_password, generate_passwords
+from .languages import DEFAULT_LANGUAGE, TRANSLATIONS
+from .records import PasswordPage, PasswordRecord
+
+if TYPE_CHECKING:
+    from .password_manager import PasswordManager
+
+# 守护进程监听的 Unix 套接字，默认放在数据库文件旁
+SOCKET_ENV_VAR = 'PASSGEN_SOCKET'
+
+# 允许通过套接字调用的 PasswordManager 方法
+RPC_METHODS = frozenset({
+    'ping',
+    'get_passwords', 'get_passwords_page', 'get_password', 'list_accounts', 'get_account',
+    'count_passwords', 'find_accounts', 'stats', 'count_by_account',
+    'add_password', 'add_passwords', 'delete_password', 'delete_passwords',
+    'clear_all_passwords',
+})
+
+# 守护进程运行时可以在命令行进程中执行的只读方法（写本地文件，不修改密码库）；
+# 导入、密钥轮换、建立索引等其他操作会与守护进程持有的密钥和状态冲突，直接拒绝
+LOCAL_METHODS = frozenset({'export_passwords', 'export_changes'})
+
+# 以 ISO 字符串传输的时间字段
+DATETIME_FIELDS = frozenset({'created_at', 'updated_at', 'oldest', 'newest', 'older_than'})
+
+# JSON-RPC 2.0 错误码
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+SERVER_ERROR = -32000
+
+# 客户端等待响应的最长时间（秒）
+CLIENT_TIMEOUT = 30.0
+
+
+def default_socket_path(db_path: str) -> str:
+    """套接字路径：环境变量 > 数据库文件名 + .sock"""
+    return os.environ.get(SOCKET_ENV_VAR) or f"{os.path.abspath(db_path)}.sock"
+
+
+def _encode_default(obj: Any) -> Any:
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    # 分页结果只发送元数据，密码由客户端需要时通过 get_password 逐条获取
+    if isinstance(obj, PasswordPage):
+        return {'records': [record.metadata() for record in obj],
+                'has_next': obj.has_next, 'has_prev': obj.has_prev}
+    if isinstance(obj, PasswordRecord):
+        return obj.metadata()
+    if isinstance(obj, tuple):
+        return list(obj)
+    raise TypeError(f"无法序列化的类型: {type(obj).__name__}")
+
+
+def encode_message(message: Dict[str, Any]) -> bytes:
+    """编码为一行 JSON"""
+    return json.dumps(message, default=_encode_default, ensure_ascii=False).encode('utf-8') + b'\n'
+
+
+def _decode_datetimes(obj: Dict[str, Any]) -> Dict[str, Any]:
+    for key in DATETIME_FIELDS.intersection(obj):
+        if isinstance(obj[key], str):
+            obj[key] = datetime.fromisoformat(obj[key])
+    return obj
+
+
+def decode_message(line: bytes) -> Any:
+    """解码一行 JSON，时间字段还原为 datetime"""
+    return json.loads(line, object_hook=_decode_datetimes)
+
+
+def _error(request_id: Any, code: int, message: str) -> Dict[str, Any]:
+    return {'jsonrpc': '2.0', 'id': request_id, 'error': {'code': code, 'message': message}}
+
+
+def dispatch(pm: 'PasswordManager', request: Any) -> Dict[str, Any]:
+    """执行一个 JSON-RPC 请求，只允许调用 RPC_METHODS 中的方法"""
+    if not isinstance(request, dict) or request.get('jsonrpc') != '2.0' or 'method' not in request:
+        return _error(None, INVALID_REQUEST, "无效的请求")
+    request_id = request.get('id')
+    method = request['method']
+    params = request.get('params') or {}
+    if method not in RPC_METHODS:
+        return _error(request_id, METHOD_NOT_FOUND, f"不允许调用的方法: {method}")
+    if not isinstance(params, dict):
+        return _error(request_id, INVALID_PARAMS, "params 必须是对象")
+    try:
+        result = True if method == 'ping' else getattr(pm, method)(**params)
+    except (TypeError, ValueError) as e:
+        return _error(request_id, INVALID_PARAMS, str(e))
+    except Exception as e:
+        return _error(request_id, SERVER_ERROR, str(e) or type(e).__name__)
+    return {'jsonrpc': '2.0', 'id': request_id, 'result': result}
+
+
+class RpcHandler(socketserver.StreamRequestHandler):
+    """每个连接可以连续发送多个请求，每行一个"""
+
+    def handle(self) -> None:
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                request = decode_message(line)
+            except ValueError:
+                response = _error(None, PARSE_ERROR, "无法解析的 JSON")
+            else:
+                response = dispatch(self.server.pm, request)
+            try:
+                data = encode_message(response)
+            except (TypeError, ValueError) as e:
+                data = encode_message(_error(response.get('id'), SERVER_ERROR, str(e)))
+            self.wfile.write(data)
+            self.wfile.flush()
+
+
+class VaultServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """在 Unix 套接字上提供 PasswordManager 的守护进程（每个连接一个线程）"""
+
+    daemon_threads = True
+
+    def __init__(self, socket_path: str, pm: 'PasswordManager') -> None:
+        self.pm = pm
+        self.socket_path = socket_path
+        remove_stale_socket(socket_path)
+        # 套接字文件只允许当前用户访问
+        old_umask = os.umask(0o177)
+        try:
+            super().__init__(socket_path, RpcHandler)
+        finally:
+            os.umask(old_umask)
+        os.chmod(socket_path, 0o600)
+
+    def server_close(self) -> None:
+        super().server_close()
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+
+def remove_stale_socket(socket_path: str) -> None:
+    """删除没有进程监听的旧套接字文件；已有守护进程在运行时抛出异常"""
+    if not os.path.exists(socket_path):
+        return
+    if DaemonClient.connect(socket_path) is not None:
+        raise RuntimeError(f"守护进程已经在运行: {socket_path}")
+    os.unlink(socket_path)
+
+
+class DaemonError(Exception):
+    """守护进程返回的错误"""
+
+    def __init__(self, code: int, message: str) -> None:
+        super().__init__(message)
+        self.code = code
+
+
+class DaemonClient:
+    """守护进程客户端，一个连接上按顺序发送请求"""
+
+    def __init__(self, sock: socket.socket) -> None:
+        self._sock = sock
+        self._file = sock.makefile('rb')
+        self._lock = threading.Lock()
+        self._next_id = 0
+
+    @classmethod
+    def connect(cls, socket_path: str, timeout: float = CLIENT_TIMEOUT) -> Optional['DaemonClient']:
+        """连接守护进程，没有运行时返回 None"""
+        if not os.path.exists(socket_path):
+            return None
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(timeout)
+        try:
+            sock.connect(socket_path)
+        except OSError:
+            sock.close()
+            return None
+        return cls(sock)
+
+    def call(self, method: str, **params: Any) -> Any:
+        with self._lock:
+            self._next_id += 1
+            request = {'jsonrpc': '2.0', 'id': self._next_id, 'method': method, 'params': params}
+            self._sock.sendall(encode_message(request))
+            line = self._file.readline()
+        if not line:
+            raise ConnectionError("守护进程已断开连接")
+        response = decode_message(line)
+        if 'error' in response:
+            error = response['error']
+            # 参数错误与本地调用一样抛出 ValueError
+            if error['code'] == INVALID_PARAMS:
+                raise ValueError(error['message'])
+            raise DaemonError(error['code'], error['message'])
+        return response['result']
+
+    def close(self) -> None:
+        self._file.close()
+        self._sock.close()
+
+
+class RemotePasswordRecord(PasswordRecord):
+    """守护进程返回的记录，首次读取 password 时才向守护进程请求解密"""
+
+    __slots__ = ('_client',)
+
+    def __init__(self, data: Dict[str, Any], client: DaemonClient) -> None:
+        super().__init__(SimpleNamespace(encrypted_password=None, **data), None)
+        self._client = client
+
+    @property
+    def password(self) -> Optional[str]:
+        if self._password is None:
+            self._password = self._client.call('get_password', password_id=self.id)
+        return self._password
+
+
+class RemotePasswordManager:
+    """通过守护进程访问密码库，接口与 PasswordManager 一致
+
+    RPC_METHODS 中的方法转发给守护进程，LOCAL_METHODS 中的方法（导出等）
+    在首次使用时创建本地 PasswordManager 执行，其余方法抛出 DaemonError。
+    生成密码不需要密码库，直接在命令行进程中执行。
+    """
+
+    def __init__(self, client: DaemonClient, local_factory: Callable[[], 'PasswordManager']) -> None:
+        self.client = client
+        self._local_factory = local_factory
+        self._local: Optional['PasswordManager'] = None
+        self.language = DEFAULT_LANGUAGE
+
+    # 命令行中按位置传参的方法；其余方法只接受关键字参数
+    def add_password(self, account: str, password: str, note: str = "") -> None:
+        self.client.call('add_password', account=account, password=password, note=note)
+
+    def get_passwords(self, search_term: Optional[str] = None, **options: Any) -> Any:
+        return self.client.call('get_passwords', search_term=search_term, **options)
+
+    def get_account(self, password_id: int) -> Any:
+        return self.client.call('get_account', password_id=password_id)
+
+    def get_password(self, password_id: int) -> Optional[str]:
+        return self.client.call('get_password', password_id=password_id)
+
+    def delete_password(self, password_id: int) -> bool:
+        return self.client.call('delete_password', password_id=password_id)
+
+    def get_passwords_page(self, **query: Any) -> PasswordPage:
+        page = self.client.call('get_passwords_page', **query)
+        records = [RemotePasswordRecord(record, self.client) for record in page['records']]
+        return PasswordPage(records, page['has_next'], page['has_prev'])
+
+    def add_passwords(self, entries: Any, **options: Any) -> Any:
+        # 生成器无法序列化，先转换为列表
+        return self.client.call('add_passwords', entries=list(entries), **options)
+
+    def generate_password(self, length: int = 12, exclude: str = "",
+                          policy: Optional[CharsetPolicy] = None) -> str:
+        return generate_password(length, exclude, policy)
+
+    def generate_passwords(self, n: int, length: int = 12, exclude: str = "",
+                           policy: Optional[CharsetPolicy] = None) -> Iterator[str]:
+        return generate_passwords(n, length, exclude, policy)
+
+    def get_text(self, key: str) -> str:
+        return TRANSLATIONS[self.language][key]
+
+    def set_language(self, lang: str) -> bool:
+        if lang not in TRANSLATIONS:
+            return False
+        self.language = lang
+        if self._local is not None:
+            self._local.set_language(lang)
+        return True
+
+    @property
+    def local(self) -> 'PasswordManager':
+        """本地 PasswordManager（首次使用时创建）"""
+        if self._local is None:
+            self._local = self._local_factory()
+            self._local.set_language(self.language)
+        return self._local
+
+    def __getattr__(self, name: str) -> Any:
+        if name in RPC_METHODS:
+            return lambda **params: self.client.call(name, **params)
+        if name in LOCAL_METHODS:
+            return getattr(self.local, name)
+        if name.startswith('_'):
+            raise AttributeError(name)
+        raise DaemonError(METHOD_NOT_FOUND, f"守护进程运行时不能执行: {name}")
@@ -0,0 +1,117 @@
+import hashlib
+import hmac
+from typing import Any, Dict, List, Optional, Tuple
+
+# 导入时遇到重复记录的处理方式
+# skip：保留已有记录；replace：用导入的记录覆盖；keep-newest：保留 updated_at 较新的一方
+CONFLICT_STRATEGIES = ('skip', 'replace', 'keep-newest')
+
+# 判断重复的依据：account 为账户名 + 密码指纹，id 为导出文件中的原始 id
+MATCH_KEYS = ('account', 'id')
+
+FINGERPRINT_INDEX_NAME = 'ux_passwords_account_fingerprint'
+
+# account + 指纹的唯一索引（只包含已计算指纹的记录）；需要时才建立，不属于表定义
+FINGERPRINT_INDEX = (f"CREATE UNIQUE INDEX IF NOT EXISTS {FINGERPRINT_INDEX_NAME} "
+                     f"ON passwords (account, fingerprint) WHERE fingerprint IS NOT NULL")
+
+# 指纹密钥在 vault_meta 表中的名称（用主密钥加密保存，密钥轮换时一起轮换）
+FINGERPRINT_KEY_NAME = 'fingerprint_key'
+
+# 冲突时可以被覆盖的列（id 保持不变）；changed_at 取插入时生成的当前时间
+UPDATABLE_COLUMNS = ('account', 'encrypted_password', 'note', 'fingerprint', 'created_at', 'updated_at',
+                     'changed_at')
+
+# 没有唯一索引时按账户 + 指纹匹配写入的列（见 match_account_statements）
+MATCH_INSERT_COLUMNS = UPDATABLE_COLUMNS + ('sync_id',)
+
+
+def fingerprint(key: bytes, password: str) -> str:
+    """密码指纹：HMAC-SHA256(指纹密钥, 明文)
+
+    Fernet 每次加密结果都不同，无法直接比较密文；使用带密钥的 HMAC，
+    拿到数据库文件但没有密钥时无法通过字典比对指纹猜出密码。
+    """
+    return hmac.new(key, password.encode(), hashlib.sha256).hexdigest()
+
+
+def conflict_insert(table: Any, strategy: str, match_on: str = 'account') -> Any:
+    """生成带 ON CONFLICT 子句的批量插入语句"""
+    # SQLAlchemy 在这里才导入，命令行读取策略名称时不需要加载它
+    from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+    if strategy not in CONFLICT_STRATEGIES:
+        raise ValueError(f"不支持的冲突处理方式: {strategy}")
+    # sync_id 只用于增量合并（见 sync.py），不作为导入选项
+    if match_on not in MATCH_KEYS and match_on != 'sync_id':
+        raise ValueError(f"不支持的匹配方式: {match_on}")
+    insert = sqlite_insert(table)
+    target: Dict[str, Any] = {'index_elements': [table.c[match_on]]}
+    if match_on == 'account':
+        target = {'index_elements': [table.c.account, table.c.fingerprint],
+                  'index_where': table.c.fingerprint.isnot(None)}
+    if strategy == 'skip':
+        return insert.on_conflict_do_nothing(**target)
+    where: Optional[Any] = None
+    if strategy == 'keep-newest':
+        where = insert.excluded.updated_at > table.c.updated_at
+    return insert.on_conflict_do_update(
+        **target,
+        set_={name: insert.excluded[name] for name in UPDATABLE_COLUMNS},
+        where=where,
+    )
+
+
+def match_account_statements(table: Any, strategy: str) -> Tuple[Optional[Any], Any]:
+    """不依赖唯一索引、按账户 + 指纹识别重复记录的语句：(更新已有记录, 没有匹配记录时插入)
+
+    参数见 match_params。先执行更新再执行插入；库中已有的重复记录不影响导入，
+    replace / keep-newest 会更新所有匹配的记录。
+    """
+    from sqlalchemy import bindparam, exists, select
+
+    if strategy not in CONFLICT_STRATEGIES:
+        raise ValueError(f"不支持的冲突处理方式: {strategy}")
+
+    def param(name: str) -> Any:
+        # UPDATE 会为 SET 中的列自动生成同名参数，这里加前缀避免冲突
+        return bindparam(f'p_{name}', type_=table.c[name].type)
+
+    matches = (table.c.account == param('account')) & (table.c.fingerprint == param('fingerprint'))
+    insert = table.insert().from_select(
+        MATCH_INSERT_COLUMNS,
+        select(*[param(name) for name in MATCH_INSERT_COLUMNS]).where(~exists().where(matches)),
+    )
+    if strategy == 'skip':
+        return None, insert
+    update = table.update().where(matches).values({name: param(name) for name in UPDATABLE_COLUMNS})
+    if strategy == 'keep-newest':
+        update = update.where(table.c.updated_at < param('updated_at'))
+    return update, insert
+
+
+def match_params(rows: List[Dict[str, Any]], strategy: str) -> List[Dict[str, Any]]:
+    """match_account_statements 的参数；同一批中账户和指纹都相同的记录按策略只保留一条，
+    与 ON CONFLICT 逐条处理的结果一致"""
+    kept: Dict[Tuple[str, str], Dict[str, Any]] = {}
+    for row in rows:
+        key = (row['account'], row['fingerprint'])
+        if key in kept and (strategy == 'skip' or
+                            (strategy == 'keep-newest' and row['updated_at'] <= kept[key]['updated_at'])):
+            continue
+        kept[key] = row
+    return [{f'p_{name}': row[name] for name in MATCH_INSERT_COLUMNS} for row in kept.values()]
+
+
+def delete_duplicates(table: Any) -> Any:
+    """删除 account 和指纹都相同的重复记录，只保留 updated_at 最新（相同时 id 最大）的一条"""
+    from sqlalchemy import and_, exists, or_, select
+
+    other = table.alias('other')
+    newer = exists(select(other.c.id).where(
+        other.c.account == table.c.account,
+        other.c.fingerprint == table.c.fingerprint,
+        or_(other.c.updated_at > table.c.updated_at,
+            and_(other.c.updated_at == table.c.updated_at, other.c.id > table.c.id)),
+    ))
+    return table.delete().where(table.c.fingerprint.isnot(None), newer)
@@ -0,0 +1,147 @@
+import functools
+import os
+import secrets
+import string
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+# 字符类别
+CHARACTER_CLASSES: Dict[str, str] = {
+    'lower': string.ascii_lowercase,
+    'upper': string.ascii_uppercase,
+    'digits': string.digits,
+    'punctuation': string.punctuation,
+}
+
+# 默认字符集：大小写字母、数字和标点
+DEFAULT_CHARSET = ''.join(CHARACTER_CLASSES.values())
+
+# 容易混淆的字符
+AMBIGUOUS_CHARS = "Il1|O0o`'\""
+
+# 每次从 os.urandom 读取的最少字节数
+MIN_CHUNK_SIZE = 4096
+
+_system_random = secrets.SystemRandom()
+
+
+class CharsetPolicy(NamedTuple):
+    """密码字符集策略
+
+    classes 为允许的字符类别，exclude 为额外排除的字符，
+    min_per_class 为每个类别至少出现的次数，exclude_ambiguous 去掉容易混淆的字符。
+    策略可以作为字典键，编译结果按策略缓存。
+    """
+    classes: Tuple[str, ...] = tuple(CHARACTER_CLASSES)
+    exclude: str = ""
+    min_per_class: int = 0
+    exclude_ambiguous: bool = False
+
+
+class CompiledPolicy(NamedTuple):
+    """编译后的策略：完整字符集和各类别的可用字符"""
+    charset: str
+    class_charsets: Tuple[str, ...]
+
+
+@functools.lru_cache(maxsize=32)
+def compile_policy(policy: CharsetPolicy) -> CompiledPolicy:
+    """把策略编译为字符集（结果缓存，同一策略只计算一次）"""
+    unknown = set(policy.classes) - set(CHARACTER_CLASSES)
+    if unknown:
+        raise ValueError(f"未知的字符类别: {', '.join(sorted(unknown))}")
+    exclude = policy.exclude + (AMBIGUOUS_CHARS if policy.exclude_ambiguous else "")
+    class_charsets = tuple(
+        charset for charset in (build_charset(exclude, CHARACTER_CLASSES[name]) for name in policy.classes)
+        if charset
+    )
+    if policy.min_per_class and len(class_charsets) < len(policy.classes):
+        raise ValueError("有字符类别的字符被全部排除，无法满足最少出现次数")
+    return CompiledPolicy(''.join(class_charsets), class_charsets)
+
+
+def build_charset(exclude: str = "", charset: str = DEFAULT_CHARSET) -> str:
+    """从字符集中去掉需要排除的字符"""
+    excluded = set(exclude)
+    return ''.join(char for char in charset if char not in excluded)
+
+
+@functools.lru_cache(maxsize=32)
+def build_translation(charset: str) -> Tuple[bytes, bytes]:
+    """生成把随机字节映射到字符集的转换表
+
+    只接受小于 256 - 256 % len(charset) 的字节，其余字节被丢弃（拒绝采样），
+    这样每个字符被选中的概率完全相同。返回 (转换表, 需要删除的字节)。
+    """
+    size = len(charset)
+    if not 0 < size <= 256:
+        raise ValueError("字符集不能为空，且最多包含 256 个字符")
+    if not charset.isascii():
+        raise ValueError("字符集只能包含 ASCII 字符")
+    limit = 256 - 256 % size
+    encoded = charset.encode('ascii')
+    table = bytes(encoded[b % size] for b in range(limit)) + bytes(256 - limit)
+    return table, bytes(range(limit, 256))
+
+
+def random_chars(charset: str, count: int) -> Iterator[bytes]:
+    """持续产生均匀分布的随机字符块，每块至少 count 个字符"""
+    table, rejected = build_translation(charset)
+    # 按接受率估算需要读取的字节数，减少重复读取
+    accept_rate = (256 - len(rejected)) / 256
+    chunk_size = max(MIN_CHUNK_SIZE, int(count / accept_rate * 1.1))
+    while True:
+        # bytes.translate 在 C 层完成映射和拒绝，不需要逐字符调用 Python 代码
+        yield os.urandom(chunk_size).translate(table, rejected)
+
+
+def random_strings(charset: str, n: int, length: int) -> Iterator[str]:
+    """从字符集中流式产生 n 个长度为 length 的随机字符串"""
+    if n <= 0:
+        return
+    if length <= 0:
+        yield from ('' for _ in range(n))
+        return
+    # 每次最多为 1024 个字符串准备随机字符
+    batch = min(n, 1024)
+    buffer = b''
+    remaining = n
+    for chunk in random_chars(charset, batch * length):
+        buffer += chunk
+        usable = min(len(buffer) // length, remaining)
+        data = buffer[:usable * length].decode('ascii')
+        for start in range(0, usable * length, length):
+            yield data[start:start + length]
+        buffer = buffer[usable * length:]
+        remaining -= usable
+        if not remaining:
+            return
+
+
+def generate_passwords(n: int, length: int = 12, exclude: str = "",
+                       policy: Optional[CharsetPolicy] = None) -> Iterator[str]:
+    """批量生成 n 个随机密码（流式返回）
+
+    不指定 policy 时使用默认字符集并排除 exclude 中的字符。
+    """
+    compiled = compile_policy(policy or CharsetPolicy(exclude=exclude))
+    min_per_class = policy.min_per_class if policy else 0
+    if not min_per_class:
+        yield from random_strings(compiled.charset, n, length)
+        return
+
+    required = min_per_class * len(compiled.class_charsets)
+    if required > length:
+        raise ValueError(f"密码长度 {length} 不足以包含每类至少 {min_per_class} 个字符")
+    # 每个类别各取 min_per_class 个字符，其余从完整字符集中选取，最后打乱顺序
+    streams = [random_strings(charset, n, min_per_class) for charset in compiled.class_charsets]
+    streams.append(random_strings(compiled.charset, n, length - required))
+    for parts in zip(*streams):
+        chars: List[str] = list(''.join(parts))
+        _system_random.shuffle(chars)
+        yield ''.join(chars)
+
+
+def generate_password(length: int = 12, exclude: str = "",
+                      policy: Optional[CharsetPolicy] = None) -> str:
+    """生成单个随机密码"""
+    return next(generate_passwords(1, length, exclude, policy))
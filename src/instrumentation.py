@@ -0,0 +1,259 @@
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import nullcontext
+from datetime import datetime
+from typing import Any, Dict, List, Optional, TextIO
+
+# 通过环境变量启用指标输出，格式同 --metrics
+METRICS_ENV_VAR = 'PASSGEN_METRICS'
+
+# Prometheus textfile 中指标名称的前缀
+PROMETHEUS_PREFIX = 'passgen'
+
+# 未启用时 span() 返回同一个空上下文，热路径上只多一次判断
+_NULL_SPAN = nullcontext()
+
+
+class SpanStats:
+    """同名 span 的累计次数和耗时"""
+
+    __slots__ = ('count', 'seconds', 'max_seconds')
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.seconds = 0.0
+        self.max_seconds = 0.0
+
+    def add(self, seconds: float) -> None:
+        self.count += 1
+        self.seconds += seconds
+        if seconds > self.max_seconds:
+            self.max_seconds = seconds
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'count': self.count,
+            'seconds': round(self.seconds, 6),
+            'max_ms': round(self.max_seconds * 1000, 4),
+        }
+
+
+class _Span:
+    """一次计时（比 contextmanager 生成器开销小，逐条解密时也可以使用）"""
+
+    __slots__ = ('metrics', 'name', 'started')
+
+    def __init__(self, metrics: 'Metrics', name: str) -> None:
+        self.metrics = metrics
+        self.name = name
+
+    def __enter__(self) -> None:
+        self.started = time.perf_counter()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.metrics.record(self.name, time.perf_counter() - self.started)
+
+
+class Metrics:
+    """进程内的 span 和计数器，默认关闭
+
+    span 记录一段代码的耗时（decrypt / encrypt / sql.* / commit / json_encode），
+    计数器记录处理的记录数和字节数。启用后由 flush() 把汇总结果交给各个输出端。
+    """
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.sinks: List[Any] = []
+        self.spans: Dict[str, SpanStats] = {}
+        self.counters: Dict[str, int] = {}
+        self.started = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def enable(self, sinks: Optional[List[Any]] = None) -> None:
+        self.sinks = list(sinks or [])
+        self.reset()
+        self.enabled = True
+
+    def disable(self) -> None:
+        self.enabled = False
+        self.sinks = []
+
+    def reset(self) -> None:
+        with self._lock:
+            self.spans = {}
+            self.counters = {}
+            self.started = time.perf_counter()
+
+    def span(self, name: str) -> Any:
+        """计时的上下文管理器；未启用时不计时"""
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name)
+
+    def record(self, name: str, seconds: float) -> None:
+        """记录一次已经测得的耗时"""
+        with self._lock:
+            stats = self.spans.get(name)
+            if stats is None:
+                stats = self.spans[name] = SpanStats()
+            stats.add(seconds)
+
+    def count(self, name: str, value: int = 1) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def snapshot(self, command: Optional[str] = None) -> Dict[str, Any]:
+        """当前的汇总结果"""
+        with self._lock:
+            return {
+                'timestamp': datetime.now().isoformat(timespec='seconds'),
+                'command': command,
+                'wall_seconds': round(time.perf_counter() - self.started, 6),
+                'spans': {name: stats.to_dict() for name, stats in sorted(self.spans.items())},
+                'counters': dict(sorted(self.counters.items())),
+            }
+
+    def flush(self, command: Optional[str] = None) -> None:
+        """把汇总结果写入所有输出端"""
+        if not self.enabled:
+            return
+        snapshot = self.snapshot(command)
+        for sink in self.sinks:
+            sink.emit(snapshot)
+
+
+# 全局实例，PasswordManager 和命令行共用
+metrics = Metrics()
+
+
+def span(name: str) -> Any:
+    return metrics.span(name)
+
+
+def count(name: str, value: int = 1) -> None:
+    metrics.count(name, value)
+
+
+class StderrSink:
+    """以表格形式输出到标准错误"""
+
+    def __init__(self, stream: Optional[TextIO] = None) -> None:
+        self.stream = stream
+
+    def emit(self, snapshot: Dict[str, Any]) -> None:
+        stream = self.stream or sys.stderr
+        stream.write(f"\n{'span':<20}{'count':>10}{'total ms':>14}{'max ms':>12}\n")
+        for name, stats in snapshot['spans'].items():
+            stream.write(f"{name:<20}{stats['count']:>10}{stats['seconds'] * 1000:>14.3f}{stats['max_ms']:>12.3f}\n")
+        for name, value in snapshot['counters'].items():
+            stream.write(f"{name:<20}{value:>10}\n")
+        stream.write(f"{'wall':<20}{'':>10}{snapshot['wall_seconds'] * 1000:>14.3f}\n")
+
+
+class JsonLogSink:
+    """每次 flush 在文件末尾追加一行 JSON"""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+
+    def emit(self, snapshot: Dict[str, Any]) -> None:
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(snapshot, ensure_ascii=False) + '\n')
+
+
+class PrometheusTextfileSink:
+    """写入 node_exporter textfile collector 格式的文件（先写临时文件再替换）
+
+    每个文件只保存最近一次命令的结果，不同命令的结果通过 command 标签区分。
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+
+    def emit(self, snapshot: Dict[str, Any]) -> None:
+        labels = f'command="{snapshot["command"] or ""}"'
+        lines = [
+            f"# TYPE {PROMETHEUS_PREFIX}_span_seconds_total counter",
+            f"# TYPE {PROMETHEUS_PREFIX}_span_count_total counter",
+            f"# TYPE {PROMETHEUS_PREFIX}_span_max_seconds gauge",
+        ]
+        for name, stats in snapshot['spans'].items():
+            span_labels = f'{labels},span="{name}"'
+            lines.append(f"{PROMETHEUS_PREFIX}_span_seconds_total{{{span_labels}}} {stats['seconds']}")
+            lines.append(f"{PROMETHEUS_PREFIX}_span_count_total{{{span_labels}}} {stats['count']}")
+            lines.append(f"{PROMETHEUS_PREFIX}_span_max_seconds{{{span_labels}}} {stats['max_ms'] / 1000}")
+        lines.append(f"# TYPE {PROMETHEUS_PREFIX}_events_total counter")
+        for name, value in snapshot['counters'].items():
+            lines.append(f'{PROMETHEUS_PREFIX}_events_total{{{labels},name="{name}"}} {value}')
+        lines.append(f"# TYPE {PROMETHEUS_PREFIX}_wall_seconds gauge")
+        lines.append(f"{PROMETHEUS_PREFIX}_wall_seconds{{{labels}}} {snapshot['wall_seconds']}")
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(lines) + '\n')
+        os.replace(tmp_path, self.path)
+
+
+def create_sink(spec: str) -> Any:
+    """根据 --metrics 参数创建输出端：stderr、json:文件 或 prom:文件"""
+    kind, _, path = spec.partition(':')
+    if kind == 'stderr' and not path:
+        return StderrSink()
+    if kind == 'json' and path:
+        return JsonLogSink(path)
+    if kind == 'prom' and path:
+        return PrometheusTextfileSink(path)
+    raise ValueError(f"无效的指标输出: {spec}（可选: stderr、json:文件、prom:文件）")
+
+
+def instrument_engine(engine: Any) -> None:
+    """为 SQLAlchemy 引擎记录每条 SQL 的执行时间（sql.select / sql.insert 等）和提交时间"""
+    from sqlalchemy import event
+
+    @event.listens_for(engine, 'before_cursor_execute')
+    def before_execute(conn: Any, cursor: Any, statement: str, parameters: Any,
+                       context: Any, executemany: bool) -> None:
+        if metrics.enabled:
+            conn.info.setdefault('passgen_query_start', []).append(time.perf_counter())
+
+    @event.listens_for(engine, 'after_cursor_execute')
+    def after_execute(conn: Any, cursor: Any, statement: str, parameters: Any,
+                      context: Any, executemany: bool) -> None:
+        starts = conn.info.get('passgen_query_start')
+        if not starts:
+            return
+        verb = statement.lstrip().split(None, 1)[0].lower() if statement.strip() else 'other'
+        # SELECT 的耗时不包括之后逐行读取结果的时间
+        metrics.record(f"sql.{verb}", time.perf_counter() - starts.pop())
+
+    # SQLAlchemy 没有提交完成后的事件，直接包装方言的 do_commit（每个引擎有自己的方言实例）
+    do_commit = engine.dialect.do_commit
+
+    def timed_commit(dbapi_connection: Any) -> None:
+        with metrics.span('commit'):
+            do_commit(dbapi_connection)
+
+    engine.dialect.do_commit = timed_commit
+
+
+def start_profiler() -> Any:
+    """开始用 cProfile 记录整个命令"""
+    import cProfile
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    return profiler
+
+
+def write_profile(profiler: Any, path: str, stream: Optional[TextIO] = None, limit: int = 25) -> None:
+    """停止记录，保存 pstats 文件，并把累计耗时最多的 limit 个函数输出到 stream"""
+    import pstats
+
+    profiler.disable()
+    profiler.dump_stats(path)
+    stats = pstats.Stats(profiler, stream=stream or sys.stderr)
+    stats.sort_stats('cumulative').print_stats(limit)
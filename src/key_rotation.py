@@ -0,0 +1,62 @@
+import base64
+import json
+import os
+from pathlib import Path
+from typing import Optional
+from cryptography.fernet import Fernet
+
+
+def write_key_file(path: Path, key: bytes) -> None:
+    """原子地写入密钥文件（与 key.key 的编码方式一致）"""
+    tmp_path = path.with_name(path.name + '.tmp')
+    tmp_path.write_bytes(base64.urlsafe_b64encode(key))
+    os.replace(tmp_path, path)
+
+
+def read_key_file(path: Path) -> bytes:
+    return base64.urlsafe_b64decode(path.read_bytes())
+
+
+class KeyRotationState:
+    """密钥轮换的中间状态
+
+    轮换开始时新密钥写入 <key>.new，每提交一批记录后把最后处理的 id 写入 <key>.rotate。
+    全部记录重新加密后，<key>.new 原子地替换原密钥文件。轮换中断时这两个文件都会保留，
+    PasswordManager 会同时使用新旧两个密钥解密，并可以从检查点继续轮换。
+    """
+
+    def __init__(self, key_path: Path) -> None:
+        self.key_path = key_path
+        self.pending_path = key_path.with_name(key_path.name + '.new')
+        self.checkpoint_path = key_path.with_name(key_path.name + '.rotate')
+
+    def load_pending_key(self) -> Optional[bytes]:
+        """返回未完成轮换的新密钥，没有进行中的轮换时返回 None"""
+        if self.pending_path.exists():
+            return read_key_file(self.pending_path)
+        return None
+
+    def start(self) -> bytes:
+        """生成新密钥并开始轮换"""
+        key = Fernet.generate_key()
+        self.save_checkpoint(0)
+        write_key_file(self.pending_path, key)
+        return key
+
+    def load_checkpoint(self) -> int:
+        """返回最后一个已重新加密的记录 id"""
+        try:
+            return int(json.loads(self.checkpoint_path.read_text(encoding='utf-8'))['last_id'])
+        except (OSError, ValueError, KeyError):
+            return 0
+
+    def save_checkpoint(self, last_id: int) -> None:
+        tmp_path = self.checkpoint_path.with_name(self.checkpoint_path.name + '.tmp')
+        tmp_path.write_text(json.dumps({'last_id': last_id}), encoding='utf-8')
+        os.replace(tmp_path, self.checkpoint_path)
+
+    def finish(self) -> None:
+        """用新密钥替换原密钥，并删除检查点"""
+        os.replace(self.pending_path, self.key_path)
+        if self.checkpoint_path.exists():
+            self.checkpoint_path.unlink()
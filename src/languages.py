@@ -1,3 +1,6 @@
+# 默认语言
+DEFAULT_LANGUAGE = "en"
+
 # 语言配置字典
 TRANSLATIONS = {
     "en": {
@@ -84,6 +87,95 @@ TRANSLATIONS = {
 1. Delete by ID
 2. Search and delete""",
         "select_delete_option": "Enter your choice: ",
+        "help_export_format": "Export format (json, jsonl or binary)",
+        "help_batch_size": "Number of records read or written per batch",
+        "export_progress": "Exported {} records ({} records/s)",
+        "throughput": "{} records, {} records/s",
+        "help_resume_import": "Resume an interrupted import from its last committed batch",
+        "import_progress": "Imported {} records ({} records/s)",
+        "import_resume_hint": "Committed batches are kept; rerun with --resume to continue",
+        "help_prefix_search": "Match accounts starting with the search keyword (uses the account index)",
+        "fts_enabled": "Full-text search index is ready",
+        "help_page_size": "Show records one page at a time with this many per page",
+        "page_header": "--- Page {} ---",
+        "page_navigation": "n: next page, p: previous page, Enter: continue",
+        "help_batch_count": "Number of passwords to generate",
+        "help_batch_out": "Output file (default: standard output)",
+        "help_min_per_class": "Minimum number of characters from each class (lower, upper, digits, punctuation)",
+        "help_no_ambiguous": "Exclude easily confused characters such as I, l, 1, O and 0",
+        "help_workers": "Number of parallel workers used for decryption",
+        "help_processes": "Use worker processes instead of threads",
+        "help_yes": "Do not ask for confirmation",
+        "help_db_profile": "SQLite storage profile: durable (fsync every commit) or fast (WAL with synchronous=NORMAL)",
+        "help_add_batch_from": "CSV or JSON Lines file with account, password and note fields",
+        "help_add_batch_format": "Input format (default: by file extension)",
+        "add_batch_success": "Added {} records",
+        "add_batch_failed": "Batch add failed, nothing was saved: {}",
+        "help_delete_account": "Delete accounts matching this LIKE pattern (% matches any text)",
+        "help_delete_older_than": "Delete records created more than this many days ago",
+        "delete_needs_condition": "Specify record IDs, --account or --older-than",
+        "delete_matching": "{} records match:",
+        "confirm_delete_matching": "Confirm to delete these {} records?",
+        "deleted_count": "Deleted {} records",
+        "help_vacuum": "Run VACUUM afterwards to return freed space to the file system",
+        "help_stats_top": "Number of accounts to list by record count",
+        "stats_title": "Vault statistics",
+        "stats_total": "Records",
+        "stats_accounts": "Accounts",
+        "stats_oldest": "Oldest",
+        "stats_newest": "Newest",
+        "stats_size": "Size on disk",
+        "stats_top_accounts": "Top accounts",
+        "help_export_compression": "Compression for the binary format (zstd requires the zstandard package)",
+        "help_export_changes": "Export only changes (upserts and deletes) as JSON Lines for import --merge",
+        "help_export_since": "Watermark printed by the previous incremental export; implies --changes",
+        "invalid_watermark": "Invalid watermark: {} (expected an ISO timestamp)",
+        "delta_summary": "Upserts: {}, deletes: {}",
+        "delta_watermark": "Watermark for the next incremental export: {}",
+        "help_import_merge": "Apply an incremental or full export by id, keeping the newer version; safe to repeat",
+        "merge_resume_conflict": "--merge cannot be combined with --resume; just run the merge again",
+        "help_on_conflict": "How to handle records that already exist: skip, replace or keep-newest",
+        "help_match_on": "Match existing records by account + password (account) or by original id (id)",
+        "merge_on_conflict_conflict": "--merge already keeps the newest version; do not combine it with --on-conflict",
+        "conflict_summary": "Inserted or updated: {}, unchanged: {}",
+        "confirm_dedupe": "Remove records with the same account and password (keeping the newest) and forbid new duplicates?",
+        "dedupe_done": "Removed {} duplicate records; duplicates are now rejected",
+        "help_import_jobs": "Number of processes parsing files when importing a directory",
+        "import_dir_conflict": "--merge and --resume only apply to a single file",
+        "no_import_files": "No .json, .jsonl or .pgv files found in {}",
+        "file_imported": "{}: {} of {} records imported ({} records/s)",
+        "import_files_summary": "{} files imported, {} failed, {} records written",
+        "help_socket": "Unix socket of the vault daemon; commands use it when the daemon is running",
+        "help_serve_cache_ttl": "Seconds to keep decrypted passwords in the daemon cache (0 disables the cache)",
+        "daemon_running": "Daemon already running on {}",
+        "daemon_must_stop": "The vault daemon is running on {}; stop `passgen serve` before running this command",
+        "daemon_listening": "Serving {} on {} (Ctrl+C to stop)",
+        "daemon_stopped": "Daemon stopped",
+        "help_bench_size": "Vault size to benchmark (repeatable)",
+        "help_bench_op": "Operation to benchmark (repeatable, default: all)",
+        "help_bench_samples": "Timed runs for single-record operations",
+        "help_bench_repeat": "Timed runs for whole-vault operations",
+        "help_bench_output": "Write the JSON results to this file instead of standard output",
+        "help_bench_baseline": "Baseline JSON file to compare against (must be recorded on the same host with the same settings)",
+        "help_bench_tolerance": "Allowed p50 slowdown against the baseline (0.5 = 50%)",
+        "bench_result": "{} {}: p50 {} ms, p99 {} ms, {} items/s",
+        "bench_regression": "{} {}: p50 {} ms, baseline {} ms ({}x)",
+        "bench_regressions_found": "{} benchmarks are more than {}% slower than the baseline",
+        "bench_no_regressions": "No regressions against the baseline",
+        "bench_not_comparable": "The baseline was recorded on another host or with other settings ({}); pass --allow-mismatch to compare anyway",
+        "bench_mismatch_allowed": "The baseline was recorded on another host or with other settings ({}); comparing anyway",
+        "help_bench_allow_mismatch": "Compare against a baseline recorded on another host or with other settings instead of failing",
+        "help_metrics": "Record timing spans and counters and write them when the command ends: stderr, json:FILE or prom:FILE (repeatable)",
+        "help_profile": "Run the command under cProfile and print the slowest functions",
+        "help_profile_output": "File to save the cProfile statistics to",
+        "profile_written": "Profile saved to {} (open with python -m pstats)",
+        "rotation_warning": "A new key will be generated and every password re-encrypted. Files exported with the old key can no longer be imported afterwards.",
+        "rotation_resuming": "Resuming the interrupted key rotation",
+        "confirm_rotate_key": "Rotate the encryption key?",
+        "rotation_cancelled": "Key rotation cancelled",
+        "rotation_progress": "Re-encrypted {} records ({} records/s)",
+        "rotation_success": "Encryption key rotated",
+        "rotation_failed": "Key rotation interrupted: {} (run rotate-key again to resume)",
     },
     "zh": {
         "welcome": "欢迎使用密码管理器！",
@@ -169,5 +261,94 @@ TRANSLATIONS = {
 1. 直接输入ID删除
 2. 搜索后删除""",
         "select_delete_option": "请选择操作：",
+        "help_export_format": "导出格式（json、jsonl 或 binary）",
+        "help_batch_size": "每批读取或写入的记录数",
+        "export_progress": "已导出 {} 条记录（{} 条/秒）",
+        "throughput": "共 {} 条记录，{} 条/秒",
+        "help_resume_import": "从上次提交的批次继续中断的导入",
+        "import_progress": "已导入 {} 条记录（{} 条/秒）",
+        "import_resume_hint": "已提交的批次会保留，使用 --resume 重新运行可继续导入",
+        "help_prefix_search": "只匹配以关键词开头的账户（使用账户索引）",
+        "fts_enabled": "全文搜索索引已建立",
+        "help_page_size": "分页显示记录，指定每页条数",
+        "page_header": "--- 第 {} 页 ---",
+        "page_navigation": "n：下一页，p：上一页，回车：继续",
+        "help_batch_count": "要生成的密码数量",
+        "help_batch_out": "输出文件（默认输出到标准输出）",
+        "help_min_per_class": "每类字符（小写、大写、数字、标点）至少出现的次数",
+        "help_no_ambiguous": "排除容易混淆的字符，例如 I、l、1、O 和 0",
+        "help_workers": "并行解密使用的工作线程数",
+        "help_processes": "使用进程代替线程并行解密",
+        "help_yes": "不再询问确认",
+        "help_db_profile": "SQLite 存储配置：durable（每次提交都同步到磁盘）或 fast（WAL，synchronous=NORMAL）",
+        "help_add_batch_from": "包含 account、password、note 字段的 CSV 或 JSON Lines 文件",
+        "help_add_batch_format": "输入格式（默认根据文件扩展名判断）",
+        "add_batch_success": "已添加 {} 条记录",
+        "add_batch_failed": "批量添加失败，没有保存任何记录：{}",
+        "help_delete_account": "删除账户名匹配该 LIKE 模式的记录（% 匹配任意文本）",
+        "help_delete_older_than": "删除创建时间早于指定天数的记录",
+        "delete_needs_condition": "请指定记录 ID、--account 或 --older-than",
+        "delete_matching": "共有 {} 条记录匹配：",
+        "confirm_delete_matching": "确认删除这 {} 条记录？",
+        "deleted_count": "已删除 {} 条记录",
+        "help_vacuum": "清空后执行 VACUUM，把释放的空间归还给文件系统",
+        "help_stats_top": "按记录数列出的账户数量",
+        "stats_title": "密码库统计",
+        "stats_total": "记录数",
+        "stats_accounts": "账户数",
+        "stats_oldest": "最早创建",
+        "stats_newest": "最新创建",
+        "stats_size": "磁盘占用",
+        "stats_top_accounts": "记录最多的账户",
+        "help_export_compression": "二进制格式的压缩方式（zstd 需要安装 zstandard）",
+        "help_export_changes": "只导出变更（upsert 和 delete），格式为 JSON Lines，供 import --merge 使用",
+        "help_export_since": "上一次增量导出输出的水位线，指定后自动启用 --changes",
+        "invalid_watermark": "无效的水位线：{}（应为 ISO 格式的时间）",
+        "delta_summary": "更新或新增：{}，删除：{}",
+        "delta_watermark": "下一次增量导出的水位线：{}",
+        "help_import_merge": "按 id 合并增量或完整导出文件，保留较新的版本，可以重复执行",
+        "merge_resume_conflict": "--merge 不能与 --resume 同时使用，直接重新执行合并即可",
+        "help_on_conflict": "记录已存在时的处理方式：skip（跳过）、replace（覆盖）或 keep-newest（保留较新的）",
+        "help_match_on": "按账户 + 密码（account）或原始 id（id）识别已存在的记录",
+        "merge_on_conflict_conflict": "--merge 已经会保留较新的版本，不能与 --on-conflict 同时使用",
+        "conflict_summary": "插入或更新：{}，未改变：{}",
+        "confirm_dedupe": "删除账户和密码都相同的重复记录（保留最新的一条），并禁止再添加重复记录？",
+        "dedupe_done": "已删除 {} 条重复记录，之后将拒绝重复记录",
+        "help_import_jobs": "导入目录时并行解析文件的进程数",
+        "import_dir_conflict": "--merge 和 --resume 只能用于单个文件",
+        "no_import_files": "{} 中没有 .json、.jsonl 或 .pgv 文件",
+        "file_imported": "{}：导入 {} / {} 条记录（{} 条/秒）",
+        "import_files_summary": "成功导入 {} 个文件，失败 {} 个，共写入 {} 条记录",
+        "help_socket": "守护进程的 Unix 套接字；守护进程运行时命令通过它访问密码库",
+        "help_serve_cache_ttl": "守护进程缓存解密结果的秒数（0 表示不缓存）",
+        "daemon_running": "守护进程已经在 {} 上运行",
+        "daemon_must_stop": "守护进程正在 {} 上运行，请先停止 passgen serve 再执行此命令",
+        "daemon_listening": "正在 {1} 上提供 {0}（按 Ctrl+C 停止）",
+        "daemon_stopped": "守护进程已停止",
+        "help_bench_size": "测试的密码库规模（可以指定多个）",
+        "help_bench_op": "测试的操作（可以指定多个，默认全部）",
+        "help_bench_samples": "单条记录操作的计时次数",
+        "help_bench_repeat": "整库操作的计时次数",
+        "help_bench_output": "把 JSON 结果写入该文件，而不是标准输出",
+        "help_bench_baseline": "用于比较的基准线 JSON 文件（需要在同一台机器、同样的参数下生成）",
+        "help_bench_tolerance": "相对基准线允许 p50 变慢的比例（0.5 即 50%）",
+        "bench_result": "{} {}：p50 {} 毫秒，p99 {} 毫秒，每秒 {} 条",
+        "bench_regression": "{} {}：p50 {} 毫秒，基准线 {} 毫秒（{} 倍）",
+        "bench_regressions_found": "{} 项测试比基准线慢 {}% 以上",
+        "bench_no_regressions": "与基准线相比没有变慢",
+        "bench_not_comparable": "基准线来自其他机器或使用了不同的参数（{}），如仍要比较请指定 --allow-mismatch",
+        "bench_mismatch_allowed": "基准线来自其他机器或使用了不同的参数（{}），仍然进行比较",
+        "help_bench_allow_mismatch": "基准线来自其他机器或使用了不同的参数时仍然比较，而不是报错退出",
+        "help_metrics": "记录各阶段耗时和计数，命令结束时输出：stderr、json:文件 或 prom:文件（可以指定多个）",
+        "help_profile": "用 cProfile 运行命令并输出最耗时的函数",
+        "help_profile_output": "保存 cProfile 统计数据的文件",
+        "profile_written": "性能分析结果已保存到 {}（可以用 python -m pstats 打开）",
+        "rotation_warning": "将生成新密钥并重新加密所有密码。之后无法再导入使用旧密钥导出的文件。",
+        "rotation_resuming": "继续上次中断的密钥轮换",
+        "confirm_rotate_key": "是否确认轮换加密密钥？",
+        "rotation_cancelled": "已取消密钥轮换",
+        "rotation_progress": "已重新加密 {} 条记录（{} 条/秒）",
+        "rotation_success": "加密密钥已轮换",
+        "rotation_failed": "密钥轮换中断：{}（再次运行 rotate-key 可继续）",
     }
 } 
\ No newline at end of file
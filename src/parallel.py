@@ -0,0 +1,86 @@
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Iterable, List, Sequence, TypeVar, Union
+from cryptography.fernet import Fernet, MultiFernet
+
+# 每个任务处理的记录数
+DEFAULT_CHUNK_SIZE = 500
+
+T = TypeVar('T')
+R = TypeVar('R')
+
+
+def make_fernet(keys: Sequence[bytes]) -> Union[Fernet, MultiFernet]:
+    """用一个或多个密钥创建 Fernet，多个密钥时第一个用于加密"""
+    if len(keys) == 1:
+        return Fernet(keys[0])
+    return MultiFernet([Fernet(key) for key in keys])
+
+
+def chunked(items: Sequence[T], chunk_size: int) -> List[Sequence[T]]:
+    """按固定大小切分"""
+    return [items[i:i + chunk_size] for i in range(0, len(items), chunk_size)]
+
+
+def create_executor(workers: int, use_processes: bool = False) -> Executor:
+    """创建线程池或进程池
+
+    cryptography 在 OpenSSL 中计算时会释放 GIL，线程池通常就足够；
+    进程池可以完全避开 GIL，但需要把密钥和数据复制到子进程。
+    """
+    if use_processes:
+        return ProcessPoolExecutor(max_workers=workers)
+    return ThreadPoolExecutor(max_workers=workers)
+
+
+def map_chunks(func: Callable[..., List[R]], items: Sequence[T], *args,
+               workers: int = 1, chunk_size: int = DEFAULT_CHUNK_SIZE,
+               use_processes: bool = False) -> List[R]:
+    """把 items 分块后并行执行 func(*args, chunk)，按原顺序拼接结果"""
+    if workers <= 1 or len(items) <= chunk_size:
+        return func(*args, items)
+    chunks = chunked(items, chunk_size)
+    results: List[R] = []
+    with create_executor(min(workers, len(chunks)), use_processes) as executor:
+        # executor.map 按提交顺序返回结果
+        for part in executor.map(func, *[[arg] * len(chunks) for arg in args], chunks):
+            results.extend(part)
+    return results
+
+
+def decrypt_chunk(keys: Sequence[bytes], tokens: Iterable[str]) -> List[str]:
+    """解密一组密文（在工作线程或子进程中执行）"""
+    fernet = make_fernet(keys)
+    return [fernet.decrypt(token.encode()).decode() for token in tokens]
+
+
+def encrypt_chunk(keys: Sequence[bytes], passwords: Iterable[str]) -> List[str]:
+    """用第一个密钥加密一组明文密码"""
+    fernet = make_fernet(keys)
+    return [fernet.encrypt(password.encode()).decode() for password in passwords]
+
+
+def encrypt_many(keys: Sequence[bytes], passwords: Sequence[str], workers: int = 1,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE, use_processes: bool = False) -> List[str]:
+    """并行加密，结果顺序与 passwords 一致"""
+    return map_chunks(encrypt_chunk, passwords, list(keys), workers=workers,
+                      chunk_size=chunk_size, use_processes=use_processes)
+
+
+def decrypt_many(keys: Sequence[bytes], tokens: Sequence[str], workers: int = 1,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE, use_processes: bool = False) -> List[str]:
+    """并行解密，结果顺序与 tokens 一致"""
+    return map_chunks(decrypt_chunk, tokens, list(keys), workers=workers,
+                      chunk_size=chunk_size, use_processes=use_processes)
+
+
+def rotate_chunk(keys: Sequence[bytes], tokens: Iterable[str]) -> List[str]:
+    """用第一个密钥重新加密一组密文，密文可以由任意一个密钥加密"""
+    fernet = MultiFernet([Fernet(key) for key in keys])
+    return [fernet.rotate(token.encode()).decode() for token in tokens]
+
+
+def rotate_many(keys: Sequence[bytes], tokens: Sequence[str], workers: int = 1,
+                chunk_size: int = DEFAULT_CHUNK_SIZE, use_processes: bool = False) -> List[str]:
+    """并行重新加密，结果顺序与 tokens 一致"""
+    return map_chunks(rotate_chunk, tokens, list(keys), workers=workers,
+                      chunk_size=chunk_size, use_processes=use_processes)
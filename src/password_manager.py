@@ -1,13 +1,31 @@
-import string
-import random
+import itertools
 import json
-import base64
+import os
+from concurrent.futures import Future
 from pathlib import Path
-from typing import List, Optional, Dict, Any
+from typing import Callable, Iterable, Iterator, List, Optional, Dict, Any, Sequence, Tuple, Union
 from datetime import datetime
 from cryptography.fernet import Fernet
-from sqlalchemy import create_engine, Column, Integer, String, DateTime
+from sqlalchemy import bindparam, func, inspect, select, Column, Index, Integer, String, DateTime
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import declarative_base, sessionmaker, Session
+from .cache import DEFAULT_CACHE_SIZE, DecryptedCache
+from .dedupe import (FINGERPRINT_INDEX, FINGERPRINT_INDEX_NAME, FINGERPRINT_KEY_NAME, conflict_insert,
+                     delete_duplicates, fingerprint, match_account_statements, match_params)
+from .instrumentation import count, instrument_engine, span
+from .generator import CharsetPolicy, generate_password, generate_passwords
+from .key_rotation import KeyRotationState, read_key_file, write_key_file
+from .languages import DEFAULT_LANGUAGE
+from .records import PasswordPage, PasswordRecord
+from .parallel import decrypt_many, encrypt_many, make_fernet, rotate_many
+from .search import account_index, create_fts, filter_account, has_fts
+from .storage import add_missing_columns, create_sqlite_engine, database_size, resolve_profile
+from .sync import (TOMBSTONE_TABLE, WATERMARK_OVERLAP, create_sync_triggers, delta_meta, iter_changes,
+                   new_sync_id, truncate_to_tombstone_precision)
+from .binary_format import DEFAULT_COMPRESSION
+from .pipeline import FileResult, ParseOptions, import_files
+from .transfer import ImportCheckpoint, ProgressCallback, TransferStats, import_rows, open_records, write_records
+from .write_queue import WriteQueue
 
 # 定义基础类
 Base = declarative_base()
@@ -21,150 +39,848 @@ class Password(Base):
     note = Column(String)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # 密码指纹（见 dedupe.fingerprint），用于导入时识别重复记录
+    fingerprint = Column(String)
+    # 记录在本地最后一次写入的时间，增量导出按它筛选；导入和合并时 updated_at
+    # 保留文件中的时间，不能代表记录何时写入本地
+    changed_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # 同步标识（UUID），增量合并和墓碑按它匹配记录；本地自增 id 在不同主机上会冲突
+    sync_id = Column(String, default=new_sync_id)
+
+class VaultMeta(Base):
+    """密码库的元数据（键值对）"""
+    __tablename__ = 'vault_meta'
+
+    name = Column(String, primary_key=True)
+    value = Column(String, nullable=False)
+
+class Tombstone(Base):
+    """已删除记录的 sync_id 和删除时间，由触发器写入，用于增量同步"""
+    __tablename__ = TOMBSTONE_TABLE
+
+    sync_id = Column(String, primary_key=True)
+    deleted_at = Column(DateTime, nullable=False, index=True)
+
+# account 列索引，用于前缀搜索
+ACCOUNT_INDEX = account_index(Password.__table__)
+
+# changed_at 列索引，用于增量导出
+CHANGED_INDEX = Index('ix_passwords_changed_at', Password.__table__.c.changed_at)
+
+# sync_id 唯一索引，合并时按它 upsert
+SYNC_ID_INDEX = Index('ux_passwords_sync_id', Password.__table__.c.sync_id, unique=True)
+
+# 单条语句中 IN 列表的最大参数数量
+MAX_SQL_PARAMS = 900
+
+METADATA_COLUMNS = (Password.id, Password.account, Password.note,
+                    Password.created_at, Password.updated_at)
+
+# 导出一条记录需要的列（见 _export_record）
+EXPORT_COLUMNS = METADATA_COLUMNS + (Password.encrypted_password, Password.sync_id)
 
 class PasswordManager:
-    def __init__(self, db_path: str = "passwords.db", key_path: str = "key.key") -> None:
+    def __init__(self, db_path: str = "passwords.db", key_path: str = "key.key", fts: bool = False,
+                 profile: Optional[str] = None, cache_ttl: Optional[float] = None,
+                 cache_size: int = DEFAULT_CACHE_SIZE, commit_delay: Optional[float] = None) -> None:
         self.db_path = db_path
         self.key_path = Path(key_path)
         self.key = self._load_or_generate_key()
-        self.fernet = Fernet(self.key)
+        # 密钥轮换未完成时同时使用新旧密钥：新密钥加密，两个密钥都可以解密
+        self.rotation = KeyRotationState(self.key_path)
+        pending_key = self.rotation.load_pending_key()
+        self.keys = [pending_key, self.key] if pending_key else [self.key]
+        self.fernet = make_fernet(self.keys)
         
-        # 初始化数据库
-        self.engine = create_engine(f'sqlite:///{db_path}')
+        # 初始化数据库，profile 为 'durable' 或 'fast'（见 storage.STORAGE_PROFILES）
+        self.profile = resolve_profile(profile)
+        self.engine = create_sqlite_engine(db_path, self.profile)
+        instrument_engine(self.engine)
         Base.metadata.create_all(self.engine)
+        if 'changed_at' in add_missing_columns(self.engine, Password.__table__):
+            self._backfill_changed_at()
+        ACCOUNT_INDEX.create(self.engine, checkfirst=True)
+        CHANGED_INDEX.create(self.engine, checkfirst=True)
+        SYNC_ID_INDEX.create(self.engine, checkfirst=True)
+        self._backfill_sync_ids()
+        create_sync_triggers(self.engine)
         self.Session = sessionmaker(bind=self.engine)
-        self.language = "en"  # 默认语言为英文
+        # 全文索引建立后会一直保留在数据库中，之后的搜索自动使用
+        if fts:
+            self.enable_fts()
+        self.fts_enabled = has_fts(self.engine)
+        self.language = DEFAULT_LANGUAGE  # 默认语言为英文
+        # 可选的解密结果缓存：cache_ttl 为明文保留的秒数，None 表示不缓存
+        self.cache = DecryptedCache(cache_ttl, cache_size) if cache_ttl else None
+        self._fingerprint_key: Optional[bytes] = None
+        # 可选的组提交：commit_delay 秒内多个线程的 add_password / delete_password 合并为一个事务
+        self.write_queue = WriteQueue(self.engine, commit_delay) if commit_delay is not None else None
+
+    def _backfill_changed_at(self) -> None:
+        """旧数据库中的记录以 updated_at 作为最后写入时间"""
+        table = Password.__table__
+        with self.engine.begin() as conn:
+            conn.execute(table.update().values(changed_at=table.c.updated_at, updated_at=table.c.updated_at))
+
+    def _backfill_sync_ids(self) -> None:
+        """为旧数据库或其他客户端写入的记录补充 sync_id（不改变 updated_at 和 changed_at）"""
+        table = Password.__table__
+        missing = select(table.c.id).where(table.c.sync_id.is_(None)).limit(1)
+        with self.engine.begin() as conn:
+            if conn.execute(missing).first() is None:
+                return
+            conn.execute(table.update()
+                         .where(table.c.sync_id.is_(None))
+                         .values(sync_id=func.lower(func.hex(func.randomblob(16))),
+                                 updated_at=table.c.updated_at, changed_at=table.c.changed_at))
 
     def _load_or_generate_key(self) -> bytes:
         """加载或生成新的加密密钥"""
         if self.key_path.exists():
-            return base64.urlsafe_b64decode(self.key_path.read_bytes())
+            return read_key_file(self.key_path)
         
         key = Fernet.generate_key()
-        self.key_path.write_bytes(base64.urlsafe_b64encode(key))
+        write_key_file(self.key_path, key)
         return key
 
-    def generate_password(self, length: int = 12, exclude: str = "") -> str:
-        """生成随机密码"""
-        # 定义字符集
-        chars = string.ascii_letters + string.digits + string.punctuation
-        # 移除需要排除的字符
-        for char in exclude:
-            chars = chars.replace(char, '')
-        
-        # 生成密码
-        return ''.join(random.choice(chars) for _ in range(length))
+    def rotate_key(self, batch_size: int = 1000, workers: int = 1, use_processes: bool = False,
+                   progress: Optional[ProgressCallback] = None) -> Dict[str, Any]:
+        """轮换加密密钥，用新密钥重新加密所有记录
+
+        按 id 顺序分批读取密文，用 MultiFernet 重新加密（workers 大于 1 时并行），
+        每批在一个事务中写回并记录检查点。中断后再次调用会使用同一个新密钥从检查点继续。
+        全部完成后新密钥替换 key_path 中的旧密钥。返回 rows / seconds / rows_per_second。
+        """
+        new_key = self.rotation.load_pending_key() or self.rotation.start()
+        last_id = self.rotation.load_checkpoint()
+        self.keys = [new_key, self.key]
+        self.fernet = make_fernet(self.keys)
+
+        table = Password.__table__
+        # 显式保留 updated_at 和 changed_at：重新加密不算记录内容的修改
+        update = (table.update()
+                  .where(table.c.id == bindparam('row_id'))
+                  .values(encrypted_password=bindparam('token'), updated_at=table.c.updated_at,
+                          changed_at=table.c.changed_at))
+        stats = TransferStats()
+        while True:
+            with self.engine.begin() as conn:
+                rows = conn.execute(
+                    select(table.c.id, table.c.encrypted_password)
+                    .where(table.c.id > last_id)
+                    .order_by(table.c.id)
+                    .limit(batch_size)
+                ).all()
+                if not rows:
+                    break
+                tokens = rotate_many(self.keys, [row.encrypted_password for row in rows],
+                                     workers=workers, use_processes=use_processes)
+                conn.execute(update, [{'row_id': row.id, 'token': token}
+                                      for row, token in zip(rows, tokens)])
+            last_id = rows[-1].id
+            self.rotation.save_checkpoint(last_id)
+            stats.rows += len(rows)
+            if progress:
+                progress(stats.rows, stats.elapsed)
+
+        # 指纹密钥本身不变，只用新密钥重新加密
+        meta = VaultMeta.__table__
+        with self.engine.begin() as conn:
+            token = conn.execute(select(meta.c.value).where(meta.c.name == FINGERPRINT_KEY_NAME)).scalar()
+            if token:
+                conn.execute(meta.update().where(meta.c.name == FINGERPRINT_KEY_NAME)
+                             .values(value=self.fernet.rotate(token.encode()).decode()))
+
+        self.rotation.finish()
+        self.key = new_key
+        self.keys = [new_key]
+        self.fernet = make_fernet(self.keys)
+        self.invalidate_cache()
+        return stats.finish().to_dict()
+
+    def generate_password(self, length: int = 12, exclude: str = "",
+                          policy: Optional[CharsetPolicy] = None) -> str:
+        """生成随机密码，指定 policy 时按字符集策略生成（忽略 exclude）"""
+        return generate_password(length, exclude, policy)
+
+    def generate_passwords(self, n: int, length: int = 12, exclude: str = "",
+                           policy: Optional[CharsetPolicy] = None) -> Iterator[str]:
+        """批量生成随机密码（流式返回）"""
+        return generate_passwords(n, length, exclude, policy)
+
+    @property
+    def fingerprint_key(self) -> bytes:
+        """密码指纹使用的 HMAC 密钥，首次使用时生成并加密保存在数据库中"""
+        if self._fingerprint_key is None:
+            meta = VaultMeta.__table__
+            with self.engine.begin() as conn:
+                token = conn.execute(select(meta.c.value).where(meta.c.name == FINGERPRINT_KEY_NAME)).scalar()
+                if token is None:
+                    # 多个线程或进程同时生成时只保留最先写入的密钥
+                    conn.execute(meta.insert().prefix_with('OR IGNORE').values(
+                        name=FINGERPRINT_KEY_NAME, value=self.fernet.encrypt(os.urandom(32)).decode()))
+                    token = conn.execute(select(meta.c.value).where(meta.c.name == FINGERPRINT_KEY_NAME)).scalar()
+            self._fingerprint_key = self.fernet.decrypt(token.encode())
+        return self._fingerprint_key
+
+    def _fingerprints(self, passwords: Iterable[str]) -> List[str]:
+        key = self.fingerprint_key
+        return [fingerprint(key, password) for password in passwords]
+
+    def _fingerprint_tokens(self, tokens: Sequence[str], workers: int = 1) -> List[str]:
+        """解密密文并计算指纹（密文无法用当前密钥解密时抛出异常）"""
+        return self._fingerprints(decrypt_many(self.keys, tokens, workers=workers))
+
+    def has_unique_index(self) -> bool:
+        """是否已经建立 account + 指纹的唯一索引"""
+        return any(index['name'] == FINGERPRINT_INDEX_NAME
+                   for index in inspect(self.engine).get_indexes(Password.__tablename__))
 
     def add_password(self, account: str, password: str, note: str = "") -> None:
         """添加新密码"""
+        if self.write_queue is not None:
+            self.submit_add_password(account, password, note).result()
+            return
         session = self.Session()
         try:
-            encrypted_password = self.fernet.encrypt(password.encode()).decode()
+            with span('encrypt'):
+                encrypted_password = self.fernet.encrypt(password.encode()).decode()
+            count('rows_encrypted')
             new_password = Password(
                 account=account,
                 encrypted_password=encrypted_password,
-                note=note
+                note=note,
+                fingerprint=self._fingerprints([password])[0]
             )
             session.add(new_password)
             session.commit()
+            self.invalidate_cache([new_password.id])
         finally:
             session.close()
 
-    def get_passwords(self, search_term: Optional[str] = None) -> List[Dict[str, Any]]:
-        """获取所有密码"""
+    def submit_add_password(self, account: str, password: str, note: str = "") -> 'Future[int]':
+        """通过写入队列添加密码，返回新记录 id 的 Future（需要启用 commit_delay）"""
+        current_time = datetime.utcnow()
+        with span('encrypt'):
+            token = self.fernet.encrypt(password.encode()).decode()
+        count('rows_encrypted')
+        row = {
+            'account': account,
+            'encrypted_password': token,
+            'note': note,
+            'fingerprint': self._fingerprints([password])[0],
+            'created_at': current_time,
+            'updated_at': current_time,
+        }
+
+        def insert(conn: Any) -> int:
+            row_id = conn.execute(Password.__table__.insert(), row).inserted_primary_key[0]
+            self.invalidate_cache([row_id])
+            return row_id
+
+        return self._submit(insert)
+
+    def _submit(self, op: Callable[[Any], Any]) -> Future:
+        if self.write_queue is None:
+            raise RuntimeError("没有启用写入队列（commit_delay）")
+        return self.write_queue.submit(op)
+
+    def add_passwords(self, entries: Iterable[Union[Dict[str, Any], Sequence[str]]],
+                      batch_size: int = 1000, workers: int = 1,
+                      use_processes: bool = False) -> List[int]:
+        """批量添加密码，返回新记录的 id（与输入顺序一致）
+
+        entries 中每一项为 {'account', 'password', 'note'} 字典或 (account, password[, note]) 元组。
+        每 batch_size 条加密一次（workers 大于 1 时并行）并批量插入，所有批次在同一个事务中提交。
+        """
+        table = Password.__table__
+        insert = table.insert().returning(table.c.id, sort_by_parameter_order=True)
+        ids: List[int] = []
+        current_time = datetime.utcnow()
+        entries = iter(entries)
+        with self.engine.begin() as conn:
+            while True:
+                batch = [self._normalize_entry(entry) for entry in itertools.islice(entries, batch_size)]
+                if not batch:
+                    break
+                with span('encrypt'):
+                    tokens = encrypt_many(self.keys, [password for _, password, _ in batch],
+                                          workers=workers, use_processes=use_processes)
+                count('rows_encrypted', len(batch))
+                fingerprints = self._fingerprints(password for _, password, _ in batch)
+                rows = [{
+                    'account': account,
+                    'encrypted_password': token,
+                    'note': note,
+                    'fingerprint': fp,
+                    'created_at': current_time,
+                    'updated_at': current_time
+                } for (account, _, note), token, fp in zip(batch, tokens, fingerprints)]
+                ids.extend(conn.execute(insert, rows).scalars())
+        self.invalidate_cache(ids)
+        return ids
+
+    @staticmethod
+    def _normalize_entry(entry: Union[Dict[str, Any], Sequence[str]]) -> Tuple[str, str, str]:
+        """把字典或元组转换为 (account, password, note)"""
+        if isinstance(entry, dict):
+            account, password, note = entry['account'], entry['password'], entry.get('note')
+        else:
+            account, password, note = (tuple(entry) + (None,))[:3]
+        if not account or password is None:
+            raise ValueError(f"记录缺少账户或密码: {account!r}")
+        return account, password, note or ""
+
+    def enable_fts(self) -> None:
+        """建立 FTS5 trigram 全文索引，加速子串搜索"""
+        create_fts(self.engine)
+        self.fts_enabled = True
+
+    def _filter_account(self, query: Any, search_term: Optional[str], match: str) -> Any:
+        return filter_account(query, Password.__table__, search_term, match, self.fts_enabled)
+
+    def get_passwords(self, search_term: Optional[str] = None, match: str = 'contains',
+                      workers: int = 1, use_processes: bool = False) -> List[Dict[str, Any]]:
+        """获取所有密码
+
+        match 为 'contains'（子串匹配）或 'prefix'（前缀匹配，使用 account 索引）。
+        workers 大于 1 时分块并行解密，use_processes 为 True 时使用进程池代替线程池。
+        """
+        records = self.get_records(search_term, match)
+        self.decrypt_records(records, workers, use_processes)
+        return [record.to_dict() for record in records]
+
+    def decrypt_records(self, records: List[PasswordRecord], workers: int = 1,
+                        use_processes: bool = False) -> None:
+        """一次性解密尚未解密的记录，可以分块并行执行"""
+        if workers <= 1:
+            return
+        pending = [record for record in records if not record.is_decrypted]
+        if self.cache is not None:
+            for record in pending:
+                record._password = self.cache.get(record.id, record.encrypted_password)
+            pending = [record for record in pending if not record.is_decrypted]
+        if not pending:
+            return
+        with span('decrypt'):
+            passwords = decrypt_many(self.keys, [record.encrypted_password for record in pending],
+                                     workers=workers, use_processes=use_processes)
+        count('rows_decrypted', len(pending))
+        for record, password in zip(pending, passwords):
+            record._password = password
+            if self.cache is not None:
+                self.cache.put(record.id, record.encrypted_password, password)
+
+    def invalidate_cache(self, record_ids: Optional[Iterable[int]] = None) -> None:
+        """使缓存中的记录失效，不传 record_ids 时清空缓存"""
+        if self.cache is not None:
+            self.cache.invalidate(record_ids)
+
+    def get_records(self, search_term: Optional[str] = None, match: str = 'contains') -> List[PasswordRecord]:
+        """获取密码记录，密码在首次访问 .password 时才解密"""
         session = self.Session()
         try:
-            query = session.query(Password)
-            if search_term:
-                query = query.filter(Password.account.like(f'%{search_term}%'))
-            
-            passwords = []
-            for p in query.all():
-                decrypted_password = self.fernet.decrypt(p.encrypted_password.encode()).decode()
-                passwords.append({
-                    'id': p.id,
-                    'account': p.account,
-                    'password': decrypted_password,
-                    'note': p.note,
-                    'created_at': p.created_at,
-                    'updated_at': p.updated_at
-                })
-            return passwords
+            query = session.query(*METADATA_COLUMNS, Password.encrypted_password)
+            query = self._filter_account(query, search_term, match).order_by(Password.id)
+            # SQL 事件只统计执行语句的时间，读取结果行的时间单独统计
+            with span('sql.fetch'):
+                rows = query.all()
+            count('rows_read', len(rows))
+            return [PasswordRecord(row, self.fernet, self.cache) for row in rows]
         finally:
             session.close()
 
-    def delete_password(self, password_id: int) -> bool:
-        """删除密码"""
+    def list_accounts(self, search_term: Optional[str] = None, match: str = 'contains') -> List[Dict[str, Any]]:
+        """只获取元数据（id/account/note/时间），不读取也不解密密码"""
         session = self.Session()
         try:
-            password = session.query(Password).filter_by(id=password_id).first()
-            if password:
-                session.delete(password)
-                session.commit()
-                return True
-            return False
+            query = session.query(*METADATA_COLUMNS)
+            query = self._filter_account(query, search_term, match).order_by(Password.id)
+            return [dict(row._mapping) for row in query.all()]
         finally:
             session.close()
 
-    def export_passwords(self, export_path: str) -> None:
-        """导出密码文件，只保持密码字段加密"""
+    def get_passwords_page(self, limit: int = 20, after: Optional[int] = None,
+                           before: Optional[int] = None, order: str = 'asc',
+                           search_term: Optional[str] = None,
+                           match: str = 'contains') -> PasswordPage:
+        """分页获取密码记录（按 id 的键集分页）
+
+        after 为上一页的 next_cursor，before 为下一页的 prev_cursor，两者都不传时返回第一页。
+        每页只查询 limit + 1 行，耗时与记录总数无关；记录中的密码在首次访问时才解密。
+        """
+        if order not in ('asc', 'desc'):
+            raise ValueError(f"不支持的排序方式: {order}")
+        if after is not None and before is not None:
+            raise ValueError("after 和 before 不能同时指定")
+        # 向前翻页时反向扫描，取到结果后再恢复为页面顺序
+        backwards = before is not None
+        ascending = (order == 'asc') != backwards
+        cursor = before if backwards else after
+
         session = self.Session()
         try:
-            # 获取所有记录，只保持密码字段加密
-            passwords = []
-            for p in session.query(Password).all():
-                passwords.append({
-                    'id': p.id,
-                    'account': p.account,
-                    'encrypted_password': p.encrypted_password,  # 保持密码字段加密
-                    'note': p.note,
-                    'created_at': p.created_at.isoformat(),
-                    'updated_at': p.updated_at.isoformat()
-                })
-            
-            # 直接写入 JSON 文件
-            with open(export_path, 'w', encoding='utf-8') as f:
-                json.dump(passwords, f, ensure_ascii=False, indent=2)
+            query = session.query(*METADATA_COLUMNS, Password.encrypted_password)
+            query = self._filter_account(query, search_term, match)
+            if cursor is not None:
+                query = query.filter(Password.id > cursor if ascending else Password.id < cursor)
+            query = query.order_by(Password.id.asc() if ascending else Password.id.desc())
+            with span('sql.fetch'):
+                rows = query.limit(limit + 1).all()
+            count('rows_read', len(rows))
         finally:
             session.close()
 
-    def import_passwords(self, import_path: str) -> None:
-        """导入密码，所有记录作为新数据添加"""
-        with open(import_path, 'r', encoding='utf-8') as f:
-            passwords = json.load(f)
-        
+        has_more = len(rows) > limit
+        records = [PasswordRecord(row, self.fernet, self.cache) for row in rows[:limit]]
+        if backwards:
+            records.reverse()
+            return PasswordPage(records, has_next=True, has_prev=has_more)
+        return PasswordPage(records, has_next=has_more, has_prev=cursor is not None)
+
+    def get_account(self, password_id: int) -> Optional[Dict[str, Any]]:
+        """按 ID 获取单条记录的元数据"""
+        session = self.Session()
+        try:
+            row = session.query(*METADATA_COLUMNS).filter(Password.id == password_id).first()
+            return dict(row._mapping) if row else None
+        finally:
+            session.close()
+
+    def get_password(self, password_id: int) -> Optional[str]:
+        """按 ID 解密单条记录的密码，记录不存在时返回 None"""
+        session = self.Session()
+        try:
+            row = (session.query(*METADATA_COLUMNS, Password.encrypted_password)
+                   .filter(Password.id == password_id).first())
+        finally:
+            session.close()
+        return PasswordRecord(row, self.fernet, self.cache).password if row else None
+
+    def delete_password(self, password_id: int) -> bool:
+        """删除密码"""
+        if self.write_queue is not None:
+            return self.submit_delete_password(password_id).result()
+        return self.delete_passwords(ids=[password_id]) > 0
+
+    def submit_delete_password(self, password_id: int) -> 'Future[bool]':
+        """通过写入队列删除密码，返回是否删除成功的 Future（需要启用 commit_delay）"""
+        table = Password.__table__
+
+        def delete(conn: Any) -> bool:
+            deleted = conn.execute(table.delete().where(table.c.id == password_id)).rowcount > 0
+            self.invalidate_cache([password_id])
+            return deleted
+
+        return self._submit(delete)
+
+    def delete_passwords(self, ids: Optional[Iterable[int]] = None,
+                         account_pattern: Optional[str] = None,
+                         older_than: Optional[datetime] = None) -> int:
+        """按条件批量删除，返回删除的记录数
+
+        ids 为 id 列表，account_pattern 为 LIKE 模式（如 'test%@example.com'），
+        older_than 删除创建时间早于该时间的记录；多个条件同时满足才删除，至少需要一个条件。
+        不加载记录，直接执行 DELETE ... WHERE，所有删除在同一个事务中完成。
+        """
+        table = Password.__table__
+        # ids 之后还要用于清除缓存，可能是只能遍历一次的生成器
+        ids = list(ids) if ids is not None else None
+        deleted = 0
+        with self.engine.begin() as conn:
+            for conditions in self._match_conditions(ids, account_pattern, older_than):
+                deleted += conn.execute(table.delete().where(*conditions)).rowcount
+        # 按模式或时间删除时不知道具体 id，直接清空缓存
+        self.invalidate_cache(ids if account_pattern is None and older_than is None else None)
+        return deleted
+
+    def count_passwords(self, ids: Optional[Iterable[int]] = None,
+                        account_pattern: Optional[str] = None,
+                        older_than: Optional[datetime] = None) -> int:
+        """统计满足条件的记录数（条件同 delete_passwords，不传条件时统计全部）"""
+        table = Password.__table__
+        total = 0
+        with self.engine.connect() as conn:
+            for conditions in self._match_conditions(ids, account_pattern, older_than, required=False):
+                total += conn.execute(select(func.count()).select_from(table).where(*conditions)).scalar()
+        return total
+
+    def count_by_account(self, limit: Optional[int] = None) -> List[Tuple[str, int]]:
+        """每个账户的记录数，按数量从多到少排序"""
+        table = Password.__table__
+        count = func.count().label('count')
+        query = select(table.c.account, count).group_by(table.c.account).order_by(count.desc(), table.c.account)
+        if limit is not None:
+            query = query.limit(limit)
+        with self.engine.connect() as conn:
+            return [(row.account, row.count) for row in conn.execute(query)]
+
+    def stats(self) -> Dict[str, Any]:
+        """密码库统计：记录数、账户数、最早/最新创建时间和磁盘占用，全部由聚合 SQL 计算"""
+        table = Password.__table__
+        query = select(
+            func.count().label('count'),
+            func.count(table.c.account.distinct()).label('accounts'),
+            func.min(table.c.created_at).label('oldest'),
+            func.max(table.c.created_at).label('newest'),
+        )
+        with self.engine.connect() as conn:
+            row = conn.execute(query).one()
+        result = dict(row._mapping)
+        result['size_bytes'] = database_size(self.db_path)
+        return result
+
+    def find_accounts(self, ids: Optional[Iterable[int]] = None,
+                      account_pattern: Optional[str] = None,
+                      older_than: Optional[datetime] = None,
+                      limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """获取满足条件的记录元数据（条件同 delete_passwords），按 id 排序"""
+        table = Password.__table__
+        accounts: List[Dict[str, Any]] = []
+        with self.engine.connect() as conn:
+            for conditions in self._match_conditions(ids, account_pattern, older_than, required=False):
+                query = select(*METADATA_COLUMNS).where(*conditions).order_by(table.c.id)
+                if limit is not None:
+                    query = query.limit(limit - len(accounts))
+                accounts.extend(dict(row._mapping) for row in conn.execute(query))
+                if limit is not None and len(accounts) >= limit:
+                    break
+        return accounts
+
+    @staticmethod
+    def _match_conditions(ids: Optional[Iterable[int]], account_pattern: Optional[str],
+                          older_than: Optional[datetime], required: bool = True) -> Iterator[List[Any]]:
+        """生成 WHERE 条件；id 列表较长时按 SQLite 参数数量上限分组，每组一条语句"""
+        table = Password.__table__
+        conditions = []
+        if account_pattern:
+            conditions.append(table.c.account.like(account_pattern))
+        if older_than is not None:
+            conditions.append(table.c.created_at < older_than)
+        if ids is None:
+            if required and not conditions:
+                raise ValueError("至少需要指定一个删除条件")
+            yield conditions
+            return
+        ids = sorted(set(ids))
+        for start in range(0, len(ids), MAX_SQL_PARAMS):
+            yield conditions + [table.c.id.in_(ids[start:start + MAX_SQL_PARAMS])]
+
+    def export_passwords(self, export_path: str, fmt: str = 'json', batch_size: int = 1000,
+                         progress: Optional[ProgressCallback] = None,
+                         compression: str = DEFAULT_COMPRESSION) -> Dict[str, Any]:
+        """导出密码文件，只保持密码字段加密
+
+        按 batch_size 分批从数据库读取并逐条写入文件，内存占用不随记录数增长。
+        fmt 为 'json'（JSON 数组）、'jsonl'（每行一条记录）或 'binary'
+        （二进制格式，compression 为 'none' / 'zlib' / 'zstd'）。
+        返回导出统计：rows / seconds / rows_per_second。
+        """
         session = self.Session()
+        try:
+            query = (session.query(*EXPORT_COLUMNS)
+                     .order_by(Password.id)
+                     .yield_per(batch_size))
+            if fmt == 'binary':
+                f = open(export_path, 'wb')
+            else:
+                f = open(export_path, 'w', encoding='utf-8')
+            with f:
+                stats = write_records(f, (self._export_record(p) for p in query), fmt,
+                                      progress=progress, progress_every=batch_size,
+                                      compression=compression)
+            count('rows_exported', stats.rows)
+            return stats.to_dict()
+        finally:
+            session.close()
+
+    @staticmethod
+    def _export_record(p: Any) -> Dict[str, Any]:
+        """转换为导出格式，只保持密码字段加密"""
+        return {
+            'id': p.id,
+            'account': p.account,
+            'encrypted_password': p.encrypted_password,  # 保持密码字段加密
+            'note': p.note,
+            'created_at': p.created_at.isoformat(),
+            'updated_at': p.updated_at.isoformat(),
+            'sync_id': p.sync_id
+        }
+
+    def import_passwords(self, import_path: str, batch_size: int = 1000, resume: bool = False,
+                         progress: Optional[ProgressCallback] = None,
+                         on_conflict: Optional[str] = None, match_on: str = 'account',
+                         workers: int = 1) -> Dict[str, Any]:
+        """导入密码
+
+        流式读取 JSON 数组、JSON Lines 或二进制导出文件（自动识别），
+        每 batch_size 条记录批量插入并提交一次，检查点与记录在同一个事务中提交；
+        导入中断后传入 resume=True 可跳过已提交的记录继续导入，不会重复插入。
+
+        不指定 on_conflict 时所有记录作为新数据添加；指定时按 match_on 识别重复记录
+        （'account'：账户名 + 密码指纹，'id'：原始 id），用 INSERT ... ON CONFLICT 处理：
+        'skip' 保留已有记录，'replace' 覆盖，'keep-newest' 保留 updated_at 较新的一方，
+        此时保留文件中的时间戳（changed_at 仍为写入时间，之后的增量导出会包含这些记录），
+        重复导入同一文件不会产生新记录。
+        按账户匹配或已建立唯一索引时需要解密密文计算指纹，workers 大于 1 时并行解密；
+        其余情况指纹留空，之后需要时由 backfill_fingerprints 补齐。
+        按账户匹配不会建立唯一索引，库中已有重复记录时也可以导入（见 _prepare_import）。
+        返回导入统计：rows / seconds / rows_per_second / applied（实际插入或更新的记录数）。
+        """
+        write, with_fingerprints = self._prepare_import(on_conflict, match_on, workers)
+        checkpoint = ImportCheckpoint(VaultMeta.__table__, import_path)
+        skip = 0
+        if resume:
+            with self.engine.connect() as conn:
+                skip = checkpoint.load(conn)
+        stats = TransferStats()
+        applied = 0
         try:
             current_time = datetime.utcnow()
-            for p in passwords:
-                # 为导入的每条记录生成新的记录，使用当前时间
-                new_password = Password(
-                    account=p['account'],
-                    encrypted_password=p['encrypted_password'],  # 保持密码的加密状态
-                    note=p.get('note', ''),
-                    created_at=current_time,
-                    updated_at=current_time
-                )
-                session.add(new_password)
-            session.commit()
+            with open_records(import_path) as records:
+                records = itertools.islice(records, skip, None)
+                while True:
+                    records_batch = list(itertools.islice(records, batch_size))
+                    if not records_batch:
+                        break
+                    fingerprints = [None] * len(records_batch)
+                    if with_fingerprints:
+                        fingerprints = self._fingerprint_tokens(
+                            [p['encrypted_password'] for p in records_batch], workers)
+                    batch = import_rows(records_batch, fingerprints, current_time,
+                                        keep_timestamps=on_conflict is not None,
+                                        keep_ids=on_conflict is not None and match_on == 'id')
+                    # 每批一个事务，使用 executemany 批量插入
+                    with self.engine.begin() as conn:
+                        applied += write(conn, batch)
+                        checkpoint.save(conn, skip + stats.rows + len(batch))
+                    count('rows_imported', len(batch))
+                    stats.rows += len(batch)
+                    if progress:
+                        progress(stats.rows, stats.elapsed)
         except Exception as e:
-            session.rollback()
             raise Exception(f"导入过程中出错: {str(e)}")
         finally:
-            session.close()
+            # 即使中途失败，已提交的批次也已写入数据库
+            self.invalidate_cache()
+        with self.engine.begin() as conn:
+            checkpoint.clear(conn)
+        return {**stats.finish().to_dict(), 'applied': applied}
+
+    def _prepare_import(self, on_conflict: Optional[str], match_on: str,
+                        workers: int = 1) -> Tuple[Callable[[Any, List[Dict[str, Any]]], int], bool]:
+        """生成导入使用的写入函数 write(conn, rows)（返回实际插入或更新的记录数），并确定是否需要计算指纹
+
+        按账户匹配时，已建立唯一索引（见 create_unique_index）则使用 INSERT ... ON CONFLICT；
+        否则先补齐已有记录的指纹，再用 NOT EXISTS 判断重复，不会自动建立唯一索引。
+        """
+        table = Password.__table__
+        unique = self.has_unique_index()
+        if on_conflict is not None and match_on == 'account' and not unique:
+            self.backfill_fingerprints(workers=workers)
+            update, insert = match_account_statements(table, on_conflict)
+
+            def write_matched(conn: Any, rows: List[Dict[str, Any]]) -> int:
+                current_time = datetime.utcnow()
+                params = match_params([{**row, 'changed_at': current_time, 'sync_id': new_sync_id()}
+                                       for row in rows], on_conflict)
+                applied = conn.execute(update, params).rowcount if update is not None else 0
+                return applied + conn.execute(insert, params).rowcount
+
+            return write_matched, True
+
+        insert = table.insert() if on_conflict is None else conflict_insert(table, on_conflict, match_on)
+
+        def write(conn: Any, rows: List[Dict[str, Any]]) -> int:
+            return conn.execute(insert, rows).rowcount
+
+        return write, unique
+
+    def import_files(self, paths: Sequence[str], jobs: int = 1, batch_size: int = 1000,
+                     on_conflict: Optional[str] = None, match_on: str = 'account',
+                     on_file: Optional[Callable[[FileResult], None]] = None) -> List[FileResult]:
+        """并行导入多个文件（见 pipeline.import_files）
+
+        jobs 个进程解析并校验文件（解密每条密文，需要时同时计算指纹），
+        一个写入线程按文件逐个写入，每个文件在一个事务中提交；
+        出错的文件不会写入任何记录，也不影响其他文件。on_file 在每个文件完成后调用。
+        """
+        write_rows, with_fingerprints = self._prepare_import(on_conflict, match_on)
+        options = ParseOptions(
+            keys=list(self.keys),
+            fingerprint_key=self.fingerprint_key if with_fingerprints else None,
+            current_time=datetime.utcnow(),
+            keep_timestamps=on_conflict is not None,
+            keep_ids=on_conflict is not None and match_on == 'id',
+        )
+
+        def write(rows: List[Dict[str, Any]]) -> int:
+            applied = 0
+            with self.engine.begin() as conn:
+                for start in range(0, len(rows), batch_size):
+                    applied += write_rows(conn, rows[start:start + batch_size])
+            return applied
 
-    def clear_all_passwords(self) -> bool:
-        """清空所有密码"""
-        session = self.Session()
         try:
-            session.query(Password).delete()
-            session.commit()
+            return import_files(paths, options, write, jobs=jobs, on_file=on_file)
+        finally:
+            self.invalidate_cache()
+
+    def backfill_fingerprints(self, batch_size: int = 1000, workers: int = 1) -> int:
+        """为还没有指纹的记录（旧版本写入的数据）计算指纹，返回处理的记录数"""
+        table = Password.__table__
+        update = (table.update()
+                  .where(table.c.id == bindparam('row_id'))
+                  .values(fingerprint=bindparam('fp'), updated_at=table.c.updated_at,
+                          changed_at=table.c.changed_at))
+        total = 0
+        while True:
+            with self.engine.begin() as conn:
+                rows = conn.execute(
+                    select(table.c.id, table.c.encrypted_password)
+                    .where(table.c.fingerprint.is_(None))
+                    .order_by(table.c.id)
+                    .limit(batch_size)
+                ).all()
+                if not rows:
+                    return total
+                fingerprints = self._fingerprint_tokens([row.encrypted_password for row in rows], workers)
+                conn.execute(update, [{'row_id': row.id, 'fp': fp} for row, fp in zip(rows, fingerprints)])
+            total += len(rows)
+
+    def create_unique_index(self, dedupe: bool = False, workers: int = 1) -> int:
+        """建立 account + 指纹的唯一索引，之后不能再添加账户和密码都相同的记录
+
+        dedupe 为 True 时先删除重复记录（保留最新的一条），返回删除的记录数；
+        否则存在重复记录时抛出 ValueError。
+        """
+        table = Password.__table__
+        existed = self.has_unique_index()
+        self.backfill_fingerprints(workers=workers)
+        removed = 0
+        try:
+            with self.engine.begin() as conn:
+                if dedupe:
+                    removed = conn.execute(delete_duplicates(table)).rowcount
+                conn.exec_driver_sql(FINGERPRINT_INDEX)
+        except IntegrityError:
+            raise ValueError("存在账户和密码都相同的重复记录，请先去重")
+        if not existed:
+            # 连接池中的其他连接可能还缓存着旧的表结构，准备 ON CONFLICT 语句时找不到新索引
+            self.engine.dispose()
+        if removed:
+            self.invalidate_cache()
+        return removed
+
+    def export_changes(self, export_path: str, since: Optional[datetime] = None, batch_size: int = 1000,
+                       progress: Optional[ProgressCallback] = None) -> Dict[str, Any]:
+        """增量导出 since 之后的变更（JSON Lines）
+
+        本地新增或修改的记录（changed_at >= since，使用索引，包括导入和合并写入的记录）
+        写为 upsert，删除的记录（墓碑表中 deleted_at >= since）写为 delete；
+        since 为 None 时导出全部记录。
+        返回的统计中 watermark 为下次增量导出应传入的 since。
+        """
+        table = Password.__table__
+        tombstones = Tombstone.__table__
+        watermark = datetime.utcnow() - WATERMARK_OVERLAP
+        upserts = select(*EXPORT_COLUMNS).order_by(table.c.id)
+        deletes = select(tombstones.c.sync_id, tombstones.c.deleted_at).order_by(tombstones.c.sync_id)
+        if since is not None:
+            upserts = upserts.where(table.c.changed_at >= since)
+            # 删除时间只精确到毫秒，since 之后同一毫秒内的删除也要导出
+            deletes = deletes.where(tombstones.c.deleted_at >= truncate_to_tombstone_precision(since))
+
+        counts = {'upserts': 0, 'deletes': 0}
+
+        def changes(conn: Any) -> Iterator[Dict[str, Any]]:
+            for row in conn.execution_options(yield_per=batch_size).execute(upserts):
+                counts['upserts'] += 1
+                yield {'op': 'upsert', **self._export_record(row)}
+            if since is None:
+                return
+            for row in conn.execution_options(yield_per=batch_size).execute(deletes):
+                counts['deletes'] += 1
+                yield {'op': 'delete', 'sync_id': row.sync_id, 'deleted_at': row.deleted_at.isoformat()}
+
+        # 两个查询在同一个读事务中执行，看到的是同一个快照
+        with self.engine.begin() as conn, open(export_path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps(delta_meta(since, watermark)) + '\n')
+            stats = write_records(f, changes(conn), 'jsonl', progress=progress, progress_every=batch_size)
+        return {**stats.to_dict(), **counts, 'watermark': watermark.isoformat()}
+
+    def merge_changes(self, import_path: str, batch_size: int = 1000,
+                      progress: Optional[ProgressCallback] = None) -> Dict[str, Any]:
+        """合并增量导出文件（也可以是 JSON 格式的完整导出文件），可以重复执行
+
+        upsert 按 sync_id 插入（本地分配新的 id），sync_id 已存在时只有文件中的记录更新
+        （updated_at 更大）才覆盖；delete 按 sync_id 只删除在删除时间之后没有再修改过的记录。
+        每批在一个事务中提交。
+        """
+        table = Password.__table__
+        upsert = conflict_insert(table, 'keep-newest', match_on='sync_id')
+        with_fingerprints = self.has_unique_index()
+        delete = table.delete().where(table.c.sync_id == bindparam('row_sync_id'),
+                                      table.c.updated_at < bindparam('deleted_before'))
+        stats = TransferStats()
+        counts = {'upserts': 0, 'deletes': 0}
+        try:
+            with open_records(import_path) as records:
+                changes = iter_changes(records)
+                while True:
+                    batch = list(itertools.islice(changes, batch_size))
+                    if not batch:
+                        break
+                    upserts = [params for op, params in batch if op == 'upsert']
+                    deletes = [params for op, params in batch if op == 'delete']
+                    fingerprints = [None] * len(upserts)
+                    if with_fingerprints:
+                        fingerprints = self._fingerprint_tokens([row['encrypted_password'] for row in upserts])
+                    for row, fp in zip(upserts, fingerprints):
+                        row['fingerprint'] = fp
+                    with self.engine.begin() as conn:
+                        if upserts:
+                            conn.execute(upsert, upserts)
+                        if deletes:
+                            conn.execute(delete, deletes)
+                    counts['upserts'] += len(upserts)
+                    counts['deletes'] += len(deletes)
+                    stats.rows += len(batch)
+                    if progress:
+                        progress(stats.rows, stats.elapsed)
+        except Exception as e:
+            raise Exception(f"合并过程中出错: {str(e)}")
+        finally:
+            self.invalidate_cache()
+        return {**stats.finish().to_dict(), **counts}
+
+    def clear_all_passwords(self, vacuum: bool = False) -> bool:
+        """清空所有密码
+
+        直接执行 DELETE FROM passwords，不加载任何记录；vacuum 为 True 时
+        随后执行 VACUUM，把释放的页归还给文件系统。
+        """
+        try:
+            with self.engine.begin() as conn:
+                conn.execute(Password.__table__.delete())
+            self.invalidate_cache()
+            if vacuum:
+                self.vacuum()
             return True
         except Exception:
-            session.rollback()
             return False
-        finally:
-            session.close()
+
+    def vacuum(self) -> None:
+        """重建数据库文件，回收已删除记录占用的空间"""
+        # VACUUM 不能在事务中执行
+        with self.engine.connect().execution_options(isolation_level='AUTOCOMMIT') as conn:
+            conn.exec_driver_sql('VACUUM')
+
+    def close(self) -> None:
+        """写入队列中的操作全部提交后释放数据库连接"""
+        if self.write_queue is not None:
+            self.write_queue.close()
+        self.engine.dispose()
 
     def get_text(self, key):
         """获取当前语言的文本"""
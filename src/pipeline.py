@@ -0,0 +1,139 @@
+import itertools
+import os
+import queue
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from datetime import datetime
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Set
+from .dedupe import fingerprint
+from .parallel import create_executor, make_fernet
+from .transfer import import_rows, open_records
+
+# 目录导入时读取的文件类型
+IMPORT_SUFFIXES = ('.json', '.jsonl', '.pgv')
+
+
+class ParseOptions(NamedTuple):
+    """传给解析进程的参数
+
+    keys 用于校验密文能否解密；fingerprint_key 不为 None 时同时计算密码指纹；
+    其余参数与 transfer.import_rows 相同。
+    """
+    keys: List[bytes]
+    fingerprint_key: Optional[bytes]
+    current_time: datetime
+    keep_timestamps: bool = False
+    keep_ids: bool = False
+
+
+class ParsedFile(NamedTuple):
+    path: str
+    rows: List[Dict[str, Any]]
+    seconds: float
+    error: Optional[str] = None
+
+
+class FileResult(NamedTuple):
+    """单个文件的导入结果"""
+    path: str
+    rows: int
+    applied: int
+    parse_seconds: float
+    write_seconds: float
+    error: Optional[str] = None
+
+    @property
+    def rows_per_second(self) -> float:
+        seconds = self.parse_seconds + self.write_seconds
+        return self.rows / seconds if seconds > 0 else 0.0
+
+
+def find_import_files(path: str) -> List[str]:
+    """目录中所有可以导入的文件（按文件名排序）；path 为文件时直接返回"""
+    if not os.path.isdir(path):
+        return [path]
+    return sorted(
+        os.path.join(path, name) for name in os.listdir(path)
+        if name.endswith(IMPORT_SUFFIXES) and os.path.isfile(os.path.join(path, name))
+    )
+
+
+def parse_file(path: str, options: ParseOptions) -> ParsedFile:
+    """读取并校验一个导出文件（在子进程中执行），出错时返回错误信息而不是抛出异常"""
+    started = time.perf_counter()
+    try:
+        with open_records(path) as records:
+            records = list(records)
+        fernet = make_fernet(options.keys)
+        fingerprints: List[Optional[str]] = []
+        for number, record in enumerate(records, 1):
+            account, token = record.get('account'), record.get('encrypted_password')
+            if not isinstance(account, str) or not account or not isinstance(token, str):
+                raise ValueError(f"第 {number} 条记录缺少账户或密码")
+            try:
+                password = fernet.decrypt(token.encode()).decode()
+            except Exception:
+                raise ValueError(f"第 {number} 条记录的密码无法用当前密钥解密")
+            fingerprints.append(fingerprint(options.fingerprint_key, password)
+                                if options.fingerprint_key else None)
+        rows = import_rows(records, fingerprints, options.current_time,
+                           options.keep_timestamps, options.keep_ids)
+    except Exception as e:
+        return ParsedFile(path, [], time.perf_counter() - started, str(e) or type(e).__name__)
+    return ParsedFile(path, rows, time.perf_counter() - started)
+
+
+def import_files(paths: Sequence[str], options: ParseOptions,
+                 write: Callable[[List[Dict[str, Any]]], int], jobs: int = 1,
+                 on_file: Optional[Callable[[FileResult], None]] = None) -> List[FileResult]:
+    """多进程解析、单线程写入的导入流水线
+
+    jobs 个进程并行解析文件，解析结果经过有界队列交给唯一的写入线程
+    （SQLite 同一时间只有一个写事务）。write(rows) 在一个事务中写入一个文件的
+    全部记录并返回实际写入的记录数；任何一个文件出错都只记录在它的结果中。
+    返回的结果与 paths 顺序一致。
+    """
+    results: List[FileResult] = []
+    # 队列满时主线程等待写入线程，解析结果不会在内存中无限堆积
+    parsed_queue: 'queue.Queue[Optional[ParsedFile]]' = queue.Queue(maxsize=jobs)
+
+    def writer() -> None:
+        while True:
+            parsed = parsed_queue.get()
+            if parsed is None:
+                return
+            result = FileResult(parsed.path, len(parsed.rows), 0, parsed.seconds, 0.0, parsed.error)
+            if parsed.error is None:
+                started = time.perf_counter()
+                try:
+                    applied = write(parsed.rows)
+                    result = result._replace(applied=applied, write_seconds=time.perf_counter() - started)
+                except Exception as e:
+                    result = result._replace(applied=0, write_seconds=time.perf_counter() - started,
+                                             error=str(e).splitlines()[0] if str(e) else type(e).__name__)
+            results.append(result)
+            if on_file:
+                on_file(result)
+
+    thread = threading.Thread(target=writer, name='import-writer', daemon=True)
+    thread.start()
+    try:
+        with create_executor(jobs, use_processes=jobs > 1) as executor:
+            files = iter(paths)
+            pending: Set[Future] = set()
+            while True:
+                # 同时解析的文件数不超过 2 * jobs
+                for path in itertools.islice(files, 2 * jobs - len(pending)):
+                    pending.add(executor.submit(parse_file, path, options))
+                if not pending:
+                    break
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    parsed_queue.put(future.result())
+    finally:
+        parsed_queue.put(None)
+        thread.join()
+
+    order = {path: i for i, path in enumerate(paths)}
+    return sorted(results, key=lambda result: order[result.path])
@@ -0,0 +1,87 @@
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+from .cache import DecryptedCache
+from .instrumentation import count, span
+
+if TYPE_CHECKING:
+    from cryptography.fernet import Fernet
+
+# get_passwords 返回的字段
+RECORD_FIELDS = ('id', 'account', 'password', 'note', 'created_at', 'updated_at')
+
+# 不需要解密的字段
+METADATA_FIELDS = ('id', 'account', 'note', 'created_at', 'updated_at')
+
+class PasswordRecord:
+    """密码记录，首次读取 password 时才解密"""
+
+    __slots__ = ('id', 'account', 'note', 'created_at', 'updated_at',
+                 'encrypted_password', '_fernet', '_cache', '_password')
+
+    def __init__(self, row: Any, fernet: 'Fernet', cache: Optional[DecryptedCache] = None) -> None:
+        self.id = row.id
+        self.account = row.account
+        self.note = row.note
+        self.created_at = row.created_at
+        self.updated_at = row.updated_at
+        self.encrypted_password = row.encrypted_password
+        self._fernet = fernet
+        self._cache = cache
+        self._password: Optional[str] = None
+
+    @property
+    def password(self) -> str:
+        """解密后的密码（结果会被缓存）"""
+        if self._password is None and self._cache is not None:
+            self._password = self._cache.get(self.id, self.encrypted_password)
+        if self._password is None:
+            with span('decrypt'):
+                self._password = self._fernet.decrypt(self.encrypted_password.encode()).decode()
+            count('rows_decrypted')
+            if self._cache is not None:
+                self._cache.put(self.id, self.encrypted_password, self._password)
+        return self._password
+
+    @property
+    def is_decrypted(self) -> bool:
+        return self._password is not None
+
+    def __getitem__(self, key: str) -> Any:
+        """兼容字典式访问，例如 record['account']"""
+        if key not in RECORD_FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为 get_passwords 返回的字典格式（会触发解密）"""
+        return {key: getattr(self, key) for key in RECORD_FIELDS}
+
+    def metadata(self) -> Dict[str, Any]:
+        """不含密码的字段（不会触发解密）"""
+        return {key: getattr(self, key) for key in METADATA_FIELDS}
+
+    def __repr__(self) -> str:
+        return f"PasswordRecord(id={self.id!r}, account={self.account!r})"
+
+class PasswordPage:
+    """一页密码记录，以及翻页用的 id 游标"""
+
+    def __init__(self, records: List[PasswordRecord], has_next: bool, has_prev: bool) -> None:
+        self.records = records
+        self.has_next = has_next
+        self.has_prev = has_prev
+
+    @property
+    def next_cursor(self) -> Optional[int]:
+        """传给 after 以获取下一页"""
+        return self.records[-1].id if self.has_next and self.records else None
+
+    @property
+    def prev_cursor(self) -> Optional[int]:
+        """传给 before 以获取上一页"""
+        return self.records[0].id if self.has_prev and self.records else None
+
+    def __iter__(self):
+        return iter(self.records)
+
+    def __len__(self) -> int:
+        return len(self.records)
@@ -0,0 +1,88 @@
+from typing import Any, Optional
+from sqlalchemy import Index, Integer, inspect, or_, text
+from sqlalchemy.engine import Engine
+
+# 搜索模式：contains 为账户名或备注的子串匹配，prefix 为账户名前缀匹配（可以使用 account 索引）
+SEARCH_MODES = ('contains', 'prefix')
+
+# 与 LIKE 的默认行为一致，索引使用 NOCASE 排序规则，前缀搜索才能走索引
+ACCOUNT_INDEX_NAME = 'ix_passwords_account_nocase'
+
+FTS_TABLE = 'passwords_fts'
+
+# trigram 分词的 FTS5 外部内容表，通过触发器与 passwords 表保持同步
+FTS_SCHEMA = (
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        account, note, content='passwords', content_rowid='id', tokenize='trigram'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS passwords_fts_insert AFTER INSERT ON passwords BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, account, note) VALUES (new.id, new.account, new.note);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS passwords_fts_delete AFTER DELETE ON passwords BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, account, note)
+        VALUES ('delete', old.id, old.account, old.note);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS passwords_fts_update AFTER UPDATE OF account, note ON passwords BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, account, note)
+        VALUES ('delete', old.id, old.account, old.note);
+        INSERT INTO {FTS_TABLE}(rowid, account, note) VALUES (new.id, new.account, new.note);
+    END""",
+)
+
+# trigram 索引只能加速至少 3 个字符的子串
+FTS_MIN_TERM_LENGTH = 3
+
+LIKE_ESCAPE = '\\'
+
+
+def account_index(table: Any) -> Index:
+    """account 列上的 B-tree 索引"""
+    return Index(ACCOUNT_INDEX_NAME, table.c.account.collate('NOCASE'))
+
+
+def has_fts(engine: Engine) -> bool:
+    """数据库中是否已经建立了全文索引"""
+    return inspect(engine).has_table(FTS_TABLE)
+
+
+def create_fts(engine: Engine) -> None:
+    """建立 FTS5 trigram 全文索引，并为已有记录生成索引"""
+    existed = has_fts(engine)
+    with engine.begin() as conn:
+        for statement in FTS_SCHEMA:
+            conn.execute(text(statement))
+        if not existed:
+            conn.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"))
+
+
+def escape_like(term: str) -> str:
+    """转义 LIKE 通配符"""
+    return (term.replace(LIKE_ESCAPE, LIKE_ESCAPE * 2)
+                .replace('%', LIKE_ESCAPE + '%')
+                .replace('_', LIKE_ESCAPE + '_'))
+
+
+def filter_account(query: Any, table: Any, search_term: Optional[str],
+                   mode: str = 'contains', fts: bool = False) -> Any:
+    """按账户名或备注过滤查询（不区分大小写）
+
+    prefix 模式只匹配账户名，使用 account 索引做范围扫描；contains 模式同时匹配账户名和备注，
+    在启用全文索引且关键词足够长时查询 FTS5 表，否则退回到 LIKE '%term%' 全表扫描。
+    """
+    if not search_term:
+        return query
+    column = table.c.account
+    if mode not in SEARCH_MODES:
+        raise ValueError(f"不支持的搜索模式: {mode}")
+    if mode == 'prefix':
+        # 模式作为一个完整的参数绑定，SQLite 才能使用 LIKE 前缀优化
+        return query.filter(column.like(escape_like(search_term) + '%', escape=LIKE_ESCAPE))
+    if fts and len(search_term) >= FTS_MIN_TERM_LENGTH and not set('%_') & set(search_term):
+        # 每列单独查询才能使用 trigram 索引，OR 条件会扫描整个 FTS 表
+        matches = text(f"SELECT rowid FROM {FTS_TABLE} WHERE account LIKE :fts_pattern "
+                       f"UNION SELECT rowid FROM {FTS_TABLE} WHERE note LIKE :fts_pattern")
+        matches = matches.bindparams(fts_pattern=f'%{search_term}%').columns(rowid=Integer)
+        return query.filter(table.c.id.in_(matches))
+    pattern = f'%{escape_like(search_term)}%'
+    return query.filter(or_(column.like(pattern, escape=LIKE_ESCAPE),
+                            table.c.note.like(pattern, escape=LIKE_ESCAPE)))
@@ -0,0 +1,114 @@
+import os
+from typing import Any, Dict, List, Optional
+
+# SQLite 存储配置
+# durable：WAL + synchronous=FULL，每次提交都同步到磁盘，断电也不会丢失已提交的事务
+# fast：WAL + synchronous=NORMAL，只在检查点时同步，断电可能丢失最近的提交但数据库不会损坏
+STORAGE_PROFILES: Dict[str, Dict[str, Any]] = {
+    'durable': {
+        'journal_mode': 'WAL',
+        'synchronous': 'FULL',
+        'busy_timeout': 5000,
+        'cache_size': -16000,  # 负数表示 KiB，即 16 MiB
+        'temp_store': 'MEMORY',
+    },
+    'fast': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'busy_timeout': 5000,
+        'cache_size': -64000,
+        'temp_store': 'MEMORY',
+        'mmap_size': 256 * 1024 * 1024,
+    },
+}
+
+DEFAULT_PROFILE = 'durable'
+
+# 通过环境变量选择默认配置
+PROFILE_ENV_VAR = 'PASSGEN_DB_PROFILE'
+
+# 连接池大小：读操作可以在 WAL 模式下与写操作并发进行
+POOL_SIZE = 5
+MAX_OVERFLOW = 10
+
+
+def resolve_profile(profile: Optional[str] = None) -> str:
+    """确定使用的存储配置：参数 > 环境变量 > 默认值"""
+    name = profile or os.environ.get(PROFILE_ENV_VAR) or DEFAULT_PROFILE
+    if name not in STORAGE_PROFILES:
+        raise ValueError(f"未知的存储配置: {name}（可选: {', '.join(STORAGE_PROFILES)}）")
+    return name
+
+
+def create_sqlite_engine(db_path: str, profile: Optional[str] = None) -> Any:
+    """创建 SQLite 引擎，每个新连接都会设置所选配置的 PRAGMA"""
+    # SQLAlchemy 在这里才导入，命令行读取配置名称时不需要加载它
+    from sqlalchemy import create_engine
+
+    pragmas = STORAGE_PROFILES[resolve_profile(profile)]
+    engine = create_engine(
+        f'sqlite:///{db_path}',
+        pool_size=POOL_SIZE,
+        max_overflow=MAX_OVERFLOW,
+        connect_args={'timeout': pragmas['busy_timeout'] / 1000},
+    )
+    _set_pragmas_on_connect(engine, pragmas)
+    return engine
+
+
+def create_async_sqlite_engine(db_path: str, profile: Optional[str] = None) -> Any:
+    """创建 aiosqlite 异步引擎，PRAGMA 与同步引擎相同"""
+    try:
+        import aiosqlite  # noqa: F401
+    except ImportError:
+        raise ImportError("异步接口需要安装 aiosqlite: pip install passgen-cli[async]")
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    pragmas = STORAGE_PROFILES[resolve_profile(profile)]
+    engine = create_async_engine(
+        f'sqlite+aiosqlite:///{db_path}',
+        pool_size=POOL_SIZE,
+        max_overflow=MAX_OVERFLOW,
+        connect_args={'timeout': pragmas['busy_timeout'] / 1000},
+    )
+    _set_pragmas_on_connect(engine.sync_engine, pragmas)
+    return engine
+
+
+def _set_pragmas_on_connect(engine: Any, pragmas: Dict[str, Any]) -> None:
+    from sqlalchemy import event
+
+    @event.listens_for(engine, 'connect')
+    def set_pragmas(dbapi_connection: Any, connection_record: Any) -> None:
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f'PRAGMA {name}={value}')
+        finally:
+            cursor.close()
+
+
+def database_size(db_path: str) -> int:
+    """数据库占用的磁盘空间（字节），包括 WAL 和共享内存文件"""
+    total = 0
+    for suffix in ('', '-wal', '-shm'):
+        path = db_path + suffix
+        if os.path.exists(path):
+            total += os.path.getsize(path)
+    return total
+
+
+def add_missing_columns(engine: Any, table: Any) -> List[str]:
+    """为旧数据库补充模型中新增的列（只支持可以为空的列），返回补充的列名"""
+    from sqlalchemy import inspect
+    from sqlalchemy.schema import CreateColumn
+
+    existing = {column['name'] for column in inspect(engine).get_columns(table.name)}
+    added = []
+    with engine.begin() as conn:
+        for column in table.columns:
+            if column.name not in existing:
+                ddl = CreateColumn(column).compile(dialect=engine.dialect)
+                conn.exec_driver_sql(f'ALTER TABLE {table.name} ADD COLUMN {ddl}')
+                added.append(column.name)
+    return added
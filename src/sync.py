@@ -0,0 +1,101 @@
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterator, Optional, Tuple
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+# 增量导出文件：第一行为元数据，其余每行是一条 upsert（完整记录）或 delete（sync_id）操作；
+# 版本 1 按本地自增 id 匹配记录，不同主机的 id 会冲突，不再支持
+DELTA_FORMAT = 'passgen-delta'
+DELTA_VERSION = 2
+
+TOMBSTONE_TABLE = 'password_sync_tombstones'
+
+# 版本 1 按 id 记录的墓碑表，打开数据库时删除
+LEGACY_TOMBSTONE_TABLE = 'password_tombstones'
+
+# 水位线往前多留一段时间，覆盖导出时尚未提交的写入；重复的变更在合并时会被忽略
+WATERMARK_OVERLAP = timedelta(seconds=5)
+
+# 删除时间由触发器用 SQLite 自带的 strftime('now') 生成，只精确到毫秒（补零成 SQLAlchemy 的微秒格式），
+# 与 Python 写入的 updated_at 和 since 比较时按毫秒对齐；触发器不依赖应用注册的 SQL 函数，
+# 其他 SQLite 客户端和旧版本也可以正常删除记录
+TOMBSTONE_PRECISION = timedelta(milliseconds=1)
+
+# 删除记录时在同一事务中按 sync_id 写入墓碑；同一 sync_id 被重新插入时删除墓碑。
+# 其他客户端写入的记录在下次打开数据库前没有 sync_id，删除时不写墓碑
+SYNC_TRIGGERS = {
+    'passwords_tombstone_delete': f"""CREATE TRIGGER passwords_tombstone_delete AFTER DELETE ON passwords
+    WHEN old.sync_id IS NOT NULL BEGIN
+        INSERT OR REPLACE INTO {TOMBSTONE_TABLE}(sync_id, deleted_at)
+        VALUES (old.sync_id, strftime('%Y-%m-%d %H:%M:%f', 'now') || '000');
+    END""",
+    'passwords_tombstone_insert': f"""CREATE TRIGGER passwords_tombstone_insert AFTER INSERT ON passwords
+    WHEN new.sync_id IS NOT NULL BEGIN
+        DELETE FROM {TOMBSTONE_TABLE} WHERE sync_id = new.sync_id;
+    END""",
+}
+
+
+def new_sync_id() -> str:
+    """新记录的同步标识：在所有主机上唯一，合并时按它匹配记录"""
+    return uuid.uuid4().hex
+
+
+def create_sync_triggers(engine: Engine) -> None:
+    """建立记录删除时写入墓碑的触发器，与当前定义不同的旧触发器会被重建"""
+    with engine.begin() as conn:
+        conn.execute(text(f"DROP TABLE IF EXISTS {LEGACY_TOMBSTONE_TABLE}"))
+        existing = dict(conn.execute(text("SELECT name, sql FROM sqlite_master WHERE type = 'trigger'")).all())
+        for name, statement in SYNC_TRIGGERS.items():
+            if existing.get(name) == statement:
+                continue
+            if name in existing:
+                conn.execute(text(f"DROP TRIGGER {name}"))
+            conn.execute(text(statement))
+
+
+def truncate_to_tombstone_precision(value: datetime) -> datetime:
+    """把时间截断到墓碑删除时间的精度（毫秒）"""
+    return value.replace(microsecond=value.microsecond // 1000 * 1000)
+
+
+def delta_meta(since: Optional[datetime], watermark: datetime) -> Dict[str, Any]:
+    """增量导出文件的元数据行"""
+    return {
+        'format': DELTA_FORMAT,
+        'version': DELTA_VERSION,
+        'since': since.isoformat() if since else None,
+        'watermark': watermark.isoformat(),
+    }
+
+
+def parse_change(record: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+    """解析一行变更，返回 (操作, 参数)；没有 op 字段的普通导出记录视为 upsert"""
+    op = record.get('op', 'upsert')
+    if op not in ('upsert', 'delete'):
+        raise ValueError(f"未知的变更操作: {op}")
+    if not record.get('sync_id'):
+        raise ValueError("记录缺少 sync_id，无法合并（请使用 export-changes 或 JSON 格式的导出文件）")
+    if op == 'delete':
+        # 删除时间只精确到毫秒：同一毫秒内更早的修改也视为在删除之前
+        deleted_at = datetime.fromisoformat(record['deleted_at'])
+        return op, {'row_sync_id': record['sync_id'], 'deleted_before': deleted_at + TOMBSTONE_PRECISION}
+    return op, {
+        'sync_id': record['sync_id'],
+        'account': record['account'],
+        'encrypted_password': record['encrypted_password'],
+        'note': record.get('note') or '',
+        'created_at': datetime.fromisoformat(record['created_at']),
+        'updated_at': datetime.fromisoformat(record['updated_at']),
+    }
+
+
+def iter_changes(records: Iterator[Dict[str, Any]]) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """读取变更；跳过元数据行并检查格式版本"""
+    for record in records:
+        if record.get('format') == DELTA_FORMAT:
+            if record.get('version') != DELTA_VERSION:
+                raise ValueError(f"不支持的增量格式版本: {record.get('version')}")
+            continue
+        yield parse_change(record)
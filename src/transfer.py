@@ -0,0 +1,284 @@
+import csv
+import io
+import itertools
+import json
+import os
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import IO, Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, TextIO
+from .binary_format import BINARY_EXTENSION, DEFAULT_COMPRESSION, BinaryReader, BinaryWriter, is_binary_file
+from .instrumentation import count, metrics, span
+
+# 支持的导出格式：JSON 数组、JSON Lines（每行一条记录）和二进制格式（见 binary_format）
+EXPORT_FORMATS = ('json', 'jsonl', 'binary')
+
+# 进度回调：(已处理记录数, 已用秒数)
+ProgressCallback = Callable[[int, float], None]
+
+
+class TransferStats:
+    """导入导出的统计信息"""
+
+    def __init__(self) -> None:
+        self.rows = 0
+        self.started = time.perf_counter()
+        self.seconds = 0.0
+
+    def finish(self) -> 'TransferStats':
+        self.seconds = time.perf_counter() - self.started
+        return self
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds > 0 else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'rows': self.rows,
+            'seconds': self.seconds,
+            'rows_per_second': self.rows_per_second,
+        }
+
+
+class JsonArrayWriter:
+    """逐条写入 JSON 数组，格式与 json.dump(indent=2) 一致"""
+
+    def __init__(self, f: TextIO) -> None:
+        self.f = f
+        self.count = 0
+
+    def write(self, record: Dict[str, Any]) -> None:
+        with span('json_encode'):
+            text = json.dumps(record, ensure_ascii=False, indent=2).replace('\n', '\n  ')
+        # 文件以 UTF-8 写入，按编码后的长度计数；只在启用指标时编码
+        if metrics.enabled:
+            count('json_bytes', len(text.encode('utf-8')))
+        self.f.write(('[\n  ' if self.count == 0 else ',\n  ') + text)
+        self.count += 1
+
+    def close(self) -> None:
+        self.f.write('\n]' if self.count else '[]')
+
+
+class JsonLinesWriter:
+    """逐行写入 JSON Lines"""
+
+    def __init__(self, f: TextIO) -> None:
+        self.f = f
+        self.count = 0
+
+    def write(self, record: Dict[str, Any]) -> None:
+        with span('json_encode'):
+            text = json.dumps(record, ensure_ascii=False)
+        if metrics.enabled:
+            count('json_bytes', len(text.encode('utf-8')) + 1)
+        self.f.write(text)
+        self.f.write('\n')
+        self.count += 1
+
+    def close(self) -> None:
+        pass
+
+
+def create_writer(f: IO, fmt: str = 'json', compression: str = DEFAULT_COMPRESSION) -> Any:
+    """根据格式创建写入器；binary 格式需要以二进制模式打开的文件，compression 只对它有效"""
+    if fmt == 'json':
+        return JsonArrayWriter(f)
+    if fmt == 'jsonl':
+        return JsonLinesWriter(f)
+    if fmt == 'binary':
+        return BinaryWriter(f, compression)
+    raise ValueError(f"不支持的导出格式: {fmt}")
+
+
+def export_extension(fmt: str) -> str:
+    """导出文件的默认扩展名"""
+    return BINARY_EXTENSION if fmt == 'binary' else fmt
+
+
+def write_records(f: IO, records: Iterable[Dict[str, Any]], fmt: str = 'json',
+                  progress: Optional[ProgressCallback] = None,
+                  progress_every: int = 1000,
+                  compression: str = DEFAULT_COMPRESSION) -> TransferStats:
+    """流式写入记录，内存占用与记录总数无关"""
+    writer = create_writer(f, fmt, compression)
+    stats = TransferStats()
+    for record in records:
+        writer.write(record)
+        stats.rows += 1
+        if progress and stats.rows % progress_every == 0:
+            progress(stats.rows, stats.elapsed)
+    writer.close()
+    stats.finish()
+    if progress:
+        progress(stats.rows, stats.seconds)
+    return stats
+
+
+def iter_records(f: TextIO, chunk_size: int = 65536) -> Iterator[Dict[str, Any]]:
+    """流式读取 JSON 数组或 JSON Lines 文件中的记录"""
+    buf = f.read(chunk_size)
+    stripped = buf.lstrip()
+    while not stripped and buf:
+        buf = f.read(chunk_size)
+        stripped = buf.lstrip()
+    if not stripped:
+        return
+    if stripped[0] == '[':
+        yield from _iter_json_array(f, stripped, chunk_size)
+    else:
+        yield from _iter_json_lines(f, buf)
+
+
+@contextmanager
+def open_records(path: str) -> Iterator[Iterator[Dict[str, Any]]]:
+    """打开导出文件并流式返回记录，根据文件开头自动识别二进制或 JSON 格式"""
+    if is_binary_file(path):
+        with BinaryReader(path) as reader:
+            yield iter(reader)
+    else:
+        with open(path, 'r', encoding='utf-8') as f:
+            yield iter_records(f)
+
+
+def import_rows(records: Sequence[Dict[str, Any]], fingerprints: Sequence[Optional[str]],
+                current_time: datetime, keep_timestamps: bool = False,
+                keep_ids: bool = False) -> List[Dict[str, Any]]:
+    """把导出记录转换为待插入的行，密码保持加密状态
+
+    默认使用 current_time 作为创建和更新时间；keep_timestamps 保留文件中的时间戳，
+    keep_ids 保留原始 id（按 id 去重时需要）。
+    """
+    rows = []
+    for p, fp in zip(records, fingerprints):
+        row = {
+            'account': p['account'],
+            'encrypted_password': p['encrypted_password'],
+            'note': p.get('note') or '',
+            'fingerprint': fp,
+            'created_at': current_time,
+            'updated_at': current_time
+        }
+        if keep_timestamps:
+            row['created_at'] = datetime.fromisoformat(p['created_at'])
+            row['updated_at'] = datetime.fromisoformat(p['updated_at'])
+        if keep_ids:
+            row['id'] = p['id']
+        rows.append(row)
+    return rows
+
+
+def iter_entries(f: TextIO, fmt: str) -> Iterator[Dict[str, Any]]:
+    """读取批量添加的账户：CSV（表头包含 account,password,note）或 JSON Lines/JSON 数组"""
+    if fmt == 'csv':
+        for row in csv.DictReader(f):
+            yield {key.strip(): (value or '').strip() for key, value in row.items() if key}
+    else:
+        yield from iter_records(f)
+
+
+def _iter_json_lines(f: TextIO, head: str) -> Iterator[Dict[str, Any]]:
+    """逐行解析 JSON Lines"""
+    # 补齐第一块中最后一行不完整的部分，再继续按行读取文件
+    for line in itertools.chain(io.StringIO(head + f.readline()), f):
+        line = line.strip()
+        if line:
+            yield _check_record(json.loads(line))
+
+
+def _iter_json_array(f: TextIO, buf: str, chunk_size: int) -> Iterator[Dict[str, Any]]:
+    """增量解析 JSON 数组，每次只在内存中保留一个数据块"""
+    decoder = json.JSONDecoder()
+    pos = 1  # 跳过 '['
+    eof = False
+    expect_value = True
+    while True:
+        while pos < len(buf) and buf[pos] in ' \t\r\n':
+            pos += 1
+        if pos >= len(buf):
+            if eof:
+                raise ValueError("JSON 数组未正确结束")
+            chunk = f.read(chunk_size)
+            eof = not chunk
+            buf, pos = buf[pos:] + chunk, 0
+            continue
+        char = buf[pos]
+        if char == ']':
+            return
+        if char == ',' and not expect_value:
+            pos += 1
+            expect_value = True
+            continue
+        try:
+            obj, end = decoder.raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            # 记录跨越了数据块边界，读取更多内容后重试
+            chunk = f.read(chunk_size)
+            eof = not chunk
+            buf, pos = buf[pos:] + chunk, 0
+            continue
+        yield _check_record(obj)
+        pos = end
+        expect_value = False
+        if pos > chunk_size:
+            buf, pos = buf[pos:], 0
+
+
+def _check_record(obj: Any) -> Dict[str, Any]:
+    if not isinstance(obj, dict):
+        raise ValueError(f"无效的记录: {obj!r}")
+    return obj
+
+
+# 导入检查点在 vault_meta 表中的名称
+IMPORT_CHECKPOINT_NAME = 'import_checkpoint'
+
+
+class ImportCheckpoint:
+    """记录导入进度，用于中断后继续导入
+
+    检查点保存在密码库的 vault_meta 表（meta）中，与每批记录在同一个事务中写入，
+    因此已提交的记录数和检查点总是一致。只有导入文件的路径、大小和修改时间都一致时才会生效。
+    """
+
+    def __init__(self, meta: Any, import_path: str) -> None:
+        self.meta = meta
+        stat = os.stat(import_path)
+        self.source = {
+            'path': os.path.abspath(import_path),
+            'size': stat.st_size,
+            'mtime': stat.st_mtime,
+        }
+
+    def load(self, conn: Any) -> int:
+        """返回已提交的记录数，没有有效检查点时返回 0"""
+        # SQLAlchemy 在这里才导入，命令行读取导出格式时不需要加载它
+        from sqlalchemy import select
+
+        value = conn.execute(select(self.meta.c.value)
+                             .where(self.meta.c.name == IMPORT_CHECKPOINT_NAME)).scalar()
+        try:
+            data = json.loads(value)
+        except (TypeError, ValueError):
+            return 0
+        if data.get('source') != self.source:
+            return 0
+        return int(data.get('rows', 0))
+
+    def save(self, conn: Any, rows: int) -> None:
+        """在 conn 的事务中记录已导入的记录数"""
+        from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+        value = json.dumps({'source': self.source, 'rows': rows})
+        insert = sqlite_insert(self.meta).values(name=IMPORT_CHECKPOINT_NAME, value=value)
+        conn.execute(insert.on_conflict_do_update(index_elements=[self.meta.c.name], set_={'value': value}))
+
+    def clear(self, conn: Any) -> None:
+        conn.execute(self.meta.delete().where(self.meta.c.name == IMPORT_CHECKPOINT_NAME))
@@ -0,0 +1,102 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, List, Optional, Tuple
+
+# 收集写操作的等待时间（秒）和一个事务中的最大操作数；AsyncPasswordManager 的组提交使用同样的值
+DEFAULT_COMMIT_DELAY = 0.002
+MAX_GROUP_SIZE = 1000
+
+# 写操作：在写入线程中以同一个连接执行，返回值作为 Future 的结果
+WriteOp = Callable[[Any], Any]
+
+
+class WriteQueue:
+    """合并写操作的后台写入线程（组提交）
+
+    各线程提交的写操作进入队列，写入线程收到第一个操作后再等待 commit_delay，
+    把期间到达的操作放在一个事务中执行，只提交一次。某个操作出错时整组回滚，
+    再逐个重新执行，只有出错的操作得到异常。
+    """
+
+    def __init__(self, engine: Any, commit_delay: float = DEFAULT_COMMIT_DELAY,
+                 max_group: int = MAX_GROUP_SIZE) -> None:
+        self.engine = engine
+        self.commit_delay = commit_delay
+        self.max_group = max_group
+        # 已提交的事务数，用于观察合并效果
+        self.commits = 0
+        self._queue: 'queue.Queue[Optional[Tuple[WriteOp, Future]]]' = queue.Queue()
+        self._closed = False
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name='passgen-writer', daemon=True)
+        self._thread.start()
+
+    def submit(self, op: WriteOp) -> Future:
+        """提交一个写操作，返回在事务提交后完成的 Future"""
+        future: Future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("写入队列已经关闭")
+            self._queue.put((op, future))
+        return future
+
+    def close(self) -> None:
+        """执行完已提交的写操作后停止写入线程"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(None)
+        self._thread.join()
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            group = [item]
+            stopping = False
+            deadline = time.monotonic() + self.commit_delay
+            while len(group) < self.max_group:
+                timeout = deadline - time.monotonic()
+                try:
+                    item = self._queue.get(timeout=timeout) if timeout > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                group.append(item)
+            self._apply(group)
+            if stopping:
+                return
+
+    def _apply(self, group: List[Tuple[WriteOp, Future]]) -> None:
+        group = [(op, future) for op, future in group if future.set_running_or_notify_cancel()]
+        if not group:
+            return
+        try:
+            with self.engine.begin() as conn:
+                results = [op(conn) for op, _ in group]
+            self.commits += 1
+        except Exception as e:
+            if len(group) == 1:
+                group[0][1].set_exception(e)
+                return
+            for op, future in group:
+                self._apply_one(op, future)
+            return
+        for (_, future), result in zip(group, results):
+            future.set_result(result)
+
+    def _apply_one(self, op: WriteOp, future: Future) -> None:
+        try:
+            with self.engine.begin() as conn:
+                result = op(conn)
+            self.commits += 1
+        except Exception as e:
+            future.set_exception(e)
+        else:
+            future.set_result(result)
@@ -0,0 +1,63 @@
+import pytest
+import asyncio
+import json
+from pathlib import Path
+from typing import Tuple
+from src.aio import AsyncPasswordManager
+from src.password_manager import PasswordManager
+
+pytest.importorskip('aiosqlite')
+
+@pytest.fixture  # type: ignore
+def temp_db(tmp_path: Path) -> Tuple[str, str]:
+    """创建临时数据库"""
+    return str(tmp_path / "test.db"), str(tmp_path / "test.key")
+
+def test_concurrent_adds_share_commits(temp_db):
+    """测试并发 add_password 合并为少量事务"""
+    async def main():
+        async with await AsyncPasswordManager.open(*temp_db) as pm:
+            ids = await asyncio.gather(*(pm.add_password(f"user{i}", f"pass{i}") for i in range(200)))
+            return ids, pm.commits
+
+    ids, commits = asyncio.run(main())
+    assert len(set(ids)) == 200
+    assert commits < 10
+    pm = PasswordManager(*temp_db)
+    assert pm.get_account(ids[5])['account'] == "user5"
+    assert pm.get_passwords("user5")[0]['password'] == "pass5"
+
+def test_constraint_error_only_fails_one_caller(temp_db):
+    """测试同一组中违反唯一索引的记录只影响对应的调用"""
+    pm = PasswordManager(*temp_db)
+    pm.add_password("dup", "secret")
+    pm.create_unique_index()
+
+    async def main():
+        async with await AsyncPasswordManager.open(*temp_db) as apm:
+            return await asyncio.gather(apm.add_password("a", "1"), apm.add_password("dup", "secret"),
+                                        apm.add_password("b", "2"), return_exceptions=True)
+
+    results = asyncio.run(main())
+    assert isinstance(results[0], int) and isinstance(results[2], int)
+    assert isinstance(results[1], Exception)
+    assert pm.count_passwords() == 3
+
+def test_stream_export_and_delete(temp_db, tmp_path):
+    """测试流式读取、导出和删除"""
+    export_path = tmp_path / "export.jsonl"
+
+    async def main():
+        async with await AsyncPasswordManager.open(*temp_db) as pm:
+            await pm.add_passwords([(f"user{i}", f"pass{i}") for i in range(25)])
+            records = [record async for record in pm.get_passwords("user1", batch_size=4)]
+            stats = await pm.export_passwords(str(export_path), 'jsonl', batch_size=10)
+            deleted = await pm.delete_passwords(account_pattern="user2%")
+            return records, stats, deleted, await pm.count_passwords()
+
+    records, stats, deleted, remaining = asyncio.run(main())
+    assert [record['password'] for record in records] == ["pass1"] + [f"pass{i}" for i in range(10, 20)]
+    assert stats['rows'] == 25
+    assert len(export_path.read_text().splitlines()) == 25
+    assert json.loads(export_path.read_text().splitlines()[0])['account'] == "user0"
+    assert deleted == 6 and remaining == 19
@@ -0,0 +1,30 @@
+import pytest
+from src.bench import compare, mismatches, percentile, run_suite, summarize
+
+def test_percentile_and_summary():
+    """测试百分位数和吞吐量计算"""
+    samples = [0.001 * i for i in range(1, 101)]
+    assert percentile(samples, 50) == pytest.approx(0.0505)
+    assert percentile(samples, 99) == pytest.approx(0.09901)
+    summary = summarize([0.5, 0.5, 2.0], items=1000)
+    assert summary['p50_ms'] == 500
+    assert summary['items_per_second'] == 2000
+
+def test_run_suite_and_compare():
+    """测试在临时密码库上运行各操作，并与基准线比较"""
+    data = run_suite(['1k'], samples=3, repeat=1)
+    results = data['results']['1k']
+    assert list(results) == ['generate', 'add', 'search', 'list', 'export', 'import', 'delete', 'clear']
+    assert results['list']['items'] == 1000 and results['add']['runs'] == 3
+    assert compare(data, data) == []
+    assert mismatches(data, data) == []
+    other_host = dict(data, environment=dict(data['environment'], cpu_count=-1), samples=5)
+    assert len(mismatches(data, other_host)) == 2
+    # 内核或 Python 补丁版本更新后仍然可比
+    upgraded = dict(data, environment=dict(data['environment'], platform='Linux-9.9', python='3.99.1'))
+    assert mismatches(data, upgraded) == []
+
+    faster = {'results': {'1k': {'list': dict(results['list'], p50_ms=results['list']['p50_ms'] / 4)}}}
+    regressions = compare(data, faster)
+    assert [item['operation'] for item in regressions] == ['list']
+    assert regressions[0]['ratio'] == pytest.approx(4, rel=0.01)
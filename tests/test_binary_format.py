@@ -0,0 +1,50 @@
+import io
+import pytest
+from cryptography.fernet import Fernet
+from src.binary_format import BinaryReader, BinaryWriter, is_binary_file
+
+@pytest.fixture  # type: ignore
+def records():
+    """创建测试导出记录"""
+    fernet = Fernet(Fernet.generate_key())
+    return [{
+        'id': i,
+        'account': f"用户{i}@example.com",
+        'encrypted_password': fernet.encrypt(f"pass{i}".encode()).decode(),
+        'note': None if i % 3 else f"备注{i}",
+        'created_at': '2024-01-02T03:04:05.123456',
+        'updated_at': '2024-01-02T03:04:06',
+    } for i in range(1, 1001)]
+
+@pytest.mark.parametrize('compression', ['none', 'zlib'])
+def test_binary_roundtrip_and_random_access(tmp_path, records, compression):
+    """测试写入后顺序读取和随机读取的结果与原记录一致"""
+    path = tmp_path / "vault.pgv"
+    with open(path, 'wb') as f:
+        writer = BinaryWriter(f, compression, block_records=64)
+        for record in records:
+            writer.write(record)
+        writer.close()
+
+    assert is_binary_file(str(path))
+    with BinaryReader(str(path)) as reader:
+        assert len(reader) == 1000
+        assert list(reader) == records
+        assert reader[500] == records[500]
+        assert reader[-1] == records[-1]
+        with pytest.raises(IndexError):
+            reader[1000]
+
+def test_binary_reader_rejects_other_files(tmp_path):
+    """测试读取非二进制导出文件时报错"""
+    path = tmp_path / "vault.json"
+    path.write_text('[]', encoding='utf-8')
+    assert not is_binary_file(str(path))
+    with pytest.raises(ValueError):
+        BinaryReader(str(path))
+
+def test_binary_writer_empty():
+    """测试空导出文件"""
+    f = io.BytesIO()
+    BinaryWriter(f).close()
+    assert f.getvalue().startswith(b'PGVAULT')
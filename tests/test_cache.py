@@ -0,0 +1,32 @@
+import pytest
+from src.cache import DecryptedCache
+
+def test_cache_lru_eviction_wipes_plaintext():
+    """测试超出容量时淘汰最久未使用的记录并覆盖明文"""
+    cache = DecryptedCache(ttl=60, maxsize=2)
+    cache.put(1, "t1", "secret1")
+    cache.put(2, "t2", "secret2")
+    evicted = cache._entries[1].plaintext
+    assert cache.get(2, "t2") == "secret2"
+    cache.put(3, "t3", "secret3")
+
+    assert cache.get(1, "t1") is None
+    assert evicted == bytearray(len("secret1"))
+    assert cache.get(2, "t2") == "secret2"
+    assert len(cache) == 2
+
+def test_cache_ttl_and_token_check(monkeypatch):
+    """测试过期和密文不一致时视为未命中"""
+    now = [100.0]
+    monkeypatch.setattr("src.cache.time.monotonic", lambda: now[0])
+    cache = DecryptedCache(ttl=10)
+    cache.put(1, "t1", "secret")
+
+    assert cache.get(1, "other") is None
+    cache.put(1, "t1", "secret")
+    now[0] += 11
+    assert cache.get(1, "t1") is None
+    assert len(cache) == 0
+
+    with pytest.raises(ValueError):
+        DecryptedCache(ttl=0)
@@ -4,7 +4,9 @@ from pathlib import Path
 from src.cli import cli
 import os
 import json
-from typing import Any, Generator
+import subprocess
+import sys
+from typing import Any, Dict, Generator
 from src.password_manager import PasswordManager
 
 @pytest.fixture  # type: ignore
@@ -90,4 +92,218 @@ def test_interactive_mode(isolated_runner):
         input='1\ntest@example.com\n16\n\n\ny\n0\n'
     )
     assert result.exit_code == 0
-    assert '密码生成成功' in result.output 
\ No newline at end of file
+    assert '密码生成成功' in result.output
+
+def test_export_jsonl_format(isolated_runner, tmp_path):
+    """测试以 JSON Lines 格式导出"""
+    isolated_runner.invoke(cli, ['generate', '-a', 'test@example.com'], input='y\n')
+
+    export_path = tmp_path / "export.jsonl"
+    result = isolated_runner.invoke(cli, ['export', '-p', str(export_path), '-f', 'jsonl'])
+    assert result.exit_code == 0
+    lines = export_path.read_text(encoding='utf-8').splitlines()
+    assert json.loads(lines[0])['account'] == 'test@example.com'
+
+def test_help_does_not_create_manager(isolated_runner):
+    """测试显示帮助时不会创建数据库和密钥"""
+    result = isolated_runner.invoke(cli, ['--help'])
+    assert result.exit_code == 0
+    result = isolated_runner.invoke(cli, ['export', '--help'])
+    assert result.exit_code == 0
+    assert not os.path.exists('passwords.db')
+    assert not os.path.exists('key.key')
+
+def test_commands_share_one_manager(isolated_runner, monkeypatch):
+    """测试同一进程内的命令共享一个 PasswordManager"""
+    created = []
+    original_init = PasswordManager.__init__
+
+    def counting_init(self, *args, **kwargs):
+        created.append(self)
+        original_init(self, *args, **kwargs)
+
+    monkeypatch.setattr(PasswordManager, '__init__', counting_init)
+    # 交互模式：列出账户后生成一个密码，再退出
+    result = isolated_runner.invoke(cli, input='3\n\n1\ntest@example.com\n12\n\n\ny\n\n8\n')
+    assert result.exit_code == 0
+    assert len(created) == 1
+
+# 启动时不应加载的重量级模块
+HEAVY_MODULES = ('sqlalchemy', 'cryptography', 'colorama')
+
+def import_times(code: str) -> Dict[str, int]:
+    """以 -X importtime 运行代码，返回 {模块名: 累计导入耗时(微秒)}"""
+    project_root = Path(__file__).resolve().parent.parent
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        cwd=project_root, capture_output=True, text=True, check=True
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line.split('|')
+        times[name.strip()] = int(cumulative)
+    return times
+
+def test_cli_import_defers_heavy_modules():
+    """测试导入 CLI 和显示帮助时不会加载 SQLAlchemy、cryptography 和 colorama"""
+    for code in ("import src.cli", "from src.cli import cli; cli(['--help'])"):
+        times = import_times(code)
+        loaded = [name for name in times if name.split('.')[0] in HEAVY_MODULES]
+        assert not loaded, f"{code!r} imported {loaded}"
+        assert 'src.cli' in times
+
+def test_list_pages(isolated_runner):
+    """测试分页列出密码并前后翻页"""
+    pm = PasswordManager()
+    for i in range(5):
+        pm.add_password(f"user{i}", f"pass{i}")
+
+    result = isolated_runner.invoke(cli, ['list', '--page-size', '2'], input='n\np\n\n')
+    assert result.exit_code == 0
+    pages = result.output.split('--- Page')
+    assert len(pages) == 4
+    assert 'user0' in pages[1] and 'user2' not in pages[1]
+    assert 'user2' in pages[2] and 'user3' in pages[2]
+    assert 'user0' in pages[3]
+    assert 'user4' not in result.output
+
+def test_generate_batch_command(isolated_runner, tmp_path):
+    """测试批量生成密码到文件，且不创建数据库"""
+    out_path = tmp_path / "passwords.txt"
+    result = isolated_runner.invoke(cli, ['generate-batch', '-n', '100', '-l', '16', '-o', str(out_path)])
+    assert result.exit_code == 0
+    lines = out_path.read_text(encoding='utf-8').splitlines()
+    assert len(lines) == 100
+    assert all(len(line) == 16 for line in lines)
+    assert not os.path.exists('passwords.db')
+
+def test_rotate_key_command(isolated_runner):
+    """测试轮换密钥命令"""
+    PasswordManager().add_password("test@example.com", "secret")
+    old_key = Path('key.key').read_bytes()
+
+    result = isolated_runner.invoke(cli, ['rotate-key'], input='n\n')
+    assert result.exit_code == 0
+    assert Path('key.key').read_bytes() == old_key
+
+    result = isolated_runner.invoke(cli, ['rotate-key', '--yes'])
+    assert result.exit_code == 0
+    assert Path('key.key').read_bytes() != old_key
+    assert PasswordManager().get_passwords()[0]['password'] == "secret"
+
+def test_add_batch_command(isolated_runner):
+    """测试从 CSV 批量添加账户，缺少的密码自动生成"""
+    Path('accounts.csv').write_text(
+        "account,password,note\nsvc-1,secret1,first\nsvc-2,,\n", encoding='utf-8')
+
+    result = isolated_runner.invoke(cli, ['add-batch', '--from', 'accounts.csv', '-l', '20'])
+    assert result.exit_code == 0
+    passwords = PasswordManager().get_passwords()
+    assert [p['account'] for p in passwords] == ['svc-1', 'svc-2']
+    assert passwords[0]['password'] == 'secret1'
+    assert len(passwords[1]['password']) == 20
+
+def test_delete_by_account_pattern(isolated_runner):
+    """测试按账户模式批量删除"""
+    PasswordManager().add_passwords([("svc-1", "a"), ("svc-2", "b"), ("other", "c")])
+
+    result = isolated_runner.invoke(cli, ['delete', '--account', 'svc-%'], input='y\n')
+    assert result.exit_code == 0
+    assert '2 records match' in result.output
+    assert [p['account'] for p in PasswordManager().list_accounts()] == ['other']
+
+    result = isolated_runner.invoke(cli, ['delete'])
+    assert result.exit_code != 0
+
+
+def test_clear_and_stats(isolated_runner):
+    """测试 clear 只显示前几条记录，stats 显示统计"""
+    PasswordManager().add_passwords([(f"user{i}", "pass") for i in range(15)])
+
+    result = isolated_runner.invoke(cli, ['stats', '--top', '3'])
+    assert result.exit_code == 0
+    assert 'Records 15' in result.output
+
+    result = isolated_runner.invoke(cli, ['clear', '--vacuum'], input='y\ny\n')
+    assert result.exit_code == 0
+    assert 'user9' in result.output and 'user10' not in result.output
+    assert PasswordManager().count_passwords() == 0
+
+def test_incremental_export_and_merge(isolated_runner, tmp_path):
+    """测试 export --since 和 import --merge"""
+    PasswordManager().add_passwords([("a", "1"), ("b", "2")])
+    delta_path = tmp_path / "delta.jsonl"
+
+    result = isolated_runner.invoke(cli, ['export', '-p', str(delta_path), '--changes'])
+    assert result.exit_code == 0
+    assert 'Upserts: 2, deletes: 0' in result.output
+
+    result = isolated_runner.invoke(cli, ['export', '-p', str(delta_path), '--since', 'yesterday'])
+    assert result.exit_code != 0
+
+    result = isolated_runner.invoke(cli, ['import-passwords', '-p', str(delta_path), '--merge'])
+    assert result.exit_code == 0
+    assert PasswordManager().count_passwords() == 2
+
+def test_import_on_conflict_and_dedupe(isolated_runner, tmp_path):
+    """测试 dedupe 删除重复记录，import --on-conflict 重复导入不会产生新记录"""
+    PasswordManager().add_passwords([("a", "1"), ("b", "2")])
+    export_path = tmp_path / "export.jsonl"
+    isolated_runner.invoke(cli, ['export', '-p', str(export_path), '-f', 'jsonl'])
+    PasswordManager().import_passwords(str(export_path))
+
+    result = isolated_runner.invoke(cli, ['dedupe', '--yes'])
+    assert result.exit_code == 0
+    assert 'Removed 2 duplicate records' in result.output
+
+    result = isolated_runner.invoke(cli, ['import-passwords', '-p', str(export_path), '--on-conflict', 'skip'])
+    assert result.exit_code == 0
+    assert 'unchanged: 2' in result.output
+
+    result = isolated_runner.invoke(cli, ['import-passwords', '-p', str(export_path),
+                                          '--on-conflict', 'keep-newest', '--match-on', 'id'])
+    assert result.exit_code == 0
+    assert PasswordManager().count_passwords() == 2
+
+def test_import_directory(isolated_runner, tmp_path):
+    """测试导入目录中的多个文件并显示每个文件的结果"""
+    PasswordManager().add_passwords([("a", "1")])
+    import_dir = tmp_path / "exports"
+    import_dir.mkdir()
+    for name in ("host1.jsonl", "host2.json"):
+        isolated_runner.invoke(cli, ['export', '-p', str(import_dir / name)])
+    (import_dir / "broken.json").write_text('[{"account": "x"', encoding='utf-8')
+
+    result = isolated_runner.invoke(cli, ['import-passwords', '-p', str(import_dir), '--jobs', '2'])
+    assert result.exit_code == 0
+    assert 'broken.json' in result.output
+    assert '2 files imported, 1 failed, 2 records written' in result.output
+    assert PasswordManager().count_passwords() == 3
+
+def test_bench_command(isolated_runner, tmp_path):
+    """测试 bench 输出 JSON，比基准线慢时以错误退出"""
+    output = tmp_path / "bench.json"
+    args = ['bench', '--op', 'generate', '--op', 'list', '--samples', '5', '--repeat', '1']
+    result = isolated_runner.invoke(cli, args + ['-o', str(output)])
+    assert result.exit_code == 0
+    data = json.loads(output.read_text())
+    assert set(data['results']['1k']) == {'generate', 'list'}
+    assert not os.path.exists('passwords.db')
+
+    data['results']['1k']['list']['p50_ms'] /= 100
+    output.write_text(json.dumps(data))
+    result = isolated_runner.invoke(cli, args + ['--baseline', str(output)])
+    assert result.exit_code != 0
+    assert '1k list' in result.output
+
+    # 其他机器上生成的基准线默认报错，指定 --allow-mismatch 时仍然比较
+    data['environment']['cpu_count'] = -1
+    output.write_text(json.dumps(data))
+    result = isolated_runner.invoke(cli, args + ['--baseline', str(output)])
+    assert result.exit_code != 0
+    assert '--allow-mismatch' in result.output
+    result = isolated_runner.invoke(cli, args + ['--baseline', str(output), '--allow-mismatch'])
+    assert result.exit_code != 0
+    assert '1k list' in result.output
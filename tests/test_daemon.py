@@ -0,0 +1,121 @@
+import pytest
+import os
+import stat
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Generator, Tuple
+from click.testing import CliRunner
+from src.cli import CliContext, cli
+from src.daemon import (DaemonClient, DaemonError, RemotePasswordManager, VaultServer,
+                        default_socket_path, encode_message)
+from src.password_manager import PasswordManager
+
+@pytest.fixture  # type: ignore
+def daemon(tmp_path: Path) -> Generator[Tuple[VaultServer, CliContext], None, None]:
+    """在后台线程中运行守护进程"""
+    obj = CliContext(str(tmp_path / "test.db"), str(tmp_path / "test.key"))
+    server = VaultServer(default_socket_path(obj.db_path), obj.create_local(cache_ttl=60))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server, obj
+    server.shutdown()
+    server.server_close()
+    thread.join()
+
+def test_remote_calls(daemon):
+    """测试通过套接字读写密码库"""
+    server, obj = daemon
+    pm = obj.pm
+    assert isinstance(pm, RemotePasswordManager)
+    assert stat.S_IMODE(os.stat(server.socket_path).st_mode) == 0o600
+
+    pm.add_password("user@example.com", "secret", "note")
+    pm.add_passwords([("a", "1"), ("b", "2")])
+    passwords = pm.get_passwords("user")
+    assert passwords[0]['password'] == "secret"
+    assert isinstance(passwords[0]['created_at'], datetime)
+
+    page = pm.get_passwords_page(limit=2)
+    assert [record.account for record in page] == ["user@example.com", "a"]
+    assert page.has_next and page.next_cursor == page.records[-1].id
+    # 分页结果只传输元数据，读取密码时才请求解密
+    assert 'password' not in pm.client.call('get_passwords_page', limit=1)['records'][0]
+    assert not page.records[0].is_decrypted
+    assert page.records[0].password == "secret"
+    assert pm.get_password(page.records[1].id) == "1"
+
+    assert pm.count_passwords(older_than=datetime.now()) == 3
+    assert pm.stats()['count'] == 3
+    assert pm.delete_password(passwords[0]['id'])
+    # 守护进程外的写入也能看到
+    assert PasswordManager(obj.db_path, obj.key_path).count_passwords() == 2
+
+def test_remote_errors_and_fallback(daemon):
+    """测试方法白名单、参数错误和本地回退"""
+    server, obj = daemon
+    pm = obj.pm
+    with pytest.raises(DaemonError):
+        pm.client.call('rotate_key')
+    with pytest.raises(ValueError):
+        pm.delete_passwords()
+
+    # 导出在本地 PasswordManager 中执行，清空等写操作转发给守护进程
+    pm.add_password("a", "1")
+    assert pm.export_passwords(os.path.join(os.path.dirname(obj.db_path), "out.json"))['rows'] == 1
+    assert pm.clear_all_passwords()
+    assert pm.count_passwords() == 0
+
+def test_generate_without_local_manager(daemon):
+    """测试守护进程运行时生成密码不创建本地 PasswordManager"""
+    server, obj = daemon
+    pm = obj.pm
+    assert len(pm.generate_password(16)) == 16
+    assert len(list(pm.generate_passwords(3, 8))) == 3
+    assert pm._local is None
+
+def test_exclusive_commands_refused(daemon):
+    """测试守护进程运行时拒绝密钥轮换等不能在本地执行的操作"""
+    server, obj = daemon
+    with pytest.raises(DaemonError):
+        obj.pm.rotate_key()
+    key = Path(obj.key_path).read_bytes()
+    result = CliRunner().invoke(cli, ['rotate-key', '-y'], obj=CliContext(obj.db_path, obj.key_path))
+    assert result.exit_code != 0
+    assert 'passgen serve' in result.output
+    assert Path(obj.key_path).read_bytes() == key
+
+def test_invalid_request(daemon):
+    """测试无法解析的请求不会中断连接"""
+    server, obj = daemon
+    client = DaemonClient.connect(server.socket_path)
+    client._sock.sendall(b'not json\n')
+    assert b'-32700' in client._file.readline()
+    client._sock.sendall(encode_message({'jsonrpc': '2.0', 'id': 1, 'method': 'ping'}))
+    assert client.call('ping') is True
+    client.close()
+
+def test_stale_socket(tmp_path, daemon):
+    """测试已有守护进程时拒绝启动，旧的套接字文件会被删除"""
+    server, obj = daemon
+    with pytest.raises(RuntimeError):
+        VaultServer(server.socket_path, obj.create_local())
+
+    stale = tmp_path / "stale.sock"
+    stale.write_text("")
+    other = VaultServer(str(stale), obj.create_local())
+    other.server_close()
+    assert not stale.exists()
+
+def test_cli_uses_daemon(daemon):
+    """测试命令行在守护进程运行时通过套接字执行命令"""
+    server, obj = daemon
+    PasswordManager(obj.db_path, obj.key_path).add_password("user@example.com", "secret")
+    runner = CliRunner()
+    result = runner.invoke(cli, ['list'], obj=CliContext(obj.db_path, obj.key_path))
+    assert result.exit_code == 0
+    assert 'secret' in result.output
+
+    result = runner.invoke(cli, ['stats'], obj=CliContext(obj.db_path, obj.key_path))
+    assert result.exit_code == 0
+    assert 'Records 1' in result.output
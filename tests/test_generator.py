@@ -0,0 +1,55 @@
+import pytest
+from collections import Counter
+from src.generator import (
+    AMBIGUOUS_CHARS, CHARACTER_CLASSES, DEFAULT_CHARSET, CharsetPolicy,
+    build_translation, compile_policy, generate_password, generate_passwords
+)
+
+def test_generate_passwords_count_and_length():
+    """测试批量生成的数量和长度"""
+    passwords = list(generate_passwords(2500, length=20))
+    assert len(passwords) == 2500
+    assert all(len(p) == 20 for p in passwords)
+    assert len(set(passwords)) == 2500
+
+def test_generate_passwords_exclude():
+    """测试排除字符"""
+    passwords = generate_passwords(500, length=16, exclude="abc@#$")
+    assert not set("abc@#$") & set(''.join(passwords))
+
+def test_translation_is_unbiased():
+    """测试拒绝采样后每个字符对应的字节数相同"""
+    table, rejected = build_translation(DEFAULT_CHARSET)
+    counts = Counter(table[:256 - len(rejected)])
+    assert set(counts) == set(DEFAULT_CHARSET.encode())
+    assert len(set(counts.values())) == 1
+
+def test_generate_password_empty_charset():
+    """测试字符全部被排除时报错"""
+    with pytest.raises(ValueError):
+        generate_password(8, exclude=DEFAULT_CHARSET)
+
+def test_policy_min_per_class_and_ambiguous():
+    """测试每类最少字符数和排除易混淆字符"""
+    policy = CharsetPolicy(min_per_class=2, exclude_ambiguous=True)
+    for password in generate_passwords(200, length=10, policy=policy):
+        assert len(password) == 10
+        for name in ('lower', 'upper', 'digits', 'punctuation'):
+            assert sum(c in CHARACTER_CLASSES[name] for c in password) >= 2
+        assert not set(AMBIGUOUS_CHARS) & set(password)
+
+def test_policy_is_compiled_once():
+    """测试同一策略的编译结果被缓存"""
+    policy = CharsetPolicy(classes=('lower', 'digits'), exclude="abc")
+    compiled = compile_policy(policy)
+    assert compile_policy(CharsetPolicy(classes=('lower', 'digits'), exclude="abc")) is compiled
+    assert compiled.charset == "defghijklmnopqrstuvwxyz0123456789"
+
+def test_policy_errors():
+    """测试无法满足的策略"""
+    with pytest.raises(ValueError):
+        generate_password(6, policy=CharsetPolicy(min_per_class=2))
+    with pytest.raises(ValueError):
+        compile_policy(CharsetPolicy(classes=('symbols',)))
+    with pytest.raises(ValueError):
+        compile_policy(CharsetPolicy(classes=('digits',), exclude="0123456789", min_per_class=1))
@@ -0,0 +1,85 @@
+import pytest
+import io
+import json
+from pathlib import Path
+from typing import Generator
+from click.testing import CliRunner
+from src.cli import cli
+from src.instrumentation import (JsonLogSink, PrometheusTextfileSink, StderrSink, create_sink, metrics)
+from src.password_manager import PasswordManager
+
+@pytest.fixture  # type: ignore
+def enabled_metrics() -> Generator[None, None, None]:
+    """启用指标，测试结束后恢复默认的关闭状态"""
+    metrics.enable()
+    yield
+    metrics.disable()
+
+def test_manager_spans(enabled_metrics, tmp_path):
+    """测试加解密、SQL、提交和 JSON 编码都有计时和计数"""
+    pm = PasswordManager(str(tmp_path / "test.db"), str(tmp_path / "test.key"))
+    pm.add_password("a", "1")
+    pm.add_passwords([("b", "2"), ("用户", "3", "中文备注")])
+    assert [p['password'] for p in pm.get_passwords()] == ["1", "2", "3"]
+    pm.export_passwords(str(tmp_path / "out.jsonl"), fmt='jsonl')
+
+    snapshot = metrics.snapshot('test')
+    spans, counters = snapshot['spans'], snapshot['counters']
+    for name in ('encrypt', 'decrypt', 'sql.select', 'sql.insert', 'sql.fetch', 'commit', 'json_encode'):
+        assert spans[name]['count'] > 0, name
+    assert spans['decrypt']['count'] == 3
+    assert counters['rows_encrypted'] == 3 and counters['rows_decrypted'] == 3
+    assert counters['rows_exported'] == 3
+    # 中文账户和备注按 UTF-8 字节计数
+    assert counters['json_bytes'] == (tmp_path / "out.jsonl").stat().st_size
+
+def test_disabled_by_default(tmp_path):
+    """测试未启用时不记录任何数据"""
+    metrics.reset()
+    pm = PasswordManager(str(tmp_path / "test.db"), str(tmp_path / "test.key"))
+    pm.add_password("a", "1")
+    assert not metrics.enabled
+    assert metrics.snapshot()['spans'] == {}
+
+def test_sinks(enabled_metrics, tmp_path):
+    """测试三种输出端的格式"""
+    with metrics.span('decrypt'):
+        pass
+    metrics.count('rows_decrypted', 5)
+    snapshot = metrics.snapshot('list')
+
+    stream = io.StringIO()
+    StderrSink(stream).emit(snapshot)
+    assert 'decrypt' in stream.getvalue() and 'rows_decrypted' in stream.getvalue()
+
+    log_path = tmp_path / "metrics.jsonl"
+    JsonLogSink(str(log_path)).emit(snapshot)
+    JsonLogSink(str(log_path)).emit(snapshot)
+    lines = log_path.read_text().splitlines()
+    assert len(lines) == 2 and json.loads(lines[0])['counters'] == {'rows_decrypted': 5}
+
+    prom_path = tmp_path / "passgen.prom"
+    PrometheusTextfileSink(str(prom_path)).emit(snapshot)
+    text = prom_path.read_text()
+    assert 'passgen_span_count_total{command="list",span="decrypt"} 1' in text
+    assert 'passgen_events_total{command="list",name="rows_decrypted"} 5' in text
+
+    with pytest.raises(ValueError):
+        create_sink('json')
+
+def test_cli_metrics_and_profile(tmp_path):
+    """测试 --metrics 和 --profile 在命令结束时输出结果"""
+    runner = CliRunner()
+    with runner.isolated_filesystem(temp_dir=tmp_path):
+        PasswordManager().add_passwords([("a", "1"), ("b", "2")])
+        result = runner.invoke(cli, ['--metrics', 'json:metrics.jsonl', '--profile',
+                                     '--profile-output', 'list.prof', 'list'])
+        assert result.exit_code == 0
+        snapshot = json.loads(Path('metrics.jsonl').read_text())
+        assert snapshot['command'] == 'list'
+        assert snapshot['counters']['rows_decrypted'] == 2
+        assert Path('list.prof').exists()
+
+        result = runner.invoke(cli, ['--metrics', 'bogus', 'list'])
+        assert result.exit_code != 0
+    metrics.disable()
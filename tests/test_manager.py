@@ -3,7 +3,8 @@ import os
 import json
 from pathlib import Path
 from typing import Any, Tuple
-from src.password_manager import PasswordManager, Password
+from src.password_manager import PasswordManager, Password, VaultMeta
+from src.transfer import ImportCheckpoint
 
 @pytest.fixture  # type: ignore
 def temp_db(tmp_path: Path) -> Tuple[str, str]:
@@ -135,4 +136,543 @@ class TestPasswordManager:
         accounts = {p['account']: p['password'] for p in imported}
         for account, password, _ in test_data:
             assert account in accounts
-            assert accounts[account] == password 
\ No newline at end of file
+            assert accounts[account] == password
+
+    def test_get_records_lazy_decrypt(self, password_manager):
+        """测试按需解密的密码记录"""
+        password_manager.add_password("test@example.com", "secret", "note")
+
+        records = password_manager.get_records()
+        assert len(records) == 1
+        record = records[0]
+        assert record['account'] == "test@example.com"
+        assert not record.is_decrypted
+
+        assert record.password == "secret"
+        assert record['password'] == "secret"
+        assert record.is_decrypted
+
+    def test_list_accounts_metadata_only(self, password_manager):
+        """测试只读取元数据的账户列表"""
+        password_manager.add_password("test1@example.com", "pass1", "note1")
+        password_manager.add_password("other@gmail.com", "pass2")
+
+        accounts = password_manager.list_accounts()
+        assert [a['account'] for a in accounts] == ["test1@example.com", "other@gmail.com"]
+        assert 'password' not in accounts[0]
+        assert len(password_manager.list_accounts("gmail")) == 1
+
+        meta = password_manager.get_account(accounts[0]['id'])
+        assert meta['note'] == "note1"
+        assert password_manager.get_account(999) is None
+
+    def test_export_streaming_formats(self, password_manager, tmp_path):
+        """测试分批流式导出 JSON 和 JSON Lines"""
+        for i in range(5):
+            password_manager.add_password(f"user{i}@example.com", f"pass{i}")
+
+        progress = []
+        json_path = tmp_path / "export.json"
+        stats = password_manager.export_passwords(
+            str(json_path), batch_size=2, progress=lambda rows, elapsed: progress.append(rows))
+        assert stats['rows'] == 5
+        assert progress[-1] == 5
+        with open(json_path, encoding='utf-8') as f:
+            exported = json.load(f)
+        assert [p['account'] for p in exported] == [f"user{i}@example.com" for i in range(5)]
+        assert 'password' not in exported[0]
+
+        jsonl_path = tmp_path / "export.jsonl"
+        password_manager.export_passwords(str(jsonl_path), fmt='jsonl')
+        lines = jsonl_path.read_text(encoding='utf-8').splitlines()
+        assert len(lines) == 5
+        assert json.loads(lines[0]) == exported[0]
+
+    def test_export_empty_vault(self, password_manager, tmp_path):
+        """测试导出空数据库"""
+        export_path = tmp_path / "empty.json"
+        stats = password_manager.export_passwords(str(export_path))
+        assert stats['rows'] == 0
+        assert json.loads(export_path.read_text(encoding='utf-8')) == []
+
+    def test_import_batches_jsonl(self, password_manager, tmp_path):
+        """测试分批导入 JSON Lines"""
+        token = password_manager.fernet.encrypt(b"secret").decode()
+        import_path = tmp_path / "import.jsonl"
+        import_path.write_text("\n".join(
+            json.dumps({'account': f"user{i}", 'encrypted_password': token}) for i in range(7)
+        ), encoding='utf-8')
+
+        stats = password_manager.import_passwords(str(import_path), batch_size=3)
+        assert stats['rows'] == 7
+        passwords = password_manager.get_passwords()
+        assert len(passwords) == 7
+        assert passwords[0]['password'] == "secret"
+
+    def test_import_resume_after_interruption(self, password_manager, tmp_path):
+        """测试导入中断后从检查点继续"""
+        token = password_manager.fernet.encrypt(b"secret").decode()
+        records = [{'account': f"user{i}", 'encrypted_password': token} for i in range(5)]
+        import_path = tmp_path / "import.json"
+        import_path.write_text(json.dumps(records), encoding='utf-8')
+
+        def interrupt(rows, elapsed):
+            raise RuntimeError("interrupted")
+
+        with pytest.raises(Exception):
+            password_manager.import_passwords(str(import_path), batch_size=2, progress=interrupt)
+        assert len(password_manager.list_accounts()) == 2
+        # 检查点与记录在同一个事务中提交
+        checkpoint = ImportCheckpoint(VaultMeta.__table__, str(import_path))
+        with password_manager.engine.connect() as conn:
+            assert checkpoint.load(conn) == 2
+
+        stats = password_manager.import_passwords(str(import_path), batch_size=2, resume=True)
+        assert stats['rows'] == 3
+        accounts = [p['account'] for p in password_manager.list_accounts()]
+        assert accounts == [f"user{i}" for i in range(5)]
+
+    def test_prefix_search(self, password_manager):
+        """测试前缀搜索和通配符转义"""
+        for account in ("github.com", "GitLab", "my-github", "git_hub"):
+            password_manager.add_password(account, "pass")
+
+        accounts = [a['account'] for a in password_manager.list_accounts("git", match='prefix')]
+        assert accounts == ["github.com", "GitLab", "git_hub"]
+        assert [a['account'] for a in password_manager.list_accounts("git_", match='prefix')] == ["git_hub"]
+        assert len(password_manager.list_accounts("%")) == 0
+
+    def test_fts_search_stays_in_sync(self, temp_db):
+        """测试全文索引搜索，以及通过触发器与数据保持同步"""
+        db_path, key_path = temp_db
+        pm = PasswordManager(db_path=db_path, key_path=key_path)
+        pm.add_password("test1@example.com", "pass1")
+        pm.enable_fts()  # 已有记录会被加入索引
+        pm.add_password("test2@EXAMPLE.com", "pass2")
+        pm.add_password("other@gmail.com", "pass3")
+
+        assert len(pm.get_passwords("example")) == 2
+        pm.delete_password(pm.list_accounts("test1")[0]['id'])
+        assert [p['account'] for p in pm.list_accounts("example")] == ["test2@EXAMPLE.com"]
+
+        # 重新打开数据库时自动使用已有的全文索引
+        reopened = PasswordManager(db_path=db_path, key_path=key_path)
+        assert reopened.fts_enabled
+        assert len(reopened.list_accounts("gmail")) == 1
+
+        # 子串搜索同时匹配备注，全文索引与 LIKE 的结果一致
+        pm.add_password("bank", "pass4", "Personal savings")
+        assert [p['account'] for p in pm.list_accounts("savings")] == ["bank"]
+        plain = PasswordManager(db_path=db_path + ".plain", key_path=key_path)
+        plain.add_password("bank", "pass4", "Personal savings")
+        assert [p['account'] for p in plain.list_accounts("SAVINGS")] == ["bank"]
+        assert plain.list_accounts("sav", match='prefix') == []
+
+    def test_get_passwords_page(self, password_manager):
+        """测试按 id 键集分页和前后翻页"""
+        for i in range(7):
+            password_manager.add_password(f"user{i}", f"pass{i}")
+
+        first = password_manager.get_passwords_page(limit=3)
+        assert [r.account for r in first] == ["user0", "user1", "user2"]
+        assert first.has_next and not first.has_prev
+        assert not any(r.is_decrypted for r in first)
+
+        second = password_manager.get_passwords_page(limit=3, after=first.next_cursor)
+        last = password_manager.get_passwords_page(limit=3, after=second.next_cursor)
+        assert [r.account for r in last] == ["user6"]
+        assert last.has_prev and not last.has_next
+
+        back = password_manager.get_passwords_page(limit=3, before=last.prev_cursor)
+        assert [r.account for r in back] == [r.account for r in second]
+        back = password_manager.get_passwords_page(limit=3, before=back.prev_cursor)
+        assert [r.account for r in back] == ["user0", "user1", "user2"]
+        assert not back.has_prev
+
+        newest = password_manager.get_passwords_page(limit=2, order='desc')
+        assert [r.account for r in newest] == ["user6", "user5"]
+        older = password_manager.get_passwords_page(limit=2, order='desc', after=newest.next_cursor)
+        assert [r['password'] for r in older] == ["pass4", "pass3"]
+
+    def test_get_passwords_parallel(self, password_manager, monkeypatch):
+        """测试并行解密与顺序解密结果一致"""
+        from src import parallel
+        # 超过一个分块，才会真正使用线程池
+        total = parallel.DEFAULT_CHUNK_SIZE * 2 + 100
+        password_manager.add_passwords([(f"user{i}", f"pass{i}") for i in range(total)])
+
+        expected = password_manager.get_passwords()
+        pools = []
+        create_executor = parallel.create_executor
+        monkeypatch.setattr(parallel, 'create_executor',
+                            lambda *args: pools.append(args) or create_executor(*args))
+        assert password_manager.get_passwords(workers=4) == expected
+        assert pools == [(3, False)]
+        assert password_manager.get_passwords("user1", workers=2) == [
+            p for p in expected if "user1" in p['account']]
+
+    def test_rotate_key(self, password_manager, temp_db):
+        """测试轮换密钥后所有密码仍可解密，旧密钥不再可用"""
+        for i in range(5):
+            password_manager.add_password(f"user{i}", f"pass{i}")
+        old_key = password_manager.key
+        before = password_manager.list_accounts()
+
+        stats = password_manager.rotate_key(batch_size=2)
+        assert stats['rows'] == 5
+        assert password_manager.key != old_key
+        assert [p['password'] for p in password_manager.get_passwords()] == [f"pass{i}" for i in range(5)]
+        assert password_manager.list_accounts() == before  # updated_at 保持不变
+
+        db_path, key_path = temp_db
+        reopened = PasswordManager(db_path=db_path, key_path=key_path)
+        assert reopened.key == password_manager.key
+        assert len(reopened.get_passwords()) == 5
+        assert not os.path.exists(key_path + '.new')
+        assert not os.path.exists(key_path + '.rotate')
+
+    def test_rotate_key_resume(self, password_manager, temp_db):
+        """测试密钥轮换中断后可以读取数据并继续轮换"""
+        for i in range(5):
+            password_manager.add_password(f"user{i}", f"pass{i}")
+
+        def interrupt(rows, elapsed):
+            raise RuntimeError("interrupted")
+
+        with pytest.raises(RuntimeError):
+            password_manager.rotate_key(batch_size=2, progress=interrupt)
+
+        # 部分记录已使用新密钥，重新打开时新旧密钥都可以解密
+        db_path, key_path = temp_db
+        reopened = PasswordManager(db_path=db_path, key_path=key_path)
+        assert len(reopened.keys) == 2
+        assert len(reopened.get_passwords()) == 5
+
+        stats = reopened.rotate_key(batch_size=2)
+        assert stats['rows'] == 3
+        assert len(PasswordManager(db_path=db_path, key_path=key_path).get_passwords()) == 5
+
+    @pytest.mark.parametrize('profile, synchronous', [('durable', 2), ('fast', 1)])
+    def test_storage_profile_pragmas(self, temp_db, profile, synchronous):
+        """测试存储配置在每个连接上设置 PRAGMA"""
+        from sqlalchemy import text
+        db_path, key_path = temp_db
+        pm = PasswordManager(db_path=db_path, key_path=key_path, profile=profile)
+        with pm.engine.connect() as conn:
+            assert conn.execute(text("PRAGMA journal_mode")).scalar() == 'wal'
+            assert conn.execute(text("PRAGMA synchronous")).scalar() == synchronous
+            assert conn.execute(text("PRAGMA busy_timeout")).scalar() == 5000
+
+    def test_storage_profile_from_env(self, temp_db, monkeypatch):
+        """测试通过环境变量选择存储配置"""
+        db_path, key_path = temp_db
+        monkeypatch.setenv('PASSGEN_DB_PROFILE', 'fast')
+        assert PasswordManager(db_path=db_path, key_path=key_path).profile == 'fast'
+        monkeypatch.setenv('PASSGEN_DB_PROFILE', 'unknown')
+        with pytest.raises(ValueError):
+            PasswordManager(db_path=db_path, key_path=key_path)
+
+    def test_add_passwords_bulk(self, password_manager):
+        """测试批量添加密码并返回 id"""
+        ids = password_manager.add_passwords([
+            ("a@example.com", "pass1"),
+            {'account': "b@example.com", 'password': "pass2", 'note': "note2"},
+            ("c@example.com", "pass3", "note3"),
+        ], batch_size=2)
+        assert len(ids) == 3
+        passwords = password_manager.get_passwords()
+        assert [p['id'] for p in passwords] == ids
+        assert [p['password'] for p in passwords] == ["pass1", "pass2", "pass3"]
+        assert passwords[1]['note'] == "note2"
+
+    def test_add_passwords_is_atomic(self, password_manager):
+        """测试批量添加中有无效记录时整体回滚"""
+        with pytest.raises(ValueError):
+            password_manager.add_passwords([("a@example.com", "pass1"), ("", "pass2")], batch_size=1)
+        assert password_manager.list_accounts() == []
+
+    def test_delete_passwords_by_condition(self, password_manager):
+        """测试按 id 列表、账户模式和创建时间批量删除"""
+        from datetime import datetime, timedelta
+        ids = password_manager.add_passwords(
+            [(f"user{i}@example.com", "pass") for i in range(5)] + [("admin@corp.com", "pass")])
+
+        assert password_manager.count_passwords(account_pattern="%@example.com") == 5
+        assert password_manager.delete_passwords(ids=[ids[0], ids[1], 999]) == 2
+        assert password_manager.delete_passwords(account_pattern="user4%") == 1
+        assert password_manager.delete_passwords(older_than=datetime.utcnow() - timedelta(days=1)) == 0
+        assert [a['account'] for a in password_manager.find_accounts(account_pattern="%example%")] == [
+            "user2@example.com", "user3@example.com"]
+
+        assert password_manager.delete_passwords(older_than=datetime.utcnow() + timedelta(seconds=1)) == 3
+        assert password_manager.count_passwords() == 0
+        with pytest.raises(ValueError):
+            password_manager.delete_passwords()
+
+    def test_stats_and_clear(self, password_manager, temp_db):
+        """测试统计查询和快速清空"""
+        password_manager.add_passwords([("a", "1"), ("b", "2"), ("b", "3")])
+
+        summary = password_manager.stats()
+        assert summary['count'] == 3
+        assert summary['accounts'] == 2
+        assert summary['oldest'] <= summary['newest']
+        assert summary['size_bytes'] > 0
+        assert password_manager.count_by_account() == [("b", 2), ("a", 1)]
+        assert password_manager.count_by_account(limit=1) == [("b", 2)]
+
+        assert password_manager.clear_all_passwords(vacuum=True)
+        summary = password_manager.stats()
+        assert summary['count'] == 0
+        assert summary['oldest'] is None
+
+    def test_decrypted_cache(self, temp_db):
+        """测试解密缓存命中和写操作后的失效"""
+        db_path, key_path = temp_db
+        pm = PasswordManager(db_path, key_path, cache_ttl=60)
+        pm.add_passwords([("a", "1"), ("b", "2")])
+
+        assert [p['password'] for p in pm.get_passwords()] == ["1", "2"]
+        assert pm.cache.misses == 2
+        assert [p['password'] for p in pm.get_passwords()] == ["1", "2"]
+        assert pm.cache.hits == 2
+
+        pm.delete_password(pm.list_accounts()[0]['id'])
+        assert len(pm.cache) == 1
+        # ids 为生成器时同样清除对应的缓存
+        assert pm.delete_passwords(ids=(p['id'] for p in pm.list_accounts())) == 1
+        assert len(pm.cache) == 0
+        pm.add_password("c", "3")
+        pm.get_passwords()
+        pm.clear_all_passwords()
+        assert len(pm.cache) == 0
+
+    def test_group_commit(self, temp_db):
+        """测试多个线程的写操作经写入队列合并提交"""
+        from concurrent.futures import ThreadPoolExecutor
+        db_path, key_path = temp_db
+        pm = PasswordManager(db_path, key_path, commit_delay=0.01)
+        with ThreadPoolExecutor(8) as executor:
+            list(executor.map(lambda i: pm.add_password(f"user{i}", f"pass{i}"), range(40)))
+        assert pm.count_passwords() == 40
+        assert pm.write_queue.commits < 40
+
+        record_id = pm.submit_add_password("extra", "secret").result()
+        assert pm.get_account(record_id)['account'] == "extra"
+        assert pm.delete_password(record_id)
+        assert not pm.submit_delete_password(record_id).result()
+        pm.close()
+
+    def test_export_import_binary(self, password_manager, temp_db, tmp_path):
+        """测试二进制格式导出后导入（自动识别格式）"""
+        password_manager.add_passwords([(f"user{i}", f"pass{i}") for i in range(300)])
+        export_path = str(tmp_path / "vault.pgv")
+        stats = password_manager.export_passwords(export_path, fmt='binary')
+        assert stats['rows'] == 300
+
+        db_path, key_path = temp_db
+        target = PasswordManager(str(tmp_path / "other.db"), key_path)
+        assert target.import_passwords(export_path, batch_size=128)['rows'] == 300
+        assert [p['password'] for p in target.get_passwords()] == [f"pass{i}" for i in range(300)]
+
+    def test_incremental_export_merge(self, password_manager, temp_db, tmp_path):
+        """测试增量导出只包含变更，合并可以重复执行"""
+        import time
+        from datetime import datetime, timedelta
+        ids = password_manager.add_passwords([(f"user{i}", f"pass{i}") for i in range(5)])
+        full_path = str(tmp_path / "full.jsonl")
+        stats = password_manager.export_changes(full_path)
+        assert (stats['upserts'], stats['deletes']) == (5, 0)
+
+        db_path, key_path = temp_db
+        replica = PasswordManager(str(tmp_path / "replica.db"), key_path)
+        replica.merge_changes(full_path)
+        replica.merge_changes(full_path)
+        assert replica.count_passwords() == 5
+
+        time.sleep(0.01)
+        since = datetime.utcnow()
+        password_manager.delete_passwords(ids=ids[:2])
+        password_manager.add_password("new", "secret")
+        delta_path = str(tmp_path / "delta.jsonl")
+        stats = password_manager.export_changes(delta_path, since=since)
+        assert (stats['upserts'], stats['deletes']) == (1, 2)
+        assert datetime.fromisoformat(stats['watermark']) < since
+
+        replica.merge_changes(delta_path)
+        replica.merge_changes(delta_path)
+        assert [p['account'] for p in replica.list_accounts()] == ["user2", "user3", "user4", "new"]
+        assert replica.get_passwords("new")[0]['password'] == "secret"
+
+        future = datetime.utcnow() + timedelta(days=1)
+        assert password_manager.export_changes(delta_path, since=future)['rows'] == 0
+
+        # 紧接在 since 之后的删除和刚修改过的记录：删除时间按毫秒比较，不会被漏掉
+        for _ in range(20):
+            (row_id,) = password_manager.add_passwords([("quick", "secret")])
+            password_manager.export_changes(delta_path)
+            replica.merge_changes(delta_path)
+            since = datetime.utcnow()
+            password_manager.delete_password(row_id)
+            stats = password_manager.export_changes(delta_path, since=since)
+            assert stats['deletes'] == 1
+            replica.merge_changes(delta_path)
+            assert not replica.get_passwords("quick")
+
+    def test_merge_matches_sync_id_across_hosts(self, password_manager, temp_db, tmp_path):
+        """测试两台主机的本地 id 相同时合并不会覆盖或删除对方的记录"""
+        from datetime import datetime, timedelta
+        db_path, key_path = temp_db
+        host_b = PasswordManager(str(tmp_path / "b.db"), key_path)
+        host_b.add_password("bank-on-B", "b-secret")
+        (a_id,) = password_manager.add_passwords([("mail-on-A", "a-secret")])
+        since = datetime.utcnow() - timedelta(seconds=1)
+
+        delta_path = str(tmp_path / "delta.jsonl")
+        password_manager.export_changes(delta_path)
+        host_b.merge_changes(delta_path)
+        host_b.merge_changes(delta_path)
+        assert sorted(p['account'] for p in host_b.list_accounts()) == ["bank-on-B", "mail-on-A"]
+
+        # A 删除自己的记录，墓碑只删除 B 中来自 A 的那一条
+        password_manager.delete_password(a_id)
+        stats = password_manager.export_changes(delta_path, since=since)
+        assert stats['deletes'] == 1
+        host_b.merge_changes(delta_path)
+        assert [p['account'] for p in host_b.list_accounts()] == ["bank-on-B"]
+        assert host_b.get_passwords("bank-on-B")[0]['password'] == "b-secret"
+
+    def test_sync_id_backfill(self, password_manager, temp_db, tmp_path):
+        """测试其他客户端写入的记录在打开数据库时补充 sync_id，不影响修改时间"""
+        import sqlite3
+        password_manager.add_password("a", "1")
+        db_path, key_path = temp_db
+        conn = sqlite3.connect(db_path)
+        with conn:
+            conn.execute("UPDATE passwords SET sync_id = NULL")
+        before = conn.execute("SELECT updated_at, changed_at FROM passwords").fetchall()
+        PasswordManager(db_path, key_path)
+        rows = conn.execute("SELECT sync_id, updated_at, changed_at FROM passwords").fetchall()
+        conn.close()
+        assert rows[0][0] and len(rows[0][0]) == 32
+        assert [row[1:] for row in rows] == before
+
+        with pytest.raises(Exception, match="sync_id"):
+            with open(tmp_path / "old.jsonl", "w") as f:
+                f.write('{"id": 1, "account": "a", "encrypted_password": "x", '
+                        '"created_at": "2024-01-01T00:00:00", "updated_at": "2024-01-01T00:00:00"}\n')
+            password_manager.merge_changes(str(tmp_path / "old.jsonl"))
+
+    def test_tombstone_trigger_without_passgen(self, password_manager, temp_db, tmp_path):
+        """测试其他 SQLite 客户端删除记录时触发器同样写入墓碑"""
+        import sqlite3
+        from datetime import datetime, timedelta
+        ids = password_manager.add_passwords([("a", "1"), ("b", "2")])
+        since = datetime.utcnow() - timedelta(seconds=1)
+        db_path, key_path = temp_db
+        conn = sqlite3.connect(db_path)
+        with conn:
+            conn.execute("DELETE FROM passwords WHERE id = ?", (ids[0],))
+        conn.close()
+        stats = password_manager.export_changes(str(tmp_path / "delta.jsonl"), since=since)
+        assert stats['deletes'] == 1
+
+    def test_import_on_conflict(self, password_manager, temp_db, tmp_path):
+        """测试按账户 + 指纹或原始 id 去重导入"""
+        password_manager.add_passwords([("a", "1"), ("b", "2")])
+        export_path = str(tmp_path / "export.jsonl")
+        password_manager.export_passwords(export_path, fmt='jsonl')
+
+        assert password_manager.import_passwords(export_path, on_conflict='skip')['applied'] == 0
+        assert password_manager.import_passwords(export_path, on_conflict='keep-newest')['applied'] == 0
+        assert password_manager.import_passwords(export_path, on_conflict='replace')['applied'] == 2
+        assert password_manager.count_passwords() == 2
+
+        db_path, key_path = temp_db
+        other = PasswordManager(str(tmp_path / "other.db"), key_path)
+        assert other.import_passwords(export_path, on_conflict='skip', match_on='id')['applied'] == 2
+        assert other.import_passwords(export_path, on_conflict='skip', match_on='id')['applied'] == 0
+        assert [p['password'] for p in other.get_passwords()] == ["1", "2"]
+
+    def test_import_on_conflict_with_existing_duplicates(self, password_manager, tmp_path):
+        """测试按账户匹配导入不建立唯一索引，库中已有重复记录时也可以导入"""
+        password_manager.add_passwords([("a", "1"), ("b", "2")])
+        export_path = str(tmp_path / "export.jsonl")
+        password_manager.export_passwords(export_path, fmt='jsonl')
+        password_manager.import_passwords(export_path)
+        assert password_manager.count_passwords() == 4
+
+        assert password_manager.import_passwords(export_path, on_conflict='skip')['applied'] == 0
+        assert password_manager.import_passwords(export_path, on_conflict='keep-newest')['applied'] == 0
+        assert password_manager.count_passwords() == 4
+        assert not password_manager.has_unique_index()
+        # 之后仍然可以添加重复记录
+        password_manager.add_password("a", "1")
+        assert password_manager.count_passwords() == 5
+
+        # 文件中的重复记录只导入一条
+        duplicates_path = str(tmp_path / "duplicates.jsonl")
+        with open(export_path) as f:
+            line = f.readline()
+        with open(duplicates_path, "w") as f:
+            f.write(line.replace('"a"', '"c"') * 3)
+        assert password_manager.import_passwords(duplicates_path, on_conflict='replace')['applied'] == 1
+        assert len(password_manager.get_passwords("c")) == 1
+
+    def test_import_on_conflict_export_changes(self, password_manager, temp_db, tmp_path):
+        """测试按冲突策略导入的记录保留文件中的时间，但仍会出现在之后的增量导出中"""
+        import time
+        from datetime import datetime
+        password_manager.add_passwords([("a", "1"), ("b", "2")])
+        export_path = str(tmp_path / "export.jsonl")
+        password_manager.export_passwords(export_path, fmt='jsonl')
+
+        db_path, key_path = temp_db
+        other = PasswordManager(str(tmp_path / "other.db"), key_path)
+        other.add_password("a", "old")
+        time.sleep(0.01)
+        since = datetime.utcnow()
+        assert other.import_passwords(export_path, on_conflict='replace', match_on='id')['applied'] == 2
+        assert other.get_passwords("a")[0]['updated_at'] < since
+
+        delta_path = str(tmp_path / "delta.jsonl")
+        stats = other.export_changes(delta_path, since=since)
+        assert (stats['upserts'], stats['deletes']) == (2, 0)
+        assert other.import_passwords(export_path, on_conflict='skip', match_on='id')['applied'] == 0
+        assert other.export_changes(delta_path, since=datetime.utcnow())['upserts'] == 0
+
+    def test_create_unique_index_dedupes(self, password_manager, tmp_path):
+        """测试旧数据补齐指纹、去重后拒绝重复记录"""
+        export_path = str(tmp_path / "export.jsonl")
+        password_manager.add_passwords([("a", "1"), ("a", "2")])
+        password_manager.export_passwords(export_path, fmt='jsonl')
+        password_manager.import_passwords(export_path)
+        assert password_manager.count_passwords() == 4
+
+        with pytest.raises(ValueError):
+            password_manager.create_unique_index()
+        assert password_manager.create_unique_index(dedupe=True) == 2
+        assert password_manager.has_unique_index()
+        with pytest.raises(Exception):
+            password_manager.add_password("a", "1")
+        password_manager.add_password("a", "3")
+        assert password_manager.count_passwords() == 3
+
+    def test_import_files_isolates_errors(self, password_manager, tmp_path):
+        """测试多文件导入：出错的文件不写入任何记录，也不影响其他文件"""
+        password_manager.add_passwords([("a", "1"), ("b", "2")])
+        paths = [str(tmp_path / f"part{i}.jsonl") for i in range(3)]
+        for path in paths:
+            password_manager.export_passwords(path, fmt='jsonl')
+        with open(paths[1], 'a', encoding='utf-8') as f:
+            f.write('{"account": "c", "encrypted_password": "not-a-token"}\n')
+
+        results = password_manager.import_files(paths, jobs=2, on_conflict='skip', match_on='id')
+        assert [result.path for result in results] == paths
+        assert results[1].error and results[1].applied == 0
+        assert [result.applied for result in results] == [0, 0, 0]
+        assert password_manager.count_passwords() == 2
+
+        results = password_manager.import_files(paths)
+        assert sum(result.applied for result in results) == 4
+        assert password_manager.count_passwords() == 6
@@ -0,0 +1,28 @@
+import pytest
+from cryptography.fernet import Fernet
+from src.parallel import decrypt_many, map_chunks
+
+@pytest.fixture  # type: ignore
+def tokens():
+    """创建测试密钥和密文"""
+    key = Fernet.generate_key()
+    fernet = Fernet(key)
+    return key, [fernet.encrypt(f"pass{i}".encode()).decode() for i in range(50)]
+
+@pytest.mark.parametrize('use_processes', [False, True])
+def test_decrypt_many_keeps_order(tokens, use_processes):
+    """测试分块并行解密后结果顺序不变"""
+    key, encrypted = tokens
+    passwords = decrypt_many([key], encrypted, workers=4, chunk_size=7, use_processes=use_processes)
+    assert passwords == [f"pass{i}" for i in range(50)]
+
+def test_map_chunks_runs_inline_for_small_input():
+    """测试数据量不超过一块时直接在当前线程执行"""
+    calls = []
+
+    def collect(prefix, chunk):
+        calls.append(chunk)
+        return [prefix + item for item in chunk]
+
+    assert map_chunks(collect, ['a', 'b'], '-', workers=8, chunk_size=10) == ['-a', '-b']
+    assert len(calls) == 1
@@ -0,0 +1,35 @@
+import pytest
+from sqlalchemy import create_engine, text
+from src.write_queue import WriteQueue
+
+@pytest.fixture  # type: ignore
+def engine(tmp_path):
+    """创建只有一张表的临时数据库"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'queue.db'}")
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT UNIQUE)"))
+    return engine
+
+def insert(name):
+    return lambda conn: conn.execute(text("INSERT INTO items (name) VALUES (:name)"), {'name': name}).lastrowid
+
+def test_queue_groups_writes(engine):
+    """测试等待期间提交的写操作在一个事务中执行"""
+    queue = WriteQueue(engine, commit_delay=0.05)
+    futures = [queue.submit(insert(f"item{i}")) for i in range(20)]
+    assert sorted(future.result() for future in futures) == list(range(1, 21))
+    queue.close()
+    assert queue.commits == 1
+
+def test_failed_write_only_fails_its_future(engine):
+    """测试出错的操作不影响同一组中的其他操作"""
+    queue = WriteQueue(engine, commit_delay=0.05)
+    futures = [queue.submit(insert(name)) for name in ("a", "b", "a", "c")]
+    queue.close()
+    with pytest.raises(Exception):
+        futures[2].result()
+    assert [futures[i].result() for i in (0, 1, 3)] == [1, 2, 3]
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT count(*) FROM items")).scalar() == 3
+    with pytest.raises(RuntimeError):
+        queue.submit(insert("d"))